@@ -79,6 +79,7 @@ with st.form("scrape_form"):
     # NEW OPTION: Dynamic scraping (Selenium)
     # -----------------------------------------------------
     use_dynamic = st.checkbox("Use dynamic scraper (Selenium) if needed", False)
+    race = st.checkbox("Race static and Selenium fetches (first page with content wins)", False)
 
     submit = st.form_submit_button("Scrape")
 
@@ -94,59 +95,63 @@ if submit:
     else:
         st.info(f"Starting scraping for {len(urls)} URL(s)...")
 
-        for url in urls:
-
-            # ---------------------------------------------------------
-            # Check if URL was already scraped
-            # ---------------------------------------------------------
-            if dataset.has_url(url):
-                st.warning(f"⏭️ Skipped (already scraped): {url}")
-                logger.info(f"SKIPPED | {url}")
-                continue
-
-            # ---------------------------------------------------------
-            # Perform scraping (normal or dynamic)
-            # ---------------------------------------------------------
-            with st.spinner(f"Scraping {url} ..."):
-                result = scrape_url(url, paginate=paginate, use_dynamic=use_dynamic)
-
-            # ---------------------------------------------------------
-            # Error handling
-            # ---------------------------------------------------------
-            if result.get("error"):
-                st.error(f"❌ Error scraping {url}: {result['error']}")
-                logger.error(f"ERROR | {url} | {result['error']}")
-                continue
-
-            # ---------------------------------------------------------
-            # Mark success
-            # ---------------------------------------------------------
-            st.success(f"✅ Scrape successful: {url}")
-
-            # Attach source URL before saving
-            result["data"]["_source_url"] = url
-
-            # Show JSON preview
-            st.json(result["data"])
-
-            # ---------------------------------------------------------
-            # Save to file
-            # ---------------------------------------------------------
-            if save_file:
-                filepath = storage.save_json(url, result["data"])
-                st.info(f"📁 Saved to: `{filepath}`")
-                logger.info(f"SUCCESS | {url} → {filepath}")
-
-            # ---------------------------------------------------------
-            # Merge into dataset
-            # ---------------------------------------------------------
-            if merge_data:
-                merge_info = dataset.merge(result["data"])
-                st.info(
-                    f"📊 Dataset updated for {url}: "
-                    f"{merge_info['added']} added, "
-                    f"{merge_info['deduped']} duplicates removed."
-                )
+        try:
+            for url in urls:
+
+                # ---------------------------------------------------------
+                # Check if URL was already scraped
+                # ---------------------------------------------------------
+                if dataset.has_url(url):
+                    st.warning(f"⏭️ Skipped (already scraped): {url}")
+                    logger.info(f"SKIPPED | {url}")
+                    continue
+
+                # ---------------------------------------------------------
+                # Perform scraping (normal or dynamic)
+                # ---------------------------------------------------------
+                with st.spinner(f"Scraping {url} ..."):
+                    result = scrape_url(url, paginate=paginate, use_dynamic=use_dynamic, race=race)
+
+                # ---------------------------------------------------------
+                # Error handling
+                # ---------------------------------------------------------
+                if result.get("error"):
+                    st.error(f"❌ Error scraping {url}: {result['error']}")
+                    logger.error(f"ERROR | {url} | {result['error']}")
+                    continue
+
+                # ---------------------------------------------------------
+                # Mark success
+                # ---------------------------------------------------------
+                st.success(f"✅ Scrape successful: {url}")
+
+                # Attach source URL before saving
+                result["data"]["_source_url"] = url
+
+                # Show JSON preview
+                st.json(result["data"])
+
+                # ---------------------------------------------------------
+                # Save to file
+                # ---------------------------------------------------------
+                if save_file:
+                    filepath = storage.save_json(url, result["data"])
+                    st.info(f"📁 Saved to: `{filepath}`")
+                    logger.info(f"SUCCESS | {url} → {filepath}")
+
+                # ---------------------------------------------------------
+                # Merge into dataset
+                # ---------------------------------------------------------
+                if merge_data:
+                    merge_info = dataset.merge(result["data"], flush=False)
+                    st.info(
+                        f"📊 Dataset updated for {url}: "
+                        f"{merge_info['added']} added, "
+                        f"{merge_info['deduped']} duplicates removed."
+                    )
+        finally:
+            # one write for the whole submission
+            dataset.flush()
 
 # ---------------------------------------------------------
 # Dataset Viewer
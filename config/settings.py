@@ -6,13 +6,66 @@ DATA_DIR = BASE_DIR / "data"
 RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 LOG_DIR = DATA_DIR / "logs"
+CACHE_DIR = DATA_DIR / "cache"
 
-for d in (RAW_DIR, PROCESSED_DIR, LOG_DIR):
+for d in (RAW_DIR, PROCESSED_DIR, LOG_DIR, CACHE_DIR):
     d.mkdir(parents=True, exist_ok=True)
 
 SETTINGS = {
     "refresh_interval_sec": 300,  # default auto-refresh
     "max_pages": 20,
+    "pagination_concurrency": 4,  # listing pages fetched at once when page URLs are predictable
     "user_agent": "streamlit-scraper/1.0",
     "timeout": 15,
+    "stream_downloads": True,  # default for writing static responses straight to disk
+    "max_body_bytes": 20 * 1024 * 1024,  # streamed responses larger than this are aborted
+    "stream_chunk_bytes": 64 * 1024,
+    "html_store_codec": "zstd",  # blob compression in core.html_store; gzip when zstandard is missing
+    "html_store_level": 6,
+    "scrape_log_compact_every": 5000,  # appended entries between compactions of scrape_log.jsonl
+    "scrape_log_max_entries": 0,  # newest entries kept by compaction; 0 = keep all
+    "dataset_compact_every": 5000,  # records appended to dataset.jsonl before dataset.json is rewritten
+    "dedupe_memory_keys": 1_000_000,  # record keys core.merger keeps in memory before spilling to SQLite
+    "html_parser": "html.parser",  # core.soup backend: "lxml", "html5lib" or "html.parser" (used when the others are missing)
+    # Bulk parsing (core.bulk_parse)
+    "parse_workers": 0,  # parser processes; 0 = one per CPU
+    "parse_chunk_files": 8,  # most files sent to a worker in one work unit
+    "parse_timeout_s": 120,  # a parser still running on one file after this is stopped; 0 = no limit
+    "parse_log_batch": 100,  # parser_runs entries inserted together
+    "async_concurrency": 500,  # in-flight requests for the asyncio batch engine
+    "async_per_host": 50,  # 0 = no per-host cap
+    "http_retries": 3,
+    "http_retry_backoff": 0.5,  # seconds before the first retry, doubling after each one
+    "http_pool_hosts": 100,  # host pools kept alive by the shared session
+    "http_pool_per_host": 10,  # max open connections per host
+    "host_qps": 4.0,  # default per-host request rate
+    "host_burst": 4,
+    "host_qps_min": 0.2,  # floor when backing off after 429s
+    "host_qps_overrides": {},  # {"aiesec.org": 2.0}
+    "browser_max_pages": 4,  # pages open at once in the shared Playwright browser
+    "selenium_pool_size": 2,  # warm Chrome drivers kept by core.driver_pool
+    "selenium_pages_per_driver": 50,  # recycle a driver after this many pages
+    # When a rendered page counts as ready (see core.readiness)
+    "render_ready": {
+        "selector": None,  # CSS selector that must be present
+        "quiet_ms": 500,  # no DOM mutation for this long
+        "network_idle_ms": 500,  # no new network resource for this long
+        "max_wait_s": 10.0,  # give up waiting and capture anyway
+    },
+    "render_ready_overrides": {},  # {"aiesec.org": {"selector": "h1", "max_wait_s": 15}}
+    "layer_explore": 0.1,  # chance of trying a non-preferred scrape layer first
+    "race_per_host": 2,  # URLs per host allowed to race static vs rendered layers at once
+    # Crawl frontier (core.frontier)
+    "frontier_max_depth": 2,  # link hops from the seed URLs
+    "frontier_bloom_capacity": 5_000_000,  # URLs the seen-set is sized for
+    "frontier_bloom_error": 0.001,  # false-positive rate at capacity
+    "frontier_bloom_save_s": 60,  # seconds between Bloom filter saves by Frontier.checkpoint()
+    "frontier_per_host_batch": 5,  # URLs per host in one scheduled batch
+    "frontier_host_priority": {},  # {"aiesec.org": 1} is crawled ahead of other hosts
+    # robots.txt (core.robots)
+    "respect_robots": False,  # default for the batch runner's robots.txt option
+    "robots_ttl": 86400,  # seconds a fetched robots.txt (or a 4xx for it) is trusted
+    "robots_error_ttl": 600,  # seconds a 5xx / unreachable robots.txt blocks the site
+    "breaker_failures": 5,  # host failures in a row before its circuit opens
+    "breaker_cooldown": 30,  # seconds an open circuit fails fast before a probe
 }
\ No newline at end of file
@@ -0,0 +1,119 @@
+# core/async_fetcher.py
+import asyncio
+import heapq
+import itertools
+import time
+
+import aiohttp
+
+from config.settings import SETTINGS
+from core.circuit_breaker import get_breakers
+from core.http_cache import get_cache
+from core.rate_limiter import get_limiter
+from utils.logger import logger
+
+
+# -------------------------------------------------------------------
+# Single static fetch
+# Returns the same dict shape as the threaded try_requests layer; a
+# page that could not be fetched comes back with status "failed" and
+# the reason in "error" (exceptions are also logged). A 304 from the
+# revalidation cache comes back with the saved "html_path"; hosts with
+# an open circuit breaker are skipped without a request.
+# -------------------------------------------------------------------
+async def fetch_one(session, url, timeout=None, limiter=None):
+    limiter = limiter or get_limiter()
+    cache = get_cache()
+    timeout = aiohttp.ClientTimeout(total=timeout or SETTINGS["timeout"])
+    try:
+        await limiter.acquire_async(url)
+        with get_breakers().guard(url) as call:
+            headers = cache.headers_for(url)
+            async with session.get(url, timeout=timeout, headers=headers) as r:
+                limiter.feedback(url, r.status, r.headers.get("Retry-After"))
+                if r.status >= 500:
+                    call.failed()
+                if r.status == 304 and headers:
+                    return {"method": "Async", "status": "success", **cache.not_modified(url)}
+                if r.status == 200:
+                    html = await r.text(errors="replace")
+                    return {
+                        "method": "Async",
+                        "status": "success",
+                        "html": html,
+                        "etag": r.headers.get("ETag"),
+                        "last_modified": r.headers.get("Last-Modified"),
+                    }
+                error = f"HTTP {r.status}"
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        logger.warning(f"Async fetch of {url} failed: {error}")
+    return {"method": "Async", "status": "failed", "error": error}
+
+
+# -------------------------------------------------------------------
+# Batch fetch
+# A fixed set of worker coroutines pulls from one shared iterator,
+# so memory stays flat no matter how many URLs are queued.
+# URLs whose host is over its rate are parked in a small heap until
+# their slot comes up, so a throttled host does not pin every worker
+# while other hosts have work ready.
+# on_result(url, res) is called in the event loop thread as each
+# fetch finishes, so it must not block. Blocking work for a page that
+# was fetched (store, log and database writes) goes in save(url, res):
+# it runs in the loop's default executor and its return value is what
+# on_result gets.
+# -------------------------------------------------------------------
+async def fetch_many(urls, on_result, concurrency=None, per_host=None, timeout=None, limiter=None, save=None):
+    concurrency = concurrency or SETTINGS["async_concurrency"]
+    per_host = SETTINGS["async_per_host"] if per_host is None else per_host
+    limiter = limiter or get_limiter()
+
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        limit_per_host=per_host,
+        ttl_dns_cache=300,
+    )
+    headers = {"User-Agent": SETTINGS["user_agent"]}
+    pending = iter(urls)
+    parked = []  # heap of (ready_at, seq, url)
+    seq = itertools.count()
+    max_parked = concurrency * 10
+
+    def next_url():
+        now = time.monotonic()
+        if parked and parked[0][0] <= now:
+            return heapq.heappop(parked)[2]
+        for url in pending:
+            wait = limiter.delay(url)
+            if wait <= 0 or len(parked) >= max_parked:
+                return url
+            heapq.heappush(parked, (now + wait, next(seq), url))
+        if parked:
+            return heapq.heappop(parked)[2]
+        return None
+
+    loop = asyncio.get_running_loop()
+
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+
+        async def worker():
+            while True:
+                url = next_url()
+                if url is None:
+                    return
+                res = await fetch_one(session, url, timeout=timeout, limiter=limiter)
+                if save and res["status"] == "success":
+                    try:
+                        res = await loop.run_in_executor(None, save, url, res)
+                    except Exception as e:
+                        logger.warning(f"Saving the async fetch of {url} failed: {e}")
+                        res = {"method": "Async", "status": "failed", "error": f"save failed: {e}"}
+                on_result(url, res)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def run_fetch_many(urls, on_result, concurrency=None, per_host=None, timeout=None, limiter=None, save=None):
+    """Blocking entry point for Streamlit pages and other sync callers."""
+    asyncio.run(fetch_many(urls, on_result, concurrency, per_host, timeout, limiter, save))
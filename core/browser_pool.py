@@ -0,0 +1,137 @@
+# core/browser_pool.py
+import asyncio
+import atexit
+import threading
+
+from config.settings import SETTINGS
+from core.readiness import wait_for_ready_async
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Persistent Playwright browser
+# Playwright objects belong to the event loop that created them, so
+# the pool runs its own loop in a daemon thread and worker threads
+# hand render jobs to it. One Chromium process is launched once and
+# reused; every job gets its own lightweight browser context, a
+# semaphore bounds how many pages are open at once, and a browser
+# that crashed or disconnected is relaunched on the next job.
+# -------------------------------------------------------------------
+class BrowserPool:
+    def __init__(self, max_pages=None, headless=True):
+        self.max_pages = max_pages or SETTINGS["browser_max_pages"]
+        self.headless = headless
+        self.stats = {"renders": 0, "launches": 0, "crashes": 0}
+
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        self._pages = asyncio.Semaphore(self.max_pages)
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="browser-pool", daemon=True
+            )
+            self._thread.start()
+
+    # ---------------------------------------------------------
+    # Runs inside the pool's loop
+    # ---------------------------------------------------------
+    async def _get_browser(self):
+        async with self._browser_lock:
+            if self._browser is not None and not self._browser.is_connected():
+                self.stats["crashes"] += 1
+                self._browser = None
+
+            if self._browser is None:
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self.stats["launches"] += 1
+
+            return self._browser
+
+    async def _render_once(self, url, wait_until, timeout_ms, screenshot_path, ready):
+        browser = await self._get_browser()
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(url, wait_until=wait_until, timeout=timeout_ms)
+            timing = await wait_for_ready_async(page, ready) if ready else {}
+            if screenshot_path:
+                await page.screenshot(path=screenshot_path)
+            return {"html": await page.content(), "title": await page.title(), **timing}
+        finally:
+            if browser.is_connected():
+                await context.close()
+
+    async def _render(self, url, wait_until, timeout_ms, screenshot_path, ready):
+        async with self._pages:
+            try:
+                res = await self._render_once(url, wait_until, timeout_ms, screenshot_path, ready)
+            except Exception:
+                # A dead browser is not the page's fault: relaunch and retry once
+                if self._browser is not None and self._browser.is_connected():
+                    raise
+                res = await self._render_once(url, wait_until, timeout_ms, screenshot_path, ready)
+            self.stats["renders"] += 1
+            return res
+
+    async def _shutdown(self):
+        if self._browser is not None and self._browser.is_connected():
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+
+    # ---------------------------------------------------------
+    # Public API (callable from any thread or event loop)
+    # ---------------------------------------------------------
+    def _submit(self, url, wait_until, timeout, screenshot_path, ready):
+        self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self._render(url, wait_until, timeout, screenshot_path, ready), self._loop
+        )
+
+    def render(self, url, wait_until="networkidle", timeout=30000, screenshot_path=None, ready=None):
+        """
+        Render url and return {"html", "title"}; timeout is in milliseconds.
+        With a readiness policy (core.readiness.ready_policy) the page is
+        also waited on after wait_until and "waited_s" / "ready" are added.
+        """
+        future = self._submit(url, wait_until, timeout, screenshot_path, ready)
+        # queueing for a free page slot does not count against the page timeout
+        return future.result()
+
+    async def render_async(self, url, wait_until="networkidle", timeout=30000, screenshot_path=None, ready=None):
+        """Same as render() for callers running their own event loop."""
+        return await asyncio.wrap_future(self._submit(url, wait_until, timeout, screenshot_path, ready))
+
+    def close(self):
+        if self._loop is None or not self._thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=30)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+def get_browser_pool():
+    """Process-wide pool shared by every scrape worker."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+                atexit.register(_pool.close)
+    return _pool
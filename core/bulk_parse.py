@@ -0,0 +1,196 @@
+# core/bulk_parse.py
+import importlib
+import os
+import signal
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import core.html_store
+from config.settings import SETTINGS
+from core.html_store import HtmlStore, get_html_store
+from core.metadata_store import get_metadata_store
+from core.parse_manifest import PARSER_PACKAGE, html_hash, manifest_row, parser_code_hash
+
+
+class ParseTimeout(Exception):
+    pass
+
+
+def output_path_for(html_path, parser_name):
+    return html_path.replace(".html", f"_{parser_name}.json")
+
+
+def _log_entry(parser_name, html_path, success, result=None, error=None):
+    entry = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "parser_name": parser_name,
+        "status": "success" if success else "failed",
+        "html_file_path": html_path,
+        "output_json_path": output_path_for(html_path, parser_name),
+        "items_extracted": len(result) if success and isinstance(result, list) else None
+    }
+    if error:
+        entry["error"] = error
+    return entry
+
+
+# -------------------------------------------------------------------
+# Worker side
+# Runs in the pool processes: imports the parser by name (modules
+# don't pickle) and parses its files one by one. A file that runs past
+# the timeout is interrupted with SIGALRM where the platform has it;
+# elsewhere the timeout is not enforced. Each worker opens its own
+# HtmlStore on the parent's root: a forked copy of the parent's SQLite
+# connection must not be used.
+# -------------------------------------------------------------------
+def _init_worker(store_root):
+    core.html_store._store = HtmlStore(root=store_root)
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeout()
+
+
+def _parse_file(module, parser_name, html_path, timeout):
+    alarm = timeout and hasattr(signal, "setitimer")
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        success, result = module.run_parser(html_path, output_path_for(html_path, parser_name))
+        return _log_entry(parser_name, html_path, success, result)
+    except ParseTimeout:
+        return _log_entry(parser_name, html_path, False, error=f"timed out after {timeout}s")
+    except Exception as e:
+        return _log_entry(parser_name, html_path, False, error=str(e))
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def parse_chunk(parser_name, html_paths, timeout=None, package=PARSER_PACKAGE):
+    module = importlib.import_module(f"{package}.{parser_name}")
+    return [_parse_file(module, parser_name, path, timeout) for path in html_paths]
+
+
+# -------------------------------------------------------------------
+# Bulk executor
+# Files go to a process pool in chunks of at most `parse_chunk_files`,
+# and each finished chunk is reported through on_result, so a progress
+# bar moves while the batch runs. Log entries reach the parser_runs
+# table `parse_log_batch` at a time, together with the parse_manifest
+# rows of the files that parsed (see core.parse_manifest).
+#
+# A worker that dies (segfault, OOM kill, os._exit in a parser) breaks
+# the whole pool and fails every chunk still in it. Those files are
+# retried one at a time in a single-worker pool: the file that breaks
+# that pool is the one that crashed and is logged as failed; the
+# others are parsed normally.
+# -------------------------------------------------------------------
+class BulkParser:
+    def __init__(self, parser_name, workers=None, chunk_files=None, timeout=None, log_batch=None,
+                 package=PARSER_PACKAGE):
+        self.parser_name = parser_name
+        self.package = package
+        self.workers = workers or SETTINGS["parse_workers"] or os.cpu_count() or 1
+        self.chunk_files = max(1, chunk_files or SETTINGS["parse_chunk_files"])
+        self.timeout = SETTINGS["parse_timeout_s"] if timeout is None else timeout
+        self.log_batch = log_batch or SETTINGS["parse_log_batch"]
+        self.parser_hash = parser_code_hash(parser_name, package)
+        self._unlogged = []
+        self._html_hashes = {}
+
+    def _pool(self, workers):
+        return ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(get_html_store().root,)
+        )
+
+    def _submit(self, pool, html_paths):
+        return pool.submit(parse_chunk, self.parser_name, html_paths, self.timeout, self.package)
+
+    def _chunks(self, html_paths):
+        # small enough that every worker gets several chunks
+        size = min(self.chunk_files, max(1, len(html_paths) // (self.workers * 4)))
+        return [html_paths[i:i + size] for i in range(0, len(html_paths), size)]
+
+    def _report(self, entries, results, on_result):
+        results.extend(entries)
+        self._unlogged.extend(entries)
+        if len(self._unlogged) >= self.log_batch:
+            self._flush_log()
+        if on_result:
+            on_result(len(results), entries)
+
+    def _flush_log(self):
+        if self._unlogged:
+            store = get_metadata_store()
+            store.add_parser_runs(self._unlogged)
+            store.record_parses([
+                manifest_row(
+                    self.parser_name, self.parser_hash, e["html_file_path"], e["output_json_path"],
+                    self._html_hashes.get(e["html_file_path"])
+                )
+                for e in self._unlogged
+                if e["status"] == "success" and self._html_hashes.get(e["html_file_path"])
+            ])
+            self._unlogged = []
+
+    def run(self, html_paths, on_result=None):
+        """
+        Parse html_paths and return one log entry per file, in the order
+        they finished. on_result(done, entries) is called in this thread
+        as each chunk comes back.
+        """
+        html_paths = list(html_paths)
+        # hashed before parsing: the manifest row is for the content that was parsed
+        self._html_hashes = {path: html_hash(path) for path in html_paths}
+        results = []
+        try:
+            suspects = self._run_pool(self._chunks(html_paths), results, on_result)
+            if suspects:
+                self._run_isolated(suspects, results, on_result)
+        finally:
+            self._flush_log()
+        return results
+
+    def _run_pool(self, chunks, results, on_result):
+        suspects = []
+        with self._pool(min(self.workers, len(chunks) or 1)) as pool:
+            pending = {self._submit(pool, chunk): chunk for chunk in chunks}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        entries = future.result()
+                    except BrokenProcessPool:
+                        suspects.extend(chunk)
+                        continue
+                    except Exception as e:
+                        entries = [_log_entry(self.parser_name, path, False, error=str(e)) for path in chunk]
+                    self._report(entries, results, on_result)
+        return suspects
+
+    def _run_isolated(self, html_paths, results, on_result):
+        pool = None
+        try:
+            for path in html_paths:
+                pool = pool or self._pool(1)
+                try:
+                    entries = self._submit(pool, [path]).result()
+                except BrokenProcessPool:
+                    pool.shutdown(wait=False)
+                    pool = None
+                    entries = [_log_entry(self.parser_name, path, False, error="parser process crashed")]
+                except Exception as e:
+                    entries = [_log_entry(self.parser_name, path, False, error=str(e))]
+                self._report(entries, results, on_result)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+
+def run_bulk_parse(parser_name, html_paths, on_result=None, **options):
+    return BulkParser(parser_name, **options).run(html_paths, on_result)
@@ -0,0 +1,248 @@
+# core/cascade.py
+import asyncio
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import CACHE_DIR, SETTINGS
+from core.rate_limiter import host_of
+
+STATS_FILE = CACHE_DIR / "layer_stats.json"
+FLUSH_EVERY = 50  # recorded attempts between writes of the stats file
+MAX_TRIES = 200  # counts are halved past this so old results fade out
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Per-domain layer statistics
+# For every (host, layer) pair: attempts, successes and a moving
+# average of latency. Persisted to the cache directory so the next
+# batch starts from what earlier runs learned.
+# -------------------------------------------------------------------
+class LayerStats:
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.hosts = self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.hosts, f)
+            os.replace(tmp, self.path)
+            self._dirty = 0
+
+    def record(self, host, layer, ok, latency):
+        with self._lock:
+            s = self.hosts.setdefault(host, {}).setdefault(
+                layer, {"tries": 0, "successes": 0, "latency": latency}
+            )
+            s["tries"] += 1
+            s["successes"] += 1 if ok else 0
+            s["latency"] = round(0.8 * s["latency"] + 0.2 * latency, 3)
+            if s["tries"] > MAX_TRIES:
+                s["tries"] /= 2
+                s["successes"] /= 2
+            self._dirty += 1
+            due = self._dirty >= FLUSH_EVERY
+        if due:
+            self.flush()
+
+    def order(self, host, names, explore=None):
+        """
+        Layer names for host, most likely to succeed first (ties keep the
+        given order, then the faster layer wins). With probability
+        `explore` a random other layer is moved to the front so layers
+        that failed once still get retried now and then.
+        """
+        explore = SETTINGS["layer_explore"] if explore is None else explore
+        with self._lock:
+            known = dict(self.hosts.get(host, {}))
+
+        def score(name):
+            s = known.get(name)
+            if s is None:
+                return (-0.5, 0.0)  # untried: neutral prior
+            return (-(s["successes"] + 1) / (s["tries"] + 2), s["latency"])
+
+        ordered = sorted(names, key=score)
+        if len(ordered) > 1 and random.random() < explore:
+            ordered.insert(0, ordered.pop(random.randrange(1, len(ordered))))
+        return ordered
+
+    def snapshot(self, host=None):
+        """Rows of per-(host, layer) stats, for batch summaries."""
+        with self._lock:
+            items = self.hosts.items() if host is None else [(host, self.hosts.get(host, {}))]
+            return [
+                {
+                    "host": h,
+                    "layer": layer,
+                    "tries": s["tries"],
+                    "success_rate": round(s["successes"] / s["tries"], 3) if s["tries"] else 0.0,
+                    "latency_s": s["latency"],
+                }
+                for h, layers in items
+                for layer, s in layers.items()
+            ]
+
+
+def get_layer_stats():
+    """Process-wide layer statistics shared by every scrape worker."""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = LayerStats()
+                atexit.register(_stats.flush)
+    return _stats
+
+
+# -------------------------------------------------------------------
+# Race budget
+# Racing sends two requests where the cascade would send one, so only
+# SETTINGS["race_per_host"] races may be in flight per host; past
+# that, URLs take the plain sequential cascade. A race holds its slot
+# until every racer has stopped, including a losing racer that runs in
+# a thread and cannot be cancelled.
+# -------------------------------------------------------------------
+class _RaceBudget:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def take(self, host):
+        with self._lock:
+            if self._in_flight.get(host, 0) >= SETTINGS["race_per_host"]:
+                return False
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+            return True
+
+    def release(self, host):
+        with self._lock:
+            self._in_flight[host] -= 1
+
+    def release_after(self, host, futures):
+        """Release host once every future (racers still running in threads) is done."""
+        left = [f for f in futures if not f.done()]
+        if not left:
+            self.release(host)
+            return
+        count = [len(left)]
+
+        def settled(_):
+            with self._lock:
+                count[0] -= 1
+                last = count[0] == 0
+            if last:
+                self.release(host)
+
+        for f in left:
+            f.add_done_callback(settled)
+
+
+_race_budget = _RaceBudget()
+# Sync racers run here rather than in the loop's default executor, which
+# asyncio.run() would wait on before returning the winner
+_race_threads = ThreadPoolExecutor(max_workers=32, thread_name_prefix="race")
+
+
+async def _race(url, racers, accept, stats, host, threads):
+    """
+    Run racers together; the first accepted result wins and the rest are
+    cancelled. Without an accepted result, the first truthy one is
+    returned instead so the caller still has a page. The futures of
+    sync racers are appended to threads.
+    """
+    tasks = {}
+    for name, fn in racers:
+        if asyncio.iscoroutinefunction(fn):
+            task = asyncio.ensure_future(fn(url))
+        else:
+            threads.append(_race_threads.submit(fn, url))
+            task = asyncio.wrap_future(threads[-1])
+        tasks[task] = (name, time.monotonic())
+
+    pending = set(tasks)
+    fallback = (None, None)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, started = tasks[task]
+                try:
+                    res = task.result()
+                    ok = bool(res) and accept(res)
+                except Exception:
+                    res, ok = None, False
+                # same success notion as the sequential cascade, so both paths share stats
+                stats.record(host, name, bool(res), time.monotonic() - started)
+                if ok:
+                    return name, res
+                if res and fallback[1] is None:
+                    fallback = (name, res)
+        return fallback
+    finally:
+        # coroutine racers (e.g. pooled Playwright renders) stop here; racers
+        # already running in threads finish in the background and their
+        # result is dropped
+        for task in pending:
+            task.cancel()
+
+
+# -------------------------------------------------------------------
+# Cascade runner
+# layers is a list of (name, fn) pairs; fn(url) returns a result dict
+# or None. Layers run in the order learned for url's host and the
+# first truthy result wins. Returns (name, result) or (None, None).
+#
+# Opt-in racing: racers is a list of (name, fn) pairs, sync or async,
+# started together before the cascade. The first result passing
+# accept(res) wins, else the first truthy one; when every racer
+# failed, the cascade continues with the layers that were not raced.
+# -------------------------------------------------------------------
+def run_cascade(url, layers, stats=None, racers=None, accept=bool):
+    stats = stats or get_layer_stats()
+    host = host_of(url)
+    by_name = dict(layers)
+
+    raced = set()
+    if racers and len(racers) > 1 and _race_budget.take(host):
+        threads = []
+        try:
+            name, res = asyncio.run(_race(url, racers, accept, stats, host, threads))
+        finally:
+            _race_budget.release_after(host, threads)
+        if res:
+            return name, res
+        raced = {name for name, _ in racers}
+
+    for name in stats.order(host, [n for n, _ in layers if n not in raced]):
+        started = time.monotonic()
+        try:
+            res = by_name[name](url)
+        except Exception:
+            res = None
+        stats.record(host, name, bool(res), time.monotonic() - started)
+        if res:
+            return name, res
+    return None, None
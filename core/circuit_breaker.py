@@ -0,0 +1,168 @@
+# core/circuit_breaker.py
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+from config.settings import SETTINGS
+from core.rate_limiter import host_of
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+HOST_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.RetryError,
+)
+
+_breakers = None
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of contacting a host whose breaker is open."""
+
+
+def is_host_failure(exc):
+    """
+    Whether an exception means the host itself is unreachable or
+    stalling (connection errors, timeouts, net::ERR_* from browsers), as
+    opposed to a problem with the page or with our own tooling.
+    """
+    name = type(exc).__name__
+    return (
+        isinstance(exc, HOST_ERRORS)
+        or any(word in name for word in ("Timeout", "Connect", "Disconnected"))
+        or "net::ERR_" in str(exc)
+    )
+
+
+class _Call:
+    def __init__(self):
+        self.ok = True
+
+    def failed(self):
+        """Mark the call as a host failure without raising (e.g. a 5xx)."""
+        self.ok = False
+
+
+# -------------------------------------------------------------------
+# One breaker per host
+# closed: calls go through; `breaker_failures` host failures in a row
+# open the breaker. open: calls fail fast with CircuitOpenError until
+# `breaker_cooldown` seconds have passed. half-open: a single probe
+# call is let through; success closes the breaker, failure re-opens it
+# for another cool-down.
+# -------------------------------------------------------------------
+class _Breaker:
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+
+
+class CircuitBreakers:
+    def __init__(self, failures=None, cooldown=None):
+        self.max_failures = failures or SETTINGS["breaker_failures"]
+        self.cooldown = cooldown or SETTINGS["breaker_cooldown"]
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _get(self, host):
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = _Breaker()
+        return breaker
+
+    def is_open(self, url):
+        """True while url's host is failing fast (no state change)."""
+        with self._lock:
+            b = self._breakers.get(host_of(url))
+            if b is None or b.state == CLOSED:
+                return False
+            return b.state == HALF_OPEN or time.monotonic() - b.opened_at < self.cooldown
+
+    def allow(self, url):
+        with self._lock:
+            b = self._get(host_of(url))
+            if b.state == CLOSED:
+                return True
+            if b.state == OPEN and time.monotonic() - b.opened_at >= self.cooldown:
+                b.state = HALF_OPEN  # this caller is the probe
+                return True
+            b.rejected += 1
+            return False
+
+    def record(self, url, ok):
+        with self._lock:
+            b = self._get(host_of(url))
+            if ok:
+                b.state, b.failures = CLOSED, 0
+                return
+            b.failures += 1
+            if b.state == HALF_OPEN or b.failures >= self.max_failures:
+                if b.state != OPEN:
+                    b.trips += 1
+                b.state, b.opened_at = OPEN, time.monotonic()
+
+    def _release_probe(self, url):
+        # a probe that ended without an outcome (e.g. cancelled) re-opens the breaker
+        with self._lock:
+            b = self._get(host_of(url))
+            if b.state == HALF_OPEN:
+                b.state, b.opened_at = OPEN, time.monotonic()
+
+    @contextmanager
+    def guard(self, url):
+        """
+        Wrap one call to url's host. Raises CircuitOpenError when the host
+        is failing fast; otherwise records the outcome. Host failures are
+        exceptions matching is_host_failure() or call.failed().
+        """
+        if not self.allow(url):
+            raise CircuitOpenError(host_of(url))
+        call = _Call()
+        recorded = False
+        try:
+            yield call
+        except Exception as e:
+            self.record(url, ok=not is_host_failure(e))
+            recorded = True
+            raise
+        else:
+            self.record(url, ok=call.ok)
+            recorded = True
+        finally:
+            if not recorded:
+                self._release_probe(url)
+
+    def snapshot(self):
+        """Hosts whose breaker is not closed or has tripped, for batch summaries."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "host": host,
+                    "state": b.state,
+                    "consecutive_failures": b.failures,
+                    "trips": b.trips,
+                    "fast_failed_calls": b.rejected,
+                    "retry_in_s": round(max(0.0, self.cooldown - (now - b.opened_at)), 1) if b.state == OPEN else 0.0,
+                }
+                for host, b in self._breakers.items()
+                if b.state != CLOSED or b.trips
+            ]
+
+
+def get_breakers():
+    """Process-wide breakers shared by every scrape layer."""
+    global _breakers
+    if _breakers is None:
+        with _breakers_lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers()
+    return _breakers
@@ -0,0 +1,144 @@
+# core/driver_pool.py
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from config.settings import SETTINGS
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Chrome construction
+# The driver binary is resolved once per process instead of asking
+# webdriver-manager on every page.
+# -------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def chromedriver_path():
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def new_chrome_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--window-size=1920,1080")
+
+    service = Service(chromedriver_path())
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+# -------------------------------------------------------------------
+# Driver pool
+# At most `size` drivers exist at once. Warm drivers wait in a LIFO
+# queue between pages; a driver is quit and replaced after
+# `max_pages` pages, when it fails a health check, or when the page
+# it was serving raised.
+# -------------------------------------------------------------------
+class DriverPool:
+    def __init__(self, size=None, max_pages=None, factory=new_chrome_driver):
+        self.size = size or SETTINGS["selenium_pool_size"]
+        self.max_pages = max_pages or SETTINGS["selenium_pages_per_driver"]
+        self.factory = factory
+        self.stats = {"pages": 0, "created": 0, "recycled": 0, "crashed": 0}
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _alive(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self.factory()
+                with self._lock:
+                    self._uses[id(driver)] = 0
+                    self.stats["created"] += 1
+                return driver
+
+            if self._alive(driver):
+                return driver
+            with self._lock:
+                self.stats["crashed"] += 1
+            self._quit(driver)
+
+    def _checkin(self, driver):
+        with self._lock:
+            self._uses[id(driver)] += 1
+            self.stats["pages"] += 1
+            worn_out = self._uses[id(driver)] >= self.max_pages
+            if worn_out:
+                self.stats["recycled"] += 1
+
+        if worn_out:
+            self._quit(driver)
+            return
+        try:
+            driver.delete_all_cookies()  # next URL starts from a clean session
+        except Exception:
+            with self._lock:
+                self.stats["crashed"] += 1
+            self._quit(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """Borrow a warm driver for one page."""
+        self._slots.acquire()
+        try:
+            driver = self._checkout()
+            try:
+                yield driver
+            except Exception:
+                with self._lock:
+                    self.stats["crashed"] += 1
+                self._quit(driver)
+                raise
+            self._checkin(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def get_driver_pool():
+    """Process-wide Selenium pool sized by SETTINGS["selenium_pool_size"]."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = DriverPool()
+                atexit.register(_pool.close)
+    return _pool
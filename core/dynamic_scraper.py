@@ -1,35 +1,33 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import time
 
+from core.driver_pool import get_driver_pool
+from core.readiness import ready_policy, wait_for_ready
+from core.soup import make_soup
 
-def load_dynamic_page(url, wait=3, screenshot_path=None):
-    """Load a dynamic webpage with Selenium and return BeautifulSoup + optional screenshot."""
 
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")   # NEW Chrome headless mode
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
+def render_dynamic_page(url, ready=None, screenshot_path=None):
+    """
+    Render url with Selenium and return {"html", "title", "waited_s", "ready"}.
+    ready overrides the per-domain readiness policy (see core.readiness).
+    """
+    policy = ready_policy(url, **(ready or {}))
 
-    # FIXED: Modern ChromeDriver construction
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Warm driver from the shared pool; crashed drivers are replaced by the pool
+    with get_driver_pool().driver() as driver:
+        driver.get(url)
+        timing = wait_for_ready(driver, policy)  # allow JS to render
 
-    driver.get(url)
-    time.sleep(wait)  # allow JS to render
+        # Optional screenshot
+        if screenshot_path:
+            driver.save_screenshot(screenshot_path)
 
-    # Optional screenshot
-    if screenshot_path:
-        driver.save_screenshot(screenshot_path)
+        return {"html": driver.page_source, "title": driver.title, **timing}
 
-    html = driver.page_source
-    driver.quit()
 
-    soup = BeautifulSoup(html, "html.parser")
+def load_dynamic_page(url, wait=None, screenshot_path=None):
+    """Load a dynamic webpage with Selenium and return BeautifulSoup + optional screenshot.
+    wait, when given, caps the readiness wait in seconds."""
+    page = render_dynamic_page(url, ready={"max_wait_s": wait}, screenshot_path=screenshot_path)
+    soup = make_soup(page["html"])
     return soup
 
 
@@ -0,0 +1,154 @@
+# core/extractors.py
+from abc import ABC, abstractmethod
+
+from core.soup import make_soup
+
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+SECTION_ITEMS = ("p", "li", "div", "span")
+
+
+# -------------------------------------------------------------------
+# Parse-once extractor pipeline
+# A document is parsed once and its tags are walked once; each
+# extractor only sees the tag names it asks for, and tag texts are
+# computed once per document however many extractors read them. The
+# outputs are the ones the one-soup-per-type parsers in 5_Data gave.
+# -------------------------------------------------------------------
+class Document:
+    def __init__(self, soup):
+        self.soup = soup
+        self._texts = {}
+
+    def text(self, tag):
+        """tag.get_text(strip=True), computed once per tag."""
+        key = id(tag)
+        if key not in self._texts:
+            self._texts[key] = tag.get_text(strip=True)
+        return self._texts[key]
+
+
+class Extractor(ABC):
+    tags = ()  # tag names visit() is called for, in document order
+
+    @abstractmethod
+    def visit(self, tag, doc):
+        """Take one tag named in `tags`; doc.text(tag) gives its text."""
+
+    @abstractmethod
+    def result(self):
+        """The extracted items, once every tag has been visited."""
+
+
+class ParagraphsAndHeadings(Extractor):
+    tags = ("p",) + HEADINGS
+
+    def __init__(self):
+        self.paragraphs = []
+        self.headings = []
+
+    def visit(self, tag, doc):
+        txt = doc.text(tag)
+        if not txt:
+            return
+        if tag.name == "p":
+            self.paragraphs.append({"type": "paragraph", "content": txt})
+        else:
+            self.headings.append({"type": "heading", "level": tag.name, "content": txt})
+
+    def result(self):
+        return self.paragraphs + self.headings
+
+
+class LinksAndListItems(Extractor):
+    tags = ("a", "li")
+
+    def __init__(self):
+        self.links = []
+        self.items = []
+
+    def visit(self, tag, doc):
+        txt = doc.text(tag)
+        if tag.name == "a":
+            href = tag.get("href")
+            if txt or href:
+                self.links.append({"type": "link", "href": href, "content": txt})
+        elif txt:
+            self.items.append({"type": "list_item", "content": txt})
+
+    def result(self):
+        return self.links + self.items
+
+
+class KeywordSections(Extractor):
+    """
+    Items (p / li / div / span text) that follow a heading mentioning one
+    of keywords, up to the next heading or max_nodes items.
+    """
+    tags = HEADINGS
+
+    def __init__(self, item_type, keywords, max_nodes=50):
+        self.item_type = item_type
+        self.keywords = [k.lower() for k in keywords]
+        self.max_nodes = max_nodes
+        self.data = []
+
+    def visit(self, heading, doc):
+        heading_text = doc.text(heading)
+        lowered = heading_text.lower()
+        if not any(k in lowered for k in self.keywords):
+            return
+        count = 0
+        for sib in heading.next_siblings:
+            if isinstance(sib, str):
+                continue
+            if sib.name in HEADINGS:
+                break
+            if sib.name in SECTION_ITEMS:
+                content = doc.text(sib)
+                if content:
+                    self.data.append({
+                        "type": self.item_type,
+                        "section_heading": heading_text,
+                        "content": content
+                    })
+                    count += 1
+            if count >= self.max_nodes:
+                break
+
+    def result(self):
+        return self.data
+
+
+# Output key (the JSON file suffix) -> extractor factory
+EXTRACTORS = {
+    "type_1": ParagraphsAndHeadings,
+    "type_2": LinksAndListItems,
+    "type_3_job_description": lambda: KeywordSections(
+        "job_description",
+        ["job description", "role description", "main activities", "responsibilities", "what will you do"],
+    ),
+    "type_4_skills": lambda: KeywordSections("skill", ["skills", "competencies", "backgrounds", "preferred skills"]),
+    "type_5_eligibility": lambda: KeywordSections(
+        "eligibility", ["eligibility", "requirements", "profile", "who can apply", "criteria"]
+    ),
+}
+
+
+def run_extractors(soup, keys):
+    """{key: extracted items} for the EXTRACTORS keys, from one walk over soup."""
+    extractors = {key: EXTRACTORS[key]() for key in keys}
+    by_tag = {}
+    for extractor in extractors.values():
+        for name in extractor.tags:
+            by_tag.setdefault(name, []).append(extractor)
+
+    doc = Document(soup)
+    if by_tag:
+        for tag in soup.find_all(list(by_tag)):
+            for extractor in by_tag[tag.name]:
+                extractor.visit(tag, doc)
+    return {key: extractor.result() for key, extractor in extractors.items()}
+
+
+def extract_html(html, keys):
+    return run_extractors(make_soup(html), keys)
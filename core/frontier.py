@@ -0,0 +1,242 @@
+# core/frontier.py
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from config.settings import DATA_DIR, SETTINGS
+
+CRAWL_DIR = DATA_DIR / "crawl"
+DEFAULT_PORTS = {("http", 80), ("https", 443)}
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def normalize_url(url, base=None):
+    """
+    Canonical form used for seen checks: absolute http(s) URL with a
+    lower-case host, no default port, fragment or tracking parameters,
+    and sorted query parameters. Returns None for anything else.
+    """
+    try:
+        parts = urlsplit(urljoin(base, url.strip()) if base else url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return None
+    if scheme not in ("http", "https") or not host:
+        return None
+
+    netloc = host if port is None or (scheme, port) in DEFAULT_PORTS else f"{host}:{port}"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    ))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+# -------------------------------------------------------------------
+# Bloom filter
+# Remembers every URL ever queued in a fixed bit array (about 1.8 MB
+# per million URLs at a 0.1% false-positive rate). A false positive
+# only means a URL is skipped, never that one is fetched twice.
+# -------------------------------------------------------------------
+class BloomFilter:
+    _HEADER = struct.Struct("<QBQ")  # bits, hashes, items added
+
+    def __init__(self, capacity, error_rate):
+        self.m = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def __contains__(self, key):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key):
+        """Add key; returns False when it was (probably) already present."""
+        new = False
+        for p in self._positions(key):
+            byte, bit = p >> 3, 1 << (p & 7)
+            if not self.bits[byte] & bit:
+                self.bits[byte] |= bit
+                new = True
+        self.count += new
+        return new
+
+    def save(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(self._HEADER.pack(self.m, self.k, self.count))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            m, k, count = cls._HEADER.unpack(f.read(cls._HEADER.size))
+            bloom = cls.__new__(cls)
+            bloom.m, bloom.k, bloom.count = m, k, count
+            bloom.bits = bytearray(f.read())
+        return bloom
+
+
+# -------------------------------------------------------------------
+# Crawl frontier
+# Queued URLs live in SQLite, the seen-set in a Bloom filter, so a
+# crawl of millions of URLs keeps neither list in memory and resumes
+# from data/crawl/<name>.* after a restart. Lower score is fetched
+# first: score = depth - host priority (SETTINGS["frontier_host_priority"]).
+# Popped URLs are leased until complete(); leases left over from a
+# crash are handed out again on the next start. checkpoint() commits
+# the queue every time but rewrites the Bloom file (megabytes) at most
+# every `frontier_bloom_save_s`, and close() always does. After a
+# crash the queued URLs are re-added to the loaded filter; only URLs
+# finished since its last save can be fetched again.
+# -------------------------------------------------------------------
+class Frontier:
+    def __init__(self, name="default", max_depth=None, same_host=True, directory=CRAWL_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.name = name
+        self.max_depth = SETTINGS["frontier_max_depth"] if max_depth is None else max_depth
+        self.same_host = same_host
+        self._bloom_path = os.path.join(directory, f"{name}.bloom")
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(os.path.join(directory, f"{name}.sqlite"), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS queue (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                host TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                score REAL NOT NULL,
+                leased INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS queue_next ON queue (leased, score, id);
+            CREATE INDEX IF NOT EXISTS queue_url ON queue (url);
+            CREATE TABLE IF NOT EXISTS hosts (host TEXT PRIMARY KEY);
+            UPDATE queue SET leased = 0;
+        """)
+        self.hosts = {row[0] for row in self._db.execute("SELECT host FROM hosts")}
+
+        if os.path.exists(self._bloom_path):
+            self.seen = BloomFilter.load(self._bloom_path)
+        else:
+            self.seen = BloomFilter(SETTINGS["frontier_bloom_capacity"], SETTINGS["frontier_bloom_error"])
+        for (url,) in self._db.execute("SELECT url FROM queue"):
+            self.seen.add(url)  # queued after the filter was last saved
+        self._bloom_saved_at = time.monotonic()
+
+    def _score(self, host, depth):
+        return depth - SETTINGS["frontier_host_priority"].get(host, 0)
+
+    def _enqueue(self, url, depth):
+        host = urlsplit(url).hostname
+        if self.same_host and host not in self.hosts:
+            return False
+        if not self.seen.add(url):
+            return False
+        self._db.execute(
+            "INSERT INTO queue (url, host, depth, score) VALUES (?, ?, ?, ?)",
+            (url, host, depth, self._score(host, depth)),
+        )
+        return True
+
+    # ---------------------------------------------------------
+    # Adding URLs
+    # ---------------------------------------------------------
+    def add_seeds(self, urls):
+        """Queue start URLs at depth 0; their hosts become crawlable. Returns how many were new."""
+        added = 0
+        with self._lock:
+            for url in urls:
+                url = normalize_url(url)
+                if not url:
+                    continue
+                host = urlsplit(url).hostname
+                if host not in self.hosts:
+                    self.hosts.add(host)
+                    self._db.execute("INSERT OR IGNORE INTO hosts VALUES (?)", (host,))
+                added += self._enqueue(url, 0)
+        return added
+
+    def add_links(self, links, base_url, depth):
+        """Queue links found on base_url (e.g. parse_html_to_json_v3 "links") at depth."""
+        if depth > self.max_depth:
+            return 0
+        added = 0
+        with self._lock:
+            for link in links:
+                url = normalize_url(link, base=base_url)
+                if url:
+                    added += self._enqueue(url, depth)
+        return added
+
+    # ---------------------------------------------------------
+    # Scheduling
+    # ---------------------------------------------------------
+    def pop_batch(self, n, per_host=None):
+        """
+        Lease up to n URLs, lowest score first and at most per_host from
+        any one host, as a list of (url, depth).
+        """
+        per_host = per_host or SETTINGS["frontier_per_host_batch"]
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, url, host, depth FROM queue WHERE leased = 0 ORDER BY score, id LIMIT ?",
+                (n * per_host * 4,),
+            ).fetchall()
+
+            picked, per = [], {}
+            for row_id, url, host, depth in rows:
+                if per.get(host, 0) >= per_host:
+                    continue
+                per[host] = per.get(host, 0) + 1
+                picked.append((row_id, url, depth))
+                if len(picked) == n:
+                    break
+
+            self._db.executemany("UPDATE queue SET leased = 1 WHERE id = ?", [(r[0],) for r in picked])
+            return [(url, depth) for _, url, depth in picked]
+
+    def complete(self, urls):
+        """Drop finished (or given-up) URLs from the queue."""
+        with self._lock:
+            self._db.executemany("DELETE FROM queue WHERE url = ? AND leased = 1", [(u,) for u in urls])
+
+    # ---------------------------------------------------------
+    # Persistence and stats
+    # ---------------------------------------------------------
+    def checkpoint(self, force=False):
+        """Commit the queue; save the Bloom filter when it is due (or forced)."""
+        with self._lock:
+            self._db.commit()
+            now = time.monotonic()
+            if force or now - self._bloom_saved_at >= SETTINGS["frontier_bloom_save_s"]:
+                self.seen.save(self._bloom_path)
+                self._bloom_saved_at = now
+
+    def close(self):
+        self.checkpoint(force=True)
+        self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            queued, leased = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(leased), 0) FROM queue"
+            ).fetchone()
+        return {"queued": queued, "leased": leased, "seen": self.seen.count, "hosts": len(self.hosts)}
@@ -0,0 +1,265 @@
+# core/html_store.py
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+
+from config.settings import DATA_DIR, SETTINGS
+
+try:
+    import zstandard
+except ImportError:  # optional: blobs fall back to gzip
+    zstandard = None
+
+STORE_DIR = DATA_DIR / "html_store"
+HTML_DIR = "scraped_html"
+CODECS = {"zstd": ".zst", "gzip": ".gz"}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _codec():
+    if SETTINGS["html_store_codec"] == "zstd" and zstandard is not None:
+        return "zstd"
+    return "gzip"
+
+
+def _key(path):
+    return os.path.normpath(str(path))
+
+
+# -------------------------------------------------------------------
+# Streaming blob writer
+# Bytes are hashed and compressed into a temporary file as they
+# arrive; commit() moves the file to its sharded place under the
+# SHA-256, or drops it when that blob is already stored.
+# -------------------------------------------------------------------
+class BlobWriter:
+    def __init__(self, store):
+        self.store = store
+        self.codec = _codec()
+        self.digest = hashlib.sha256()
+        self.size = 0
+        fd, self.tmp = tempfile.mkstemp(dir=store.root, suffix=".part")
+        self._raw = os.fdopen(fd, "wb")
+        if self.codec == "zstd":
+            self._out = zstandard.ZstdCompressor(level=SETTINGS["html_store_level"]).stream_writer(self._raw)
+        else:
+            self._out = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=SETTINGS["html_store_level"], mtime=0)
+
+    def write(self, data):
+        self.digest.update(data)
+        self.size += len(data)
+        self._out.write(data)
+
+    def commit(self):
+        """Finish the blob and return its SHA-256 hex digest."""
+        self._out.close()
+        if not self._raw.closed:
+            self._raw.close()
+        blob = self.digest.hexdigest()
+        path = self.store.blob_path(blob, self.codec)
+        if self.store.has_blob(blob):
+            os.remove(self.tmp)
+            outcome = "deduplicated"
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self.tmp, path)
+            outcome = "stored"
+        with self.store._lock:
+            self.store.counters[outcome] += 1
+        return blob
+
+    def abort(self):
+        try:
+            self._out.close()
+            if not self._raw.closed:
+                self._raw.close()
+        finally:
+            if os.path.exists(self.tmp):
+                os.remove(self.tmp)
+
+
+# -------------------------------------------------------------------
+# Content-addressed HTML store
+# Page bodies are kept once per SHA-256 (the compute_hash of the
+# pages) as compressed blobs in data/html_store/<aa>/<bb>/<hash>.
+# Callers keep using scraped_html/<name>.html paths: a small SQLite
+# index maps each such name to its blob and to the URL it came from,
+# so re-scraping an unchanged page only adds an index row. Paths that
+# are not in the index are read from disk, so files saved before the
+# store existed keep working.
+# -------------------------------------------------------------------
+class HtmlStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = str(root)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS names (
+                name TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                blob TEXT NOT NULL,
+                url TEXT,
+                saved_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS names_folder ON names (folder);
+            CREATE INDEX IF NOT EXISTS names_url ON names (url, saved_at);
+        """)
+        self.reset_stats()
+
+    # ---------------------------------------------------------
+    # Blobs
+    # ---------------------------------------------------------
+    def blob_path(self, blob, codec):
+        return os.path.join(self.root, blob[:2], blob[2:4], blob + CODECS[codec])
+
+    def _find_blob(self, blob):
+        for codec in CODECS:
+            path = self.blob_path(blob, codec)
+            if os.path.exists(path):
+                return path, codec
+        return None, None
+
+    def has_blob(self, blob):
+        return self._find_blob(blob)[0] is not None
+
+    def read_blob(self, blob):
+        path, codec = self._find_blob(blob)
+        if path is None:
+            raise FileNotFoundError(f"HTML blob missing: {blob}")
+        with open(path, "rb") as f:
+            if codec == "zstd":
+                if zstandard is None:
+                    raise RuntimeError("zstandard is needed to read zstd blobs")
+                return zstandard.ZstdDecompressor().decompressobj().decompress(f.read())
+            return gzip.decompress(f.read())
+
+    def writer(self):
+        return BlobWriter(self)
+
+    # ---------------------------------------------------------
+    # Named pages
+    # ---------------------------------------------------------
+    def link(self, name, blob, url=None):
+        """Point name (a scraped_html/... path) at blob; returns the name."""
+        name = _key(name)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO names VALUES (?, ?, ?, ?, ?)",
+                (name, os.path.dirname(name), blob, url, datetime.utcnow().isoformat()),
+            )
+            self._db.commit()
+        return name
+
+    def save(self, html, name, url=None):
+        """Store html under name; an unchanged page costs no blob space."""
+        writer = self.writer()
+        try:
+            writer.write(html.encode("utf-8"))
+            blob = writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+        return self.link(name, blob, url)
+
+    def blob_of(self, name):
+        with self._lock:
+            row = self._db.execute("SELECT blob FROM names WHERE name = ?", (_key(name),)).fetchone()
+        return row[0] if row else None
+
+    def exists(self, name):
+        return self.blob_of(name) is not None or os.path.exists(name)
+
+    def read(self, name):
+        """Text of a saved page, from the store or (legacy) from disk."""
+        blob = self.blob_of(name)
+        if blob is None:
+            with open(name, "r", encoding="utf-8") as f:
+                return f.read()
+        return self.read_blob(blob).decode("utf-8")
+
+    def list_names(self, folder=HTML_DIR):
+        """File names of the .html pages in folder, like os.listdir()."""
+        with self._lock:
+            rows = self._db.execute("SELECT name FROM names WHERE folder = ?", (_key(folder),)).fetchall()
+        names = {os.path.basename(row[0]) for row in rows}
+        if os.path.isdir(folder):
+            names.update(f for f in os.listdir(folder) if f.endswith(".html"))
+        return sorted(names)
+
+    def blobs(self, folder=HTML_DIR):
+        """{file name: blob} for the stored pages in folder, in one query."""
+        with self._lock:
+            rows = self._db.execute("SELECT name, blob FROM names WHERE folder = ?", (_key(folder),)).fetchall()
+        return {os.path.basename(name): blob for name, blob in rows}
+
+    def latest_for(self, url):
+        """{"name", "blob", "saved_at"} of the newest page saved for url, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT name, blob, saved_at FROM names WHERE url = ? ORDER BY saved_at DESC LIMIT 1", (url,)
+            ).fetchone()
+        return dict(zip(("name", "blob", "saved_at"), row)) if row else None
+
+    def import_folder(self, folder=HTML_DIR):
+        """Move the plain .html files in folder into the store; returns how many."""
+        moved = 0
+        for f in sorted(os.listdir(folder)):
+            path = os.path.join(folder, f)
+            if not f.endswith(".html") or self.blob_of(path) is not None:
+                continue
+            with open(path, "rb") as fh:
+                writer = self.writer()
+                try:
+                    for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                        writer.write(chunk)
+                    blob = writer.commit()
+                except BaseException:
+                    writer.abort()
+                    raise
+            self.link(path, blob)
+            os.remove(path)
+            moved += 1
+        return moved
+
+    def reset_stats(self):
+        self.counters = {"stored": 0, "deduplicated": 0}
+
+    def stats(self):
+        with self._lock:
+            names, blobs, urls = self._db.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT blob), COUNT(DISTINCT url) FROM names"
+            ).fetchone()
+        stored_bytes = sum(
+            entry.stat().st_size
+            for shard in os.scandir(self.root) if shard.is_dir()
+            for sub in os.scandir(shard.path) if sub.is_dir()
+            for entry in os.scandir(sub.path)
+        )
+        return dict(self.counters, pages=names, blobs=blobs, urls=urls, stored_mb=round(stored_bytes / 1e6, 2))
+
+
+def get_html_store():
+    """Process-wide store shared by the scrapers, parsers and viewers."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HtmlStore()
+    return _store
+
+
+def read_html(path):
+    """Text of a saved page; works for stored and legacy plain files."""
+    return get_html_store().read(path)
+
+
+def list_html(folder=HTML_DIR):
+    return get_html_store().list_names(folder)
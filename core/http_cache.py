@@ -0,0 +1,146 @@
+# core/http_cache.py
+import atexit
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from config.settings import CACHE_DIR
+from core.html_store import get_html_store, read_html
+
+CACHE_FILE = CACHE_DIR / "http_cache.json"
+HTML_DIR = "scraped_html"
+FLUSH_EVERY = 50  # remembered URLs between writes of the cache file
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Conditional-GET cache
+# Stores ETag / Last-Modified per URL together with the path of the
+# HTML already saved for it. Re-scrapes send If-None-Match /
+# If-Modified-Since; a 304 reuses the saved file instead of
+# downloading and writing the page again.
+# -------------------------------------------------------------------
+class RevalidationCache:
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.entries = self._load()
+        self.reset_stats()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.path)
+            self._dirty = 0
+
+    # ---------------------------------------------------------
+    # Request side
+    # ---------------------------------------------------------
+    def headers_for(self, url):
+        """Conditional headers for url, or {} when there is nothing usable cached."""
+        with self._lock:
+            self.counters["requests"] += 1
+            entry = self.entries.get(url)
+            if not entry or not get_html_store().exists(entry["html_path"]):
+                return {}
+            self.counters["revalidations"] += 1
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def not_modified(self, url):
+        """Handle a 304: return {"html", "html_path"} from the saved file."""
+        with self._lock:
+            entry = self.entries[url]
+            self.counters["hits"] += 1
+        return {"html": read_html(entry["html_path"]), "html_path": entry["html_path"]}
+
+    def get(self, session, url, **kwargs):
+        """requests-style GET through the cache. Returns (response, cached_or_None)."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self.headers_for(url))
+        resp = session.get(url, headers=headers, **kwargs)
+        if resp.status_code == 304 and url in self.entries:
+            return resp, self.not_modified(url)
+        return resp, None
+
+    # ---------------------------------------------------------
+    # Response side
+    # ---------------------------------------------------------
+    def remember(self, url, etag, last_modified, html_path):
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self.entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "html_path": html_path,
+                "stored_at": datetime.utcnow().isoformat(),
+            }
+            self._dirty += 1
+            due = self._dirty >= FLUSH_EVERY
+        if due:
+            self.flush()
+
+    def remember_response(self, url, resp, html_path=None):
+        """Remember a 200 response, saving its body first when the caller has not."""
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        if html_path is None:
+            html_path = _save_body(resp.text, url)
+        self.remember(url, etag, last_modified, html_path)
+
+    # ---------------------------------------------------------
+    # Stats for batch summaries
+    # ---------------------------------------------------------
+    def reset_stats(self):
+        self.counters = {"requests": 0, "revalidations": 0, "hits": 0}
+
+    def stats(self):
+        c = dict(self.counters)
+        total = c["requests"] or 1
+        c["hit_rate"] = c["hits"] / total
+        c["revalidation_rate"] = c["revalidations"] / total
+        return c
+
+
+def _save_body(html, url=None):
+    timestamp = datetime.utcnow().isoformat().replace(":", "-").split(".")[0]
+    short_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()[:8]
+    name = f"{timestamp}_cache_{short_hash}.html"
+    return get_html_store().save(html, os.path.join(HTML_DIR, name), url)
+
+
+def get_cache():
+    """Process-wide cache shared by every page in the Streamlit server."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RevalidationCache()
+                atexit.register(_cache.flush)
+    return _cache
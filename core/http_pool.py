@@ -0,0 +1,178 @@
+# core/http_pool.py
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from config.settings import SETTINGS
+from core.rate_limiter import get_limiter
+
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_METHODS = ("GET", "HEAD")
+
+_session = None
+_adapter = None
+_lock = threading.Lock()
+
+# sockets actually opened, keyed by "scheme://host:port"
+_opened = {}
+_opened_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Connection classes that count real socket opens.
+# urllib3's own num_connections only counts connection objects, and
+# an object that reconnects after the server closed it is not counted.
+# -------------------------------------------------------------------
+def _count_open(scheme, host, port):
+    key = f"{scheme}://{host}:{port}"
+    with _opened_lock:
+        _opened[key] = _opened.get(key, 0) + 1
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        super().connect()
+        _count_open("http", self.host, self.port)
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        super().connect()
+        _count_open("https", self.host, self.port)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+class _PacedSession(requests.Session):
+    """
+    Session that sends every request through the per-host rate limiter.
+    5xx responses to GET/HEAD are retried here rather than by the
+    adapter's Retry, so every attempt waits for the limiter and its
+    status (a 503 halves the host rate) reaches limiter.feedback().
+    The last response is returned when the retries run out.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        limiter = get_limiter()
+        retries = SETTINGS["http_retries"] if method.upper() in RETRY_METHODS else 0
+        for attempt in range(retries + 1):
+            limiter.acquire(url)
+            resp = super().request(method, url, *args, **kwargs)
+            limiter.feedback(url, resp.status_code, resp.headers.get("Retry-After"))
+            if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                return resp
+            resp.close()
+            time.sleep(SETTINGS["http_retry_backoff"] * 2 ** attempt)
+
+
+# -------------------------------------------------------------------
+# Process-wide session
+# One keep-alive connection pool per host, shared by every scrape
+# layer and every worker thread. pool_block=True turns pool_maxsize
+# into a hard per-host connection limit: extra workers wait for a
+# free socket instead of opening throwaway ones. Requests are paced
+# per host by core.rate_limiter.
+# -------------------------------------------------------------------
+def _build_session():
+    global _adapter
+
+    # connection errors only: 5xx retries go through _PacedSession
+    retry = Retry(
+        total=SETTINGS["http_retries"],
+        backoff_factor=SETTINGS["http_retry_backoff"],
+        allowed_methods=frozenset(RETRY_METHODS),
+    )
+    _adapter = _PooledAdapter(
+        pool_connections=SETTINGS["http_pool_hosts"],
+        pool_maxsize=SETTINGS["http_pool_per_host"],
+        pool_block=True,
+        max_retries=retry,
+    )
+
+    session = _PacedSession()
+    session.mount("http://", _adapter)
+    session.mount("https://", _adapter)
+    return session
+
+
+def get_session():
+    """Return the shared requests.Session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def reset_session():
+    """Close every pooled connection and start over on the next call."""
+    global _session, _adapter
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _adapter = None
+    with _opened_lock:
+        _opened.clear()
+
+
+# -------------------------------------------------------------------
+# Pool statistics
+# Every request beyond the sockets opened for a host reused a
+# kept-alive connection.
+# -------------------------------------------------------------------
+def pool_stats():
+    hosts = []
+    if _adapter is not None:
+        pools = _adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+
+            name = f"{pool.scheme}://{pool.host}:{pool.port}"
+            idle = sum(
+                1 for conn in list(pool.pool.queue)
+                if conn is not None and conn.is_connected
+            )
+            busy = pool.pool.maxsize - pool.pool.qsize()
+
+            hosts.append({
+                "host": name,
+                "requests": pool.num_requests,
+                "connections_opened": _opened.get(name, 0),
+                "idle_sockets": idle,
+                "busy_sockets": busy,
+            })
+
+    total_requests = sum(h["requests"] for h in hosts)
+    total_opened = sum(h["connections_opened"] for h in hosts)
+
+    return {
+        "hosts": hosts,
+        "requests": total_requests,
+        "connections_opened": total_opened,
+        "reuse_ratio": max(0.0, 1 - total_opened / total_requests) if total_requests else 0.0,
+        "open_sockets": sum(h["idle_sockets"] + h["busy_sockets"] for h in hosts),
+    }
@@ -1,17 +1,134 @@
-def dedupe_by_key(existing, new_list, key="id"):
-    seen = {item.get(key) for item in existing if item.get(key)}
-    merged = []
-    added = 0
-    deduped = 0
-
-    for item in new_list:
-        k = item.get(key)
-        if k and k not in seen:
-            merged.append(item)
-            seen.add(k)
-            added += 1
-        else:
-            deduped += 1
+import hashlib
+import json
+import sqlite3
+
+from config.settings import SETTINGS
+
+
+# -------------------------------------------------------------------
+# Record keys
+# A key spec is a field name, a tuple of field names (composite key),
+# a callable record -> value, or None for "the record's content".
+# Records the spec gives no value for (e.g. no "id") are keyed by a
+# normalized content hash: whitespace collapsed, dict order ignored,
+# and top-level "_" metadata fields such as _source_url left out.
+# Keys are reduced to 64-bit digests, so remembering a record costs
+# a few dozen bytes whatever its size.
+# -------------------------------------------------------------------
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _digest(kind, value):
+    data = json.dumps(_normalize(value), sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    digest = hashlib.blake2b(f"{kind}:{data}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)  # fits an SQLite INTEGER
+
+
+def content_hash(record):
+    if isinstance(record, dict):
+        record = {k: v for k, v in record.items() if not str(k).startswith("_")}
+    return _digest("content", record)
+
+
+def key_extractor(key="id"):
+    """Function record -> 64-bit key digest for a key spec (see above)."""
+    if key is None:
+        return content_hash
+    if callable(key):
+        extract = key
+    elif isinstance(key, (tuple, list)):
+        fields = tuple(key)
+
+        def extract(record):
+            values = tuple(record.get(f) for f in fields)
+            return values if any(v is not None and v != "" for v in values) else None
+    else:
+        def extract(record):
+            value = record.get(key)
+            return None if value == "" else value
+
+    def key_of(record):
+        value = extract(record) if isinstance(record, dict) else None
+        return content_hash(record) if value is None else _digest("key", value)
+
+    return key_of
+
+
+# -------------------------------------------------------------------
+# Seen-key set
+# Digests live in a Python set until `dedupe_memory_keys` of them are
+# held; they are then moved in one batch into a temporary on-disk
+# SQLite table and the set starts over, so memory stays bounded for
+# datasets of any size.
+# -------------------------------------------------------------------
+class SeenKeys:
+    def __init__(self, key="id", max_memory=None):
+        self.key_of = key_extractor(key)
+        self.max_memory = max_memory or SETTINGS["dedupe_memory_keys"]
+        self._memory = set()
+        self._db = None
+        self._spilled = 0
+
+    def _on_disk(self, digest):
+        return self._db is not None and self._db.execute("SELECT 1 FROM seen WHERE k = ?", (digest,)).fetchone() is not None
+
+    def _spill(self):
+        if self._db is None:
+            self._db = sqlite3.connect("")  # private temporary database, removed on close
+            self._db.execute("CREATE TABLE seen (k INTEGER PRIMARY KEY)")
+        with self._db:
+            self._db.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((k,) for k in self._memory))
+        self._spilled += len(self._memory)
+        self._memory = set()
+
+    def add(self, record):
+        """Remember record; returns False when an equal key was already seen."""
+        digest = self.key_of(record)
+        if digest in self._memory or self._on_disk(digest):
+            return False
+        self._memory.add(digest)
+        if len(self._memory) >= self.max_memory:
+            self._spill()
+        return True
+
+    def update(self, records):
+        for record in records:
+            self.add(record)
+
+    def __contains__(self, record):
+        digest = self.key_of(record)
+        return digest in self._memory or self._on_disk(digest)
+
+    def __len__(self):
+        return self._spilled + len(self._memory)
+
+
+def dedupe_stream(new_items, seen):
+    """Yield the items of new_items whose key seen has not had yet; one pass, lazily."""
+    for item in new_items:
+        if seen.add(item):
+            yield item
+
+
+def dedupe_by_key(existing, new_list, key="id", seen=None):
+    """
+    seen: SeenKeys already holding existing's keys, kept up to date by the
+    caller (e.g. DatasetService) so existing need not be scanned each call.
+    """
+    if seen is None:
+        seen = SeenKeys(key)
+        seen.update(existing)
+    new_list = list(new_list)
+    merged = list(dedupe_stream(new_list, seen))
+    added = len(merged)
+    deduped = len(new_list) - added
 
     merged = existing + merged
     return merged, added, deduped
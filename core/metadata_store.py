@@ -0,0 +1,257 @@
+# core/metadata_store.py
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from config.settings import DATA_DIR
+
+DB_FILE = DATA_DIR / "metadata.sqlite"
+PARSER_LOG_FILE = "parser_run_log.json"  # parser runs logged before the store
+
+SCRAPE_COLUMNS = ("batch_id", "timestamp", "url", "method", "status", "html_path", "html_hash")
+PARSER_COLUMNS = ("timestamp", "parser_name", "status", "html_file_path", "output_json_path", "items_extracted")
+MANIFEST_COLUMNS = ("html_hash", "parser_name", "parser_hash", "html_path", "output_path")
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Scrape / parser-run / batch metadata in SQLite (WAL)
+# Each log entry is kept whole as JSON next to the columns that are
+# looked up, so entries come back exactly as they were logged while
+# "latest scrape for a URL" or "has this hash been seen" are B-tree
+# index lookups instead of scans over a JSON file. WAL lets the pages
+# read while a batch is writing. The hashes table maps each page hash
+# to the first entry logged with it, for duplicate checks that must
+# not wait for the scrape log's writer thread. parse_manifest records
+# which page content each parser version has already turned into JSON
+# (see core.parse_manifest).
+# -------------------------------------------------------------------
+class MetadataStore:
+    def __init__(self, path=DB_FILE):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS scrapes (
+                id INTEGER PRIMARY KEY,
+                batch_id TEXT,
+                timestamp TEXT,
+                url TEXT,
+                method TEXT,
+                status TEXT,
+                html_path TEXT,
+                html_hash TEXT,
+                entry TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS scrapes_url ON scrapes (url, timestamp);
+            CREATE INDEX IF NOT EXISTS scrapes_hash ON scrapes (html_hash);
+            CREATE INDEX IF NOT EXISTS scrapes_batch ON scrapes (batch_id);
+            CREATE TABLE IF NOT EXISTS parser_runs (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT,
+                parser_name TEXT,
+                status TEXT,
+                html_file_path TEXT,
+                output_json_path TEXT,
+                items_extracted INTEGER,
+                entry TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS parser_runs_html ON parser_runs (html_file_path, parser_name);
+            CREATE TABLE IF NOT EXISTS batches (
+                batch_id TEXT PRIMARY KEY,
+                source TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                urls INTEGER,
+                succeeded INTEGER,
+                failed INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS hashes (
+                html_hash TEXT PRIMARY KEY,
+                entry TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS parse_manifest (
+                html_hash TEXT NOT NULL,
+                parser_name TEXT NOT NULL,
+                parser_hash TEXT NOT NULL,
+                html_path TEXT,
+                output_path TEXT,
+                parsed_at TEXT,
+                PRIMARY KEY (html_hash, parser_name, parser_hash)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS parse_manifest_parser ON parse_manifest (parser_name, parser_hash);
+            CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, done_at TEXT);
+        """)
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    # ---------------------------------------------------------
+    # Writes (one transaction per call)
+    # ---------------------------------------------------------
+    def add_scrapes(self, entries):
+        rows = [
+            tuple(e.get(c) for c in SCRAPE_COLUMNS) + (json.dumps(e, ensure_ascii=False, default=str),)
+            for e in entries
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                f"INSERT INTO scrapes ({', '.join(SCRAPE_COLUMNS)}, entry) VALUES ({', '.join('?' * (len(SCRAPE_COLUMNS) + 1))})",
+                rows,
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO hashes VALUES (?, ?)",
+                [(e["html_hash"], row[-1]) for e, row in zip(entries, rows) if e.get("html_hash")],
+            )
+
+    def add_parser_runs(self, entries):
+        rows = [
+            tuple(e.get(c) for c in PARSER_COLUMNS) + (json.dumps(e, ensure_ascii=False, default=str),)
+            for e in entries
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                f"INSERT INTO parser_runs ({', '.join(PARSER_COLUMNS)}, entry) VALUES ({', '.join('?' * (len(PARSER_COLUMNS) + 1))})",
+                rows,
+            )
+
+    def record_parses(self, rows):
+        """Upsert parse_manifest rows ({html_hash, parser_name, parser_hash, html_path, output_path})."""
+        now = datetime.utcnow().isoformat()
+        with self._lock, self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO parse_manifest ({', '.join(MANIFEST_COLUMNS)}, parsed_at) "
+                f"VALUES ({', '.join('?' * (len(MANIFEST_COLUMNS) + 1))})",
+                [tuple(r.get(c) for c in MANIFEST_COLUMNS) + (now,) for r in rows],
+            )
+
+    def start_batch(self, urls, source=None):
+        """Register a new batch and return its id (batch_001, batch_002, ...)."""
+        with self._lock, self._db:
+            last = self._db.execute(
+                "SELECT MAX(CAST(SUBSTR(batch_id, 7) AS INTEGER)) FROM "
+                "(SELECT batch_id FROM batches UNION SELECT batch_id FROM scrapes) WHERE batch_id LIKE 'batch_%'"
+            ).fetchone()[0]
+            batch_id = f"batch_{(last or 0) + 1:03d}"
+            self._db.execute(
+                "INSERT INTO batches (batch_id, source, started_at, urls) VALUES (?, ?, ?, ?)",
+                (batch_id, source, datetime.utcnow().isoformat(), urls),
+            )
+        return batch_id
+
+    def finish_batch(self, batch_id, succeeded, failed):
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE batches SET finished_at = ?, succeeded = ?, failed = ? WHERE batch_id = ?",
+                (datetime.utcnow().isoformat(), succeeded, failed, batch_id),
+            )
+
+    # ---------------------------------------------------------
+    # Lookups
+    # ---------------------------------------------------------
+    def latest_scrape(self, url):
+        rows = self._query("SELECT entry FROM scrapes WHERE url = ? ORDER BY timestamp DESC LIMIT 1", (url,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def find_hash(self, html_hash):
+        """First scrape entry logged with html_hash, or None."""
+        rows = self._query("SELECT entry FROM hashes WHERE html_hash = ?", (html_hash,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def claim_hash(self, html_hash, entry):
+        """
+        Record entry as the first one for html_hash. Returns None when it
+        was, else the entry that already holds the hash; safe to call from
+        concurrent workers.
+        """
+        with self._lock, self._db:
+            claimed = self._db.execute(
+                "INSERT OR IGNORE INTO hashes VALUES (?, ?)",
+                (html_hash, json.dumps(entry, ensure_ascii=False, default=str)),
+            ).rowcount
+            if claimed:
+                return None
+            return json.loads(self._db.execute("SELECT entry FROM hashes WHERE html_hash = ?", (html_hash,)).fetchone()[0])
+
+    def scrapes(self, batch_id=None):
+        if batch_id is None:
+            rows = self._query("SELECT entry FROM scrapes ORDER BY id")
+        else:
+            rows = self._query("SELECT entry FROM scrapes WHERE batch_id = ? ORDER BY id", (batch_id,))
+        return [json.loads(r[0]) for r in rows]
+
+    def parsed_hashes(self, parser_name=None, parser_hash=None):
+        """Page hashes in parse_manifest: any parse, or by this parser (version)."""
+        if parser_name is None:
+            rows = self._query("SELECT DISTINCT html_hash FROM parse_manifest")
+        elif parser_hash is None:
+            rows = self._query("SELECT html_hash FROM parse_manifest WHERE parser_name = ?", (parser_name,))
+        else:
+            rows = self._query(
+                "SELECT html_hash FROM parse_manifest WHERE parser_name = ? AND parser_hash = ?",
+                (parser_name, parser_hash),
+            )
+        return {r[0] for r in rows}
+
+    def parser_runs(self):
+        return [json.loads(r[0]) for r in self._query("SELECT entry FROM parser_runs ORDER BY id")]
+
+    def batches(self):
+        cols = ("batch_id", "source", "started_at", "finished_at", "urls", "succeeded", "failed")
+        return [dict(zip(cols, r)) for r in self._query(f"SELECT {', '.join(cols)} FROM batches ORDER BY started_at")]
+
+    # ---------------------------------------------------------
+    # One-off imports of the JSON logs
+    # ---------------------------------------------------------
+    def _index_logged_hashes(self):
+        # scrapes logged before the hashes table existed
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO hashes SELECT html_hash, entry FROM scrapes WHERE html_hash IS NOT NULL ORDER BY id"
+            )
+
+    def migrate_once(self, name, run):
+        """Call run() the first time name is seen; later calls do nothing."""
+        if self._query("SELECT 1 FROM migrations WHERE name = ?", (name,)):
+            return False
+        run()
+        with self._lock, self._db:
+            self._db.execute("INSERT OR IGNORE INTO migrations VALUES (?, ?)", (name, datetime.utcnow().isoformat()))
+        return True
+
+
+def _load_parser_log(path=PARSER_LOG_FILE):
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return list(json.load(f))
+    except Exception:
+        return []
+
+
+def get_metadata_store():
+    """
+    Process-wide metadata store. The first call imports scrape_log.json /
+    scrape_log.jsonl and parser_run_log.json, once per database.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from core.scrape_log import get_scrape_log  # scrape_log mirrors into this store
+
+                store = MetadataStore()
+                store.migrate_once("scrape_log", lambda: store.add_scrapes(get_scrape_log().read_saved()))
+                store.migrate_once("parser_run_log", lambda: store.add_parser_runs(_load_parser_log()))
+                store.migrate_once("hash_index", store._index_logged_hashes)
+                _store = store
+    return _store
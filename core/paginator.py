@@ -0,0 +1,168 @@
+# core/paginator.py
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from config.settings import SETTINGS
+
+PAGE_PARAMS = ("page", "p", "pg", "paged", "pagenum", "pagenumber", "page_no")
+NEXT_TEXTS = {"next", "next page"}  # exact link texts; "More", "»" and the like also appear outside pagers
+PATH_PAGE_RE = re.compile(r"^(?P<prefix>.*/page/)(?P<num>\d+)(?P<suffix>/?)$")
+
+
+# -------------------------------------------------------------------
+# Next-link detection
+# -------------------------------------------------------------------
+def find_next_link(soup, base_url):
+    """Absolute URL of the "next page" link in soup, or None."""
+    for tag in soup.find_all(["link", "a"], rel=True):
+        if "next" in [r.lower() for r in tag.get("rel", [])] and tag.get("href"):
+            return urljoin(base_url, tag["href"])
+
+    for a in soup.find_all("a", href=True):
+        text = a.get_text(strip=True).lower()
+        label = (a.get("aria-label") or "").lower()
+        if text in NEXT_TEXTS or label.startswith("next"):
+            return urljoin(base_url, a["href"])
+    return None
+
+
+# -------------------------------------------------------------------
+# Page-number patterns
+# A listing is predictable when its page number lives in a query
+# parameter (?page=3) or a /page/3 path segment, either in the URL
+# itself or in the links to other pages. page_pattern() returns
+# (url_for(n), current_page, last_page_seen) or None.
+# -------------------------------------------------------------------
+def _with_param(parsed, param, n):
+    query = [(k, str(n) if k == param else v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)]
+    if param not in dict(query):
+        query.append((param, str(n)))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def page_pattern(url, soup):
+    base = urlparse(url)
+    numbers = {}  # pattern key -> page numbers seen
+    current = {}  # pattern key -> page number of url itself
+
+    def note(key, value):
+        if value.isdigit():
+            numbers.setdefault(key, set()).add(int(value))
+
+    # the URL itself
+    for k, v in parse_qsl(base.query):
+        if k.lower() in PAGE_PARAMS and v.isdigit():
+            note(("query", k), v)
+            current[("query", k)] = int(v)
+    m = PATH_PAGE_RE.match(base.path)
+    if m:
+        note(("path", m["prefix"], m["suffix"]), m["num"])
+        current[("path", m["prefix"], m["suffix"])] = int(m["num"])
+    base_path = m["prefix"][: -len("page/")] if m else base.path.rstrip("/") + "/"
+
+    # links to sibling pages on the same listing
+    for a in soup.find_all("a", href=True):
+        link = urlparse(urljoin(url, a["href"]))
+        if link.netloc != base.netloc:
+            continue
+        if link.path == base.path:
+            for k, v in parse_qsl(link.query):
+                if k.lower() in PAGE_PARAMS:
+                    note(("query", k), v)
+        lm = PATH_PAGE_RE.match(link.path)
+        if lm and lm["prefix"] == base_path + "page/":
+            note(("path", lm["prefix"], lm["suffix"]), lm["num"])
+
+    # a neighbouring page number must be linked, so ids like ?p=4812 are ignored
+    candidates = [
+        (key, seen) for key, seen in numbers.items()
+        if {current.get(key, 1) - 1, current.get(key, 1) + 1} & seen
+    ]
+    if not candidates:
+        return None
+    key, seen = max(candidates, key=lambda kv: len(kv[1]))
+
+    if key[0] == "query":
+        def url_for(n):
+            return _with_param(base, key[1], n)
+    else:
+        def url_for(n):
+            return urlunparse(base._replace(path=f"{key[1]}{n}{key[2]}"))
+
+    return url_for, current.get(key, 1), max(seen)
+
+
+# -------------------------------------------------------------------
+# Crawl the remaining pages
+# fetch(url) returns (soup, data) for a page, or None; data is the
+# extract_structured_html() dict. Returns the list of (url, data) for
+# pages after the first, in page order.
+# -------------------------------------------------------------------
+def _page_key(data):
+    return json.dumps(data.get("sections", []), sort_keys=True)
+
+
+def _fetch_all(fetch, urls, workers):
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(lambda u: (u, _safe_fetch(fetch, u)), urls))
+
+
+def _safe_fetch(fetch, url):
+    try:
+        return fetch(url)
+    except Exception:
+        return None
+
+
+def crawl_pages(url, soup, data, fetch, max_pages=None, concurrency=None):
+    max_pages = max_pages or SETTINGS["max_pages"]
+    concurrency = concurrency or SETTINGS["pagination_concurrency"]
+    pages = []
+    seen = {_page_key(data)}  # sites often clamp past-the-end pages to the last one
+
+    def keep(page_url, res):
+        if not res or not res[1].get("sections") or _page_key(res[1]) in seen:
+            return False
+        seen.add(_page_key(res[1]))
+        pages.append((page_url, res[1]))
+        return True
+
+    pattern = page_pattern(url, soup)
+    if pattern:
+        url_for, current, last_seen = pattern
+
+        # Known range: fetch it all at once; unknown end: fetch in windows
+        # until a page comes back empty, missing or repeated
+        n = current + 1
+        while len(pages) + 1 < max_pages:
+            budget = max_pages - 1 - len(pages)
+            known = max(0, last_seen - n + 1)
+            window = min(budget, known or concurrency)
+            batch = _fetch_all(fetch, [url_for(i) for i in range(n, n + window)], concurrency)
+            if not all(keep(page_url, res) for page_url, res in batch):
+                break
+            n += window
+        return pages
+
+    # No page numbers: follow rel=next / "Next" links one at a time
+    visited = {url}
+    next_url = find_next_link(soup, url)
+    while next_url and next_url not in visited and len(pages) + 1 < max_pages:
+        visited.add(next_url)
+        res = _safe_fetch(fetch, next_url)
+        if not keep(next_url, res):
+            break
+        next_url = find_next_link(res[0], next_url)
+    return pages
+
+
+def merge_pages(url, data, pages):
+    """First page's data with the sections of later pages appended."""
+    merged = dict(data)
+    merged["sections"] = list(data.get("sections", []))
+    for _, page_data in pages:
+        merged["sections"].extend(page_data.get("sections", []))
+    merged["pages"] = [url] + [page_url for page_url, _ in pages]
+    return merged
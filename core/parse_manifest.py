@@ -0,0 +1,143 @@
+# core/parse_manifest.py
+import hashlib
+import importlib.util
+import os
+
+from core.html_store import HTML_DIR, get_html_store
+from core.metadata_store import get_metadata_store
+
+PARSER_PACKAGE = "parsers"
+UNKNOWN_VERSION = ""  # parser_hash of outputs imported from disk; the parser version is not known
+
+_file_hashes = {}  # (path, digest function) -> (mtime_ns, size, sha256)
+
+
+# -------------------------------------------------------------------
+# Parse manifest
+# (page content hash, parser name, parser code hash) -> output path,
+# in the parse_manifest table of core.metadata_store. A page counts as
+# parsed when its content hash has any entry, and a bulk run only
+# needs the pages with no entry for the current code of its parser:
+# pages that are new, or whose parser file changed since. Re-scraping
+# an unchanged page keeps its hash, so it is not parsed again. Only
+# the parser's own file is hashed, not the modules it imports.
+#
+# Pages in the HTML store hash to their blob; legacy plain files hash
+# to the SHA-256 of the text read_html() gives for them (the blob they
+# would get if saved to the store), once per mtime/size, so a caller
+# that already read a page can hash that text instead (text_hash()).
+# -------------------------------------------------------------------
+def _bytes_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _text_digest(path):
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        return text_hash(f.read())
+
+
+def _cached_hash(path, digest_of):
+    stat = os.stat(path)
+    cached = _file_hashes.get((path, digest_of))
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = digest_of(path)
+    _file_hashes[(path, digest_of)] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def file_hash(path):
+    return _cached_hash(path, _bytes_digest)
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+
+def parser_code_hash(parser_name, package=PARSER_PACKAGE):
+    return file_hash(importlib.util.find_spec(f"{package}.{parser_name}").origin)
+
+
+def html_hash(path, text=None):
+    """
+    Content hash of a saved page, or None when there is no such page.
+    text: the page as read_html() returned it, to skip re-reading a
+    legacy file.
+    """
+    blob = get_html_store().blob_of(path)
+    if blob is None and text is not None:
+        return text_hash(text)
+    if blob is None and os.path.exists(path):
+        return _cached_hash(path, _text_digest)
+    return blob
+
+
+def html_hashes(folder=HTML_DIR):
+    """{file name: content hash} for the .html pages in folder."""
+    store = get_html_store()
+    hashes = store.blobs(folder)
+    for name in store.list_names(folder):
+        if name not in hashes:
+            hashes[name] = _cached_hash(os.path.join(folder, name), _text_digest)
+    return hashes
+
+
+def manifest_row(parser_name, parser_hash, html_path, output_path, content_hash=None):
+    return {
+        "html_hash": content_hash or html_hash(html_path),
+        "parser_name": parser_name,
+        "parser_hash": parser_hash,
+        "html_path": html_path,
+        "output_path": output_path,
+    }
+
+
+def record_parse(parser_name, parser_hash, html_path, output_path, content_hash=None):
+    get_metadata_store().record_parses([manifest_row(parser_name, parser_hash, html_path, output_path, content_hash)])
+
+
+def _import_outputs(folder, hashes):
+    # outputs written before the manifest: <page>_<parser>.json next to <page>.html
+    bases = {name[:-len(".html")]: name for name in hashes}
+    rows = []
+    for f in os.listdir(folder) if os.path.isdir(folder) else []:
+        if not f.endswith(".json"):
+            continue
+        stem = f[:-len(".json")]
+        cuts = [i for i, c in enumerate(stem) if c == "_"] + [len(stem)]
+        for i in cuts:
+            if stem[:i] in bases:
+                name = bases[stem[:i]]
+                rows.append(manifest_row(
+                    stem[i + 1:], UNKNOWN_VERSION, os.path.join(folder, name), os.path.join(folder, f), hashes[name]
+                ))
+                break
+    get_metadata_store().record_parses(rows)
+
+
+def _manifest_for(folder):
+    hashes = html_hashes(folder)
+    store = get_metadata_store()
+    store.migrate_once(f"parse_manifest:{os.path.normpath(folder)}", lambda: _import_outputs(folder, hashes))
+    return hashes, store
+
+
+def parse_status(folder=HTML_DIR):
+    """(parsed, unparsed) page names in folder, sorted like list_html()."""
+    hashes, store = _manifest_for(folder)
+    done = store.parsed_hashes()
+    parsed, unparsed = [], []
+    for name in sorted(hashes):
+        (parsed if hashes[name] in done else unparsed).append(name)
+    return parsed, unparsed
+
+
+def pending_html(parser_name, folder=HTML_DIR, names=None, package=PARSER_PACKAGE):
+    """Page names in folder (or of names) the current code of parser_name has not parsed."""
+    hashes, store = _manifest_for(folder)
+    done = store.parsed_hashes(parser_name, parser_code_hash(parser_name, package))
+    return [name for name in (sorted(hashes) if names is None else names) if hashes.get(name) not in done]
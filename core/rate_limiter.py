@@ -0,0 +1,179 @@
+# core/rate_limiter.py
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from config.settings import SETTINGS
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value):
+    """Retry-After is either delta-seconds or an HTTP date; returns seconds or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# -------------------------------------------------------------------
+# One token bucket per host
+# Tokens may go negative: a caller that takes a token from an empty
+# bucket gets back how long to wait instead of blocking under the
+# lock, so the same bucket serves threads (time.sleep) and coroutines
+# (asyncio.sleep). A robots.txt Crawl-delay is kept as a separate cap
+# on the configured rate, so a later robots.txt can lift it again.
+# -------------------------------------------------------------------
+class _Bucket:
+    def __init__(self, qps, burst):
+        self.rate = qps  # configured rate
+        self.cap = None  # robots.txt Crawl-delay limit, if any
+        self.qps = qps  # current rate, lowered after 429s
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    @property
+    def target_qps(self):
+        return self.rate if self.cap is None else min(self.rate, self.cap)
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.qps)
+        self.updated = now
+
+    def delay(self, now):
+        self._refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.qps
+        return max(wait, self.blocked_until - now)
+
+    def take(self, now):
+        wait = self.delay(now)
+        self.tokens -= 1
+        return wait
+
+
+class HostRateLimiter:
+    """Per-host QPS limits with AIMD back-off on 429 / Retry-After."""
+
+    def __init__(self, qps=None, burst=None):
+        self.default_qps = qps or SETTINGS["host_qps"]
+        self.burst = burst or SETTINGS["host_burst"]
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            qps = SETTINGS["host_qps_overrides"].get(host, self.default_qps)
+            bucket = self._buckets[host] = _Bucket(qps, self.burst)
+        return bucket
+
+    # ---------------------------------------------------------
+    # Configuration
+    # ---------------------------------------------------------
+    def configure(self, qps=None, burst=None):
+        """Change the default rate; hosts with their own rate keep it."""
+        with self._lock:
+            for bucket in self._buckets.values():
+                if qps and bucket.rate == self.default_qps:
+                    bucket.rate = qps
+                    bucket.qps = bucket.target_qps
+                if burst:
+                    bucket.burst = burst
+            self.default_qps = qps or self.default_qps
+            self.burst = burst or self.burst
+
+    def set_rate(self, host, qps):
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.rate = qps
+            bucket.qps = bucket.target_qps
+
+    def set_cap(self, host, qps):
+        """Cap host at qps on top of its own rate (robots.txt Crawl-delay); None lifts the cap."""
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.cap = qps
+            bucket.qps = min(bucket.qps, bucket.target_qps)
+
+    # ---------------------------------------------------------
+    # Acquire
+    # ---------------------------------------------------------
+    def delay(self, url):
+        """Seconds until a request to url's host may start, without taking a token."""
+        with self._lock:
+            return self._bucket(host_of(url)).delay(time.monotonic())
+
+    def reserve(self, url):
+        """Take a token for url's host and return how long to wait before using it."""
+        with self._lock:
+            return self._bucket(host_of(url)).take(time.monotonic())
+
+    def acquire(self, url):
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url):
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # ---------------------------------------------------------
+    # Feedback from responses
+    # ---------------------------------------------------------
+    def feedback(self, url, status, retry_after=None):
+        """Halve the host rate on 429/503 (honouring Retry-After), creep back up on success."""
+        with self._lock:
+            bucket = self._bucket(host_of(url))
+            now = time.monotonic()
+
+            if status in (429, 503):
+                bucket.qps = max(SETTINGS["host_qps_min"], bucket.qps / 2)
+                bucket.tokens = min(bucket.tokens, 0)
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            elif bucket.qps < bucket.target_qps:
+                bucket.qps = min(bucket.target_qps, bucket.qps + bucket.target_qps * 0.1)
+
+    def snapshot(self):
+        """Current per-host rates, for batch summaries."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "host": host,
+                    "qps": round(b.qps, 3),
+                    "target_qps": b.target_qps,
+                    "blocked_for_s": round(max(0.0, b.blocked_until - now), 1),
+                }
+                for host, b in self._buckets.items()
+            ]
+
+
+def get_limiter():
+    """Process-wide limiter shared by the thread and asyncio fetch paths."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = HostRateLimiter()
+    return _limiter
@@ -0,0 +1,121 @@
+# core/readiness.py
+import asyncio
+import time
+
+from config.settings import SETTINGS
+from core.rate_limiter import host_of
+
+try:
+    from selenium.common.exceptions import WebDriverException
+except ImportError:  # Selenium not installed: wait_for_ready() is never called
+    WebDriverException = Exception
+
+POLL_INTERVAL = 0.1  # seconds between readiness probes
+
+# Installs a MutationObserver once per document and reports what the
+# Python side needs to decide whether the page has settled.
+PROBE_JS = """(selector) => {
+    if (!window.__scraperObserver) {
+        window.__scraperLastMutation = performance.now();
+        window.__scraperObserver = new MutationObserver(() => {
+            window.__scraperLastMutation = performance.now();
+        });
+        window.__scraperObserver.observe(document, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+    }
+    let lastResponse = 0;
+    for (const entry of performance.getEntriesByType("resource")) {
+        lastResponse = Math.max(lastResponse, entry.responseEnd);
+    }
+    return {
+        ready_state: document.readyState,
+        quiet_ms: performance.now() - window.__scraperLastMutation,
+        network_idle_ms: performance.now() - lastResponse,
+        selector: selector ? document.querySelector(selector) !== null : true
+    };
+}"""
+
+
+def ready_policy(url, **overrides):
+    """
+    Readiness policy for url: SETTINGS["render_ready"], then the first
+    render_ready_overrides entry matching the host (or a parent domain),
+    then keyword overrides from the caller.
+    """
+    policy = dict(SETTINGS["render_ready"])
+    host = host_of(url)
+    for domain, extra in SETTINGS["render_ready_overrides"].items():
+        if host == domain or host.endswith("." + domain):
+            policy.update(extra)
+            break
+    policy.update({k: v for k, v in overrides.items() if v is not None})
+    return policy
+
+
+# -------------------------------------------------------------------
+# Readiness tracker
+# A page is ready once every configured condition holds at the same
+# time: document loaded, selector present, no DOM mutation for
+# quiet_ms, and no network response finished in the last
+# network_idle_ms. The wait ends at max_wait_s regardless, so slow
+# pages are still captured and fast pages are not held for a fixed
+# sleep.
+# -------------------------------------------------------------------
+class _ReadyTracker:
+    def __init__(self, policy):
+        self.policy = policy
+        self.started = time.monotonic()
+        self.deadline = self.started + policy["max_wait_s"]
+
+    def check(self, state):
+        """Return "ready", "deadline" or None (keep waiting) for one probe result."""
+        now = time.monotonic()
+        if state is None:
+            # probe failed, e.g. the document was replaced by a client-side redirect
+            return "deadline" if now >= self.deadline else None
+        ready = (
+            state["ready_state"] == "complete"
+            and state["selector"]
+            and state["quiet_ms"] >= (self.policy.get("quiet_ms") or 0)
+            and state["network_idle_ms"] >= (self.policy.get("network_idle_ms") or 0)
+        )
+        if ready:
+            return "ready"
+        if now >= self.deadline:
+            return "deadline"
+        return None
+
+    def result(self, reason):
+        return {"waited_s": round(time.monotonic() - self.started, 3), "ready": reason}
+
+
+def wait_for_ready(driver, policy):
+    """Block until a Selenium driver's page is ready; returns {"waited_s", "ready"}."""
+    tracker = _ReadyTracker(policy)
+    script = f"return ({PROBE_JS})(arguments[0]);"
+    while True:
+        try:
+            state = driver.execute_script(script, policy.get("selector"))
+        except WebDriverException:
+            state = None  # navigation or a stale context mid-wait: probe again
+        reason = tracker.check(state)
+        if reason:
+            return tracker.result(reason)
+        time.sleep(POLL_INTERVAL)
+
+
+async def wait_for_ready_async(page, policy):
+    """Same as wait_for_ready() for a Playwright page."""
+    tracker = _ReadyTracker(policy)
+    while True:
+        try:
+            state = await page.evaluate(PROBE_JS, policy.get("selector"))
+        except Exception:
+            if page.is_closed():
+                raise
+            state = None
+        reason = tracker.check(state)
+        if reason:
+            return tracker.result(reason)
+        await asyncio.sleep(POLL_INTERVAL)
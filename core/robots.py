@@ -0,0 +1,183 @@
+# core/robots.py
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from config.settings import SETTINGS
+from core.http_pool import get_session
+from core.rate_limiter import get_limiter
+
+MAX_ROBOTS_BYTES = 500 * 1024  # RFC 9309: parse at least the first 500 KiB
+
+_robots = None
+_robots_lock = threading.Lock()
+
+
+def _site_of(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def _path_of(url):
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+# -------------------------------------------------------------------
+# Parsed robots.txt for one site
+# Rules are sorted longest pattern first (Allow before Disallow on a
+# tie), so the first matching rule is the RFC 9309 answer. Plain
+# patterns are prefix checks; only rules with * or $ use a regex.
+# -------------------------------------------------------------------
+class RobotsRules:
+    def __init__(self, rules=(), crawl_delay=None):
+        self.rules = sorted(rules, key=lambda r: (-len(r[0]), not r[1]))
+        self.matchers = [(self._compile(pattern), allow) for pattern, allow in self.rules]
+        self.crawl_delay = crawl_delay
+
+    @staticmethod
+    def _compile(pattern):
+        if "*" not in pattern and not pattern.endswith("$"):
+            return pattern
+        anchored = pattern.endswith("$")
+        body = ".*".join(re.escape(part) for part in pattern.rstrip("$").split("*"))
+        return re.compile(body + ("$" if anchored else ""))
+
+    @classmethod
+    def allow_all(cls):
+        return cls()
+
+    @classmethod
+    def disallow_all(cls):
+        return cls([("/", False)])
+
+    @classmethod
+    def parse(cls, text, agent):
+        """Rules of the groups naming agent's product token, else of the * groups."""
+        agent = agent.split("/")[0].lower()
+        groups = []  # (agents, rules, crawl_delay)
+        in_agents = False
+        for raw in text.splitlines():
+            line = raw.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            key, value = (part.strip() for part in line.split(":", 1))
+            key = key.lower()
+            if key == "user-agent":
+                if not in_agents:
+                    groups.append(([], [], [None]))
+                    in_agents = True
+                groups[-1][0].append(value.lower())
+                continue
+            in_agents = False
+            if not groups:
+                continue
+            if key in ("allow", "disallow") and value:
+                groups[-1][1].append((value, key == "allow"))
+            elif key == "crawl-delay":
+                try:
+                    groups[-1][2][0] = float(value)
+                except ValueError:
+                    pass
+
+        mine = [g for g in groups if agent in g[0]]
+        chosen = mine or [g for g in groups if "*" in g[0]]
+        rules = [rule for g in chosen for rule in g[1]]
+        delays = [g[2][0] for g in chosen if g[2][0] is not None]
+        return cls(rules, max(delays) if delays else None)
+
+    def allowed(self, path):
+        if path == "/robots.txt":
+            return True
+        for matcher, allow in self.matchers:
+            if isinstance(matcher, str):
+                if path.startswith(matcher):
+                    return allow
+            elif matcher.match(path):
+                return allow
+        return True
+
+
+# -------------------------------------------------------------------
+# Per-site cache
+# robots.txt is fetched at most once per site per robots_ttl. A 4xx
+# means no restrictions and is cached for the full TTL; a 5xx or a
+# network error means "disallow everything" (RFC 9309) and is cached
+# for the shorter robots_error_ttl. Crawl-delay caps the site's rate
+# in the shared per-host limiter; every refresh sets the cap again, or
+# lifts it when the new robots.txt has no Crawl-delay.
+# -------------------------------------------------------------------
+class RobotsCache:
+    def __init__(self, agent=None, ttl=None, error_ttl=None):
+        self.agent = agent or SETTINGS["user_agent"]
+        self.ttl = ttl or SETTINGS["robots_ttl"]
+        self.error_ttl = error_ttl or SETTINGS["robots_error_ttl"]
+        self._entries = {}  # site -> (rules, expires_at)
+        self._site_locks = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def _fetch(self, site):
+        with self._lock:
+            self.counters["fetches"] += 1
+        try:
+            resp = get_session().get(f"{site}/robots.txt", timeout=10, headers={"User-Agent": self.agent})
+        except Exception:
+            return RobotsRules.disallow_all(), self.error_ttl
+        if resp.status_code >= 500:
+            return RobotsRules.disallow_all(), self.error_ttl
+        if resp.status_code >= 400:
+            return RobotsRules.allow_all(), self.ttl
+        return RobotsRules.parse(resp.text[:MAX_ROBOTS_BYTES], self.agent), self.ttl
+
+    def rules_for(self, url):
+        site = _site_of(url)
+        entry = self._entries.get(site)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        with self._lock:
+            site_lock = self._site_locks.setdefault(site, threading.Lock())
+        with site_lock:  # one fetch per site even when many workers ask at once
+            entry = self._entries.get(site)
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+            rules, ttl = self._fetch(site)
+            self._entries[site] = (rules, time.monotonic() + ttl)
+            get_limiter().set_cap(urlsplit(url).netloc.lower(), 1 / rules.crawl_delay if rules.crawl_delay else None)
+        return rules
+
+    def allowed(self, url):
+        with self._lock:
+            self.counters["checks"] += 1
+        ok = self.rules_for(url).allowed(_path_of(url))
+        if not ok:
+            with self._lock:
+                self.counters["blocked"] += 1
+        return ok
+
+    def prefetch(self, urls, workers=16):
+        """Load robots.txt for every distinct site in urls in parallel."""
+        sites = {}
+        for url in urls:
+            sites.setdefault(_site_of(url), url)
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(self.rules_for, sites.values()))
+
+    def reset_stats(self):
+        self.counters = {"checks": 0, "fetches": 0, "blocked": 0}
+
+    def stats(self):
+        return dict(self.counters, sites=len(self._entries))
+
+
+def get_robots():
+    """Process-wide robots.txt cache shared by every scrape worker."""
+    global _robots
+    if _robots is None:
+        with _robots_lock:
+            if _robots is None:
+                _robots = RobotsCache()
+    return _robots
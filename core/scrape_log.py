@@ -0,0 +1,173 @@
+# core/scrape_log.py
+import atexit
+import json
+import os
+import queue
+import threading
+
+from config.settings import SETTINGS
+
+LOG_FILE = "scrape_log.jsonl"
+LEGACY_LOG_FILE = "scrape_log.json"  # JSON array written before the JSON Lines log
+WRITE_BATCH = 500  # entries written per file append at most
+
+_log = None
+_log_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Append-only scrape log
+# Workers only put entries on a queue; one writer thread appends them
+# to a JSON Lines file, so a batch costs one short write per entry
+# instead of rewriting the whole log each time. Every
+# `scrape_log_compact_every` entries the file is compacted: entries
+# from the old scrape_log.json array are folded in (once; the array is
+# left in place and a <log>.imported marker records the import), torn
+# lines from a crash are dropped, and the oldest entries past
+# `scrape_log_max_entries` (0 = keep all) are trimmed. Each written
+# batch is also mirrored into core.metadata_store with one insert.
+# -------------------------------------------------------------------
+class ScrapeLog:
+    def __init__(self, path=LOG_FILE, legacy_path=LEGACY_LOG_FILE, compact_every=None, max_entries=None, store=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.imported_marker = f"{path}.imported"  # written once legacy_path is folded into path
+        self.compact_every = compact_every or SETTINGS["scrape_log_compact_every"]
+        self.max_entries = SETTINGS["scrape_log_max_entries"] if max_entries is None else max_entries
+        self.store = store  # MetadataStore; the process-wide one when None
+        self._queue = queue.Queue()
+        self._file_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._since_compact = 0
+        self._tail_checked = False
+
+    # ---------------------------------------------------------
+    # Writing
+    # ---------------------------------------------------------
+    def append(self, entry):
+        """Queue entry for the writer thread; returns immediately."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="scrape-log", daemon=True)
+                    self._thread.start()
+        self._queue.put(entry)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                lines = "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in batch)
+                store = self._mirror()
+                with self._file_lock:
+                    if not self._tail_checked:
+                        lines = self._tail_fix() + lines
+                        self._tail_checked = True
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(lines)
+                self._since_compact += len(batch)
+                if store is not None:
+                    store.add_scrapes(batch)
+                if self._since_compact >= self.compact_every:
+                    self.compact()
+            except Exception:
+                pass  # keep the writer alive; flush() must never hang on a failed write
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _mirror(self):
+        # opened before our first write, so its one-off import of this file
+        # does not pick up the batch being written as well
+        if self.store is None:
+            try:
+                from core.metadata_store import get_metadata_store
+
+                self.store = get_metadata_store()
+            except Exception:
+                return None  # the JSON Lines file stays the log of record
+        return self.store
+
+    def _tail_fix(self):
+        # a crash mid-write leaves a line without its newline; start ours on a fresh line
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return ""
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return "" if f.read(1) == b"\n" else "\n"
+
+    def flush(self):
+        """Block until every queued entry is on disk."""
+        self._queue.join()
+
+    def compact(self):
+        with self._file_lock:
+            legacy = self._read_legacy()
+            entries = (legacy or []) + self._read_lines()
+            if self.max_entries:
+                entries = entries[-self.max_entries:]
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in entries)
+            os.replace(tmp, self.path)
+            if legacy is not None:
+                # its entries now live in the JSON Lines file; the (tracked) array stays put
+                with open(self.imported_marker, "w", encoding="utf-8") as f:
+                    json.dump({"imported": self.legacy_path, "entries": len(legacy)}, f)
+            self._since_compact = 0
+
+    # ---------------------------------------------------------
+    # Reading
+    # ---------------------------------------------------------
+    def _read_legacy(self):
+        # None when there is no readable scrape_log.json, or it was already folded in;
+        # an unreadable one is left alone
+        if os.path.exists(self.imported_marker) or not os.path.exists(self.legacy_path):
+            return None
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                return list(json.load(f))
+        except Exception:
+            return None
+
+    def _read_lines(self):
+        entries = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn line from an interrupted write
+        return entries
+
+    def read_saved(self):
+        """Entries already on disk, oldest first; does not wait for the queue."""
+        with self._file_lock:
+            return (self._read_legacy() or []) + self._read_lines()
+
+    def read(self):
+        """Every logged entry, oldest first (includes the old scrape_log.json)."""
+        self.flush()
+        return self.read_saved()
+
+
+def get_scrape_log():
+    """Process-wide scrape log shared by every page and worker thread."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = ScrapeLog()
+                atexit.register(_log.flush)
+    return _log
+
+
+def read_scrape_log():
+    return get_scrape_log().read()
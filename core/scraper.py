@@ -49,12 +49,19 @@
 #     soup = BeautifulSoup(resp.text, "html.parser")
 #     return {"data": {"text": clean_html_text(soup)}}
 
-import requests
-from bs4 import BeautifulSoup
+from functools import partial
 from urllib.parse import urljoin
 
+from config.settings import SETTINGS
 from core.validator import validate_url
-from core.dynamic_scraper import load_dynamic_page   # NEW
+from core.browser_pool import get_browser_pool
+from core.cascade import run_cascade
+from core.paginator import crawl_pages, merge_pages
+from core.dynamic_scraper import render_dynamic_page   # NEW
+from core.http_cache import get_cache
+from core.http_pool import get_session
+from core.readiness import ready_policy
+from core.soup import make_soup
 from utils.html_utils import clean_html_text
 from utils.json_utils import normalize_json
 
@@ -73,6 +80,12 @@ def is_empty_extraction(data: dict) -> bool:
     return False
 
 
+def html_has_content(html) -> bool:
+    """True when extract_structured_html finds an h1 or sections in html."""
+    soup = make_soup(html)
+    return not is_empty_extraction(extract_structured_html(None, soup))
+
+
 # -------------------------------------------------------------------
 # HTML extractor
 # (same logic as before, does not require Selenium changes)
@@ -89,20 +102,99 @@ def extract_structured_html(base_url, soup):
     data["h1"] = h1.get_text(strip=True) if h1 else None
 
     # Sections with H2
-    sections = []
-    for h2 in soup.find_all("h2"):
-        name = h2.get_text(strip=True)
-        sections.append({
-            "header": name,
-            "content": extract_section_content(h2)
-        })
-
-    data["sections"] = sections
+    data["sections"] = split_sections(soup)
     return data
 
 
+# -------------------------------------------------------------------
+# Section splitter: one walk over the document in order
+# Every tag belongs to the section of the last <h2> before it, exactly
+# the tags extract_section_content(h2) visits. A div becomes a card
+# when it contains an h3; its first h3 / p / a descendants are noted
+# while the walk passes them, with each open div filled at most once.
+# -------------------------------------------------------------------
+_CARD_PARTS = ("h3", "p", "a")
+
+
+def _walk_tags(root):
+    """Yield (tag, entering) for every tag below root, in document order."""
+    stack = [(None, iter(root.contents))]
+    while stack:
+        parent, children = stack[-1]
+        for child in children:
+            if child.name is not None:  # skip strings, comments, ...
+                yield child, True
+                stack.append((child, iter(child.contents)))
+                break
+        else:
+            stack.pop()
+            if parent is not None:
+                yield parent, False
+
+
+def split_sections(soup):
+    sections = []
+    content = None  # content list of the current section
+    open_divs = []  # [div, section content, slot, {part name: first tag}]
+    cards = []
+
+    for tag, entering in _walk_tags(soup):
+        if not entering:
+            if tag.name == "div":
+                open_divs.pop()
+            continue
+
+        if tag.name == "h2":
+            content = []
+            sections.append({"header": tag.get_text(strip=True), "content": content})
+            continue
+
+        if tag.name in _CARD_PARTS:
+            # innermost divs first; once a div has this part, its ancestors have one too
+            for div in reversed(open_divs):
+                if tag.name in div[3]:
+                    break
+                div[3][tag.name] = tag
+
+        if content is None:
+            # before the first h2: only divs matter, as holders of later tags
+            if tag.name == "div":
+                open_divs.append([tag, None, None, {}])
+            continue
+
+        if tag.name == "p":
+            content.append({
+                "type": "paragraph",
+                "text": tag.get_text(strip=True)
+            })
+
+        if tag.name == "div":
+            # keep the card's place; filled in once its subtree has been seen
+            content.append(None)
+            div = [tag, content, len(content) - 1, {}]
+            open_divs.append(div)
+            cards.append(div)
+
+    for _, section_content, slot, parts in cards:
+        if "h3" not in parts:
+            continue
+        a = parts.get("a")
+        desc_tag = parts.get("p")
+        section_content[slot] = {
+            "type": "card",
+            "title": parts["h3"].get_text(strip=True),
+            "description": desc_tag.get_text(strip=True) if desc_tag else "",
+            "link": a.get("href") if a and a.has_attr("href") else None
+        }
+
+    for section in sections:
+        section["content"] = [item for item in section["content"] if item is not None]
+    return sections
+
+
 # -------------------------------------------------------------------
 # Subsection extractor with safe link handling
+# (one section at a time; extract_structured_html uses split_sections)
 # -------------------------------------------------------------------
 def extract_section_content(h2_tag):
     section = []
@@ -138,23 +230,117 @@ def extract_section_content(h2_tag):
     return section
 
 
+# -------------------------------------------------------------------
+# Page fetchers for racing and pagination: each returns the parsed
+# page plus its extraction, or None
+# -------------------------------------------------------------------
+def _static_layer(url):
+    cache = get_cache()
+    resp, cached = cache.get(get_session(), url, timeout=10, headers={"User-Agent": SETTINGS["user_agent"]})
+    if cached:
+        html = cached["html"]
+    elif resp.status_code == 200 and "application/json" not in resp.headers.get("Content-Type", ""):
+        cache.remember_response(url, resp)
+        html = resp.text
+    else:
+        return None
+    soup = make_soup(html)
+    return {"soup": soup, "data": extract_structured_html(url, soup)}
+
+
+def _screenshot_path(url):
+    return f"data/raw/{url.split('/')[-1]}_screenshot.png"
+
+
+def _rendered_page(url, page):
+    soup = make_soup(page["html"])
+    return {
+        "soup": soup,
+        "data": extract_structured_html(url, soup),
+        "render": {"waited_s": page["waited_s"], "ready": page["ready"]},
+    }
+
+
+def _rendered_layer(url, screenshot=True):
+    page = render_dynamic_page(url, screenshot_path=_screenshot_path(url) if screenshot else None)
+    return _rendered_page(url, page)
+
+
+def _pooled_layer(url, screenshot=True):
+    page = get_browser_pool().render(
+        url, wait_until="load", screenshot_path=_screenshot_path(url) if screenshot else None, ready=ready_policy(url)
+    )
+    return _rendered_page(url, page)
+
+
+async def _pooled_layer_async(url):
+    # coroutine variant for racing: a losing render is cancelled in the pool
+    page = await get_browser_pool().render_async(
+        url, wait_until="load", screenshot_path=_screenshot_path(url), ready=ready_policy(url)
+    )
+    return _rendered_page(url, page)
+
+
+def _static_content_layer(url):
+    # sequential stand-in for the static racer: an empty extraction moves on to the render
+    page = _static_layer(url)
+    return page if page and not is_empty_extraction(page["data"]) else None
+
+
+def _with_later_pages(url, soup, extracted, load):
+    """Follow the listing's pagination and merge every page's sections."""
+    def fetch(page_url):
+        res = load(page_url)
+        return (res["soup"], res["data"]) if res else None
+
+    pages = crawl_pages(url, soup, extracted, fetch)
+    return merge_pages(url, extracted, pages) if pages else extracted
+
+
 # -------------------------------------------------------------------
 # MAIN SCRAPER — Supports both static + dynamic scraping
 # -------------------------------------------------------------------
-def scrape_url(url: str, paginate=True, use_dynamic=False):
+def scrape_url(url: str, paginate=True, use_dynamic=False, race=False):
     valid = validate_url(url)
     if not valid["ok"]:
         return {"error": valid["error"]}
 
+    # -----------------------------------------------------
+    # OPTIONAL: race static against a pooled Playwright
+    # render; the first non-empty extraction wins and the
+    # losing render is cancelled. Past the per-host race
+    # budget the two run one after the other instead.
+    # -----------------------------------------------------
+    if race and not use_dynamic:
+        layer, page = run_cascade(
+            url,
+            [("requests", _static_content_layer), ("playwright", _pooled_layer)],
+            racers=[("requests", _static_layer), ("playwright", _pooled_layer_async)],
+            accept=lambda p: not is_empty_extraction(p["data"]),
+        )
+        if not page:
+            return {"error": "Neither the static fetch nor the rendered page returned content"}
+        soup = page.pop("soup")
+        if paginate:
+            load = partial(_pooled_layer, screenshot=False) if layer == "playwright" else _static_layer
+            page["data"] = _with_later_pages(url, soup, page["data"], load)
+        return page
+
     # -----------------------------------------------------
     # FIRST TRY: STATIC HTML (Requests)
     # -----------------------------------------------------
+    cache = get_cache()
     try:
-        resp = requests.get(url, timeout=10, headers={"User-Agent": "ScraperApp/1.0"})
+        resp, cached = cache.get(get_session(), url, timeout=10, headers={"User-Agent": SETTINGS["user_agent"]})
     except Exception as e:
         return {"error": f"Request failed: {e}"}
 
     content_type = resp.headers.get("Content-Type", "")
+    if cached:
+        # 304 Not Modified: parse the HTML saved on the previous scrape
+        html = cached["html"]
+    else:
+        html = resp.text
 
     # -----------------------------------------------------
     # JSON API case (simple)
@@ -169,18 +355,21 @@ def scrape_url(url: str, paginate=True, use_dynamic=False):
     # -----------------------------------------------------
     # STATIC HTML extraction with BeautifulSoup
     # -----------------------------------------------------
-    soup = BeautifulSoup(resp.text, "html.parser")
+    if resp.status_code == 200:
+        cache.remember_response(url, resp)
+
+    soup = make_soup(html)
     extracted = extract_structured_html(url, soup)
 
     # -----------------------------------------------------
     # AUTO-DETECT dynamic pages OR force-use-dynamic
     # -----------------------------------------------------
-    should_use_dynamic = use_dynamic or looks_dynamic_page(resp.text, soup)
+    should_use_dynamic = use_dynamic or looks_dynamic_page(html, soup)
 
     if should_use_dynamic:
         try:
-            screenshot_path = f"data/raw/{url.split('/')[-1]}_screenshot.png"
-            dynamic_soup = load_dynamic_page(url, screenshot_path=screenshot_path)
+            page = render_dynamic_page(url, screenshot_path=_screenshot_path(url))
+            dynamic_soup = make_soup(page["html"])
 
             # Re-run structured extractor on rendered HTML
             extracted = extract_structured_html(url, dynamic_soup)
@@ -188,6 +377,16 @@ def scrape_url(url: str, paginate=True, use_dynamic=False):
         except Exception as e:
             return {"error": f"Dynamic scraping failed: {e}"}
 
+        if paginate:
+            extracted = _with_later_pages(url, dynamic_soup, extracted, partial(_rendered_layer, screenshot=False))
+        return {"data": extracted, "render": {"waited_s": page["waited_s"], "ready": page["ready"]}}
+
+    # -----------------------------------------------------
+    # PAGINATION: merge sections from the listing's later pages
+    # -----------------------------------------------------
+    if paginate:
+        extracted = _with_later_pages(url, soup, extracted, _static_layer)
+
     return {"data": extracted}
 
 # def scrape_url(url: str, paginate=True, use_dynamic=False):
@@ -0,0 +1,42 @@
+# core/soup.py
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from config.settings import SETTINGS
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: link extraction falls back to BeautifulSoup
+    LexborHTMLParser = None
+
+FALLBACK_PARSER = "html.parser"  # ships with Python, always available
+
+
+# -------------------------------------------------------------------
+# Soup factory
+# Every scraper and parser builds its soup here, so the backend is one
+# setting (`html_parser`): "lxml" and "html5lib" when installed, else
+# Python's html.parser. Backends repair broken markup differently
+# (unclosed <li>/<p> in navigation menus, mostly), so switching one
+# can change what the tree-walking parsers extract on such pages;
+# tests/test_soup.py compares them on the saved pages.
+# -------------------------------------------------------------------
+def soup_backend(parser=None):
+    """The backend make_soup() will use for parser (default: the setting)."""
+    parser = parser or SETTINGS["html_parser"]
+    return parser if builder_registry.lookup(parser) is not None else FALLBACK_PARSER
+
+
+def make_soup(html, parser=None):
+    return BeautifulSoup(html, soup_backend(parser))
+
+
+def html_links(html):
+    """
+    Every href in html, as written; what extract_links(make_soup(html))
+    returns. Uses selectolax when installed: no soup is built, which is
+    much quicker for crawls that only need the links.
+    """
+    if LexborHTMLParser is None:
+        return [a["href"] for a in make_soup(html).find_all("a", href=True)]
+    return [a.attributes.get("href") or "" for a in LexborHTMLParser(html).css("a[href]")]
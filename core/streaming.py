@@ -0,0 +1,82 @@
+# core/streaming.py
+import codecs
+
+from config.constants import ALLOWED_CONTENT_TYPES
+from config.settings import SETTINGS
+from core.html_store import get_html_store
+
+
+class DownloadRejected(Exception):
+    """Raised when a response is aborted before its body was saved."""
+
+    def __init__(self, reason, detail=""):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason  # "content_type" or "too_large"
+
+
+def _media_type(content_type):
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def _charset(content_type):
+    for param in (content_type or "").split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            try:
+                return codecs.lookup(value.strip().strip('"')).name
+            except LookupError:
+                return None
+    return None
+
+
+def content_type_allowed(content_type, allowed=None):
+    """A missing Content-Type is let through; the body decides then."""
+    media = _media_type(content_type)
+    return not media or media in (allowed or ALLOWED_CONTENT_TYPES)
+
+
+# -------------------------------------------------------------------
+# Streaming save
+# The body goes chunk by chunk into the HTML store (core.html_store),
+# which hashes and compresses it as it arrives, so a page is never held
+# in memory whole. Bodies are stored as UTF-8 (re-encoded on the fly
+# from the declared charset), so the hash matches sha256 of the decoded
+# text. name_for(sha256_hex) picks the scraped_html/ name once the body
+# is complete; an unchanged page reuses the blob already stored.
+# -------------------------------------------------------------------
+def stream_to_store(resp, name_for, url=None, max_bytes=None, chunk_size=None, allowed=None, store=None):
+    """
+    Save a requests response opened with stream=True.
+    Returns {"html_path", "html_hash", "bytes"}; raises DownloadRejected
+    for a disallowed Content-Type or a body over max_bytes. The response
+    is always closed.
+    """
+    max_bytes = max_bytes or SETTINGS["max_body_bytes"]
+    chunk_size = chunk_size or SETTINGS["stream_chunk_bytes"]
+    store = store or get_html_store()
+    content_type = resp.headers.get("Content-Type")
+    try:
+        if not content_type_allowed(content_type, allowed):
+            raise DownloadRejected("content_type", _media_type(content_type))
+        declared = resp.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise DownloadRejected("too_large", f"{declared} bytes")
+
+        decoder = codecs.getincrementaldecoder(_charset(content_type) or "utf-8")(errors="replace")
+        received = 0
+        writer = store.writer()
+        try:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                received += len(chunk)
+                if received > max_bytes:
+                    raise DownloadRejected("too_large", f"over {max_bytes} bytes")
+                writer.write(decoder.decode(chunk).encode("utf-8"))
+            writer.write(decoder.decode(b"", final=True).encode("utf-8"))
+            html_hash = writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+        path = store.link(name_for(html_hash), html_hash, url)
+        return {"html_path": path, "html_hash": html_hash, "bytes": received}
+    finally:
+        resp.close()
@@ -6,9 +6,10 @@ import pandas as pd
 from datetime import datetime
 import re
 
+from core.metadata_store import get_metadata_store
+from core.scrape_log import read_scrape_log
+
 HTML_DIR = "scraped_html"
-SCRAPE_LOG_FILE = "scrape_log.json"
-PARSER_LOG_FILE = "parser_run_log.json"
 
 st.set_page_config(page_title="JSON → Table", layout="wide")
 st.header("📄 Multi-JSON → Multi-Column Table Viewer / Exporter")
@@ -37,14 +38,8 @@ if len(selected_jsons) == 0:
 # ===============================================================
 # Load logs for metadata enrichment
 # ===============================================================
-scrape_logs = []
-parser_logs = []
-
-if os.path.exists(SCRAPE_LOG_FILE):
-    scrape_logs = json.load(open(SCRAPE_LOG_FILE, "r"))
-
-if os.path.exists(PARSER_LOG_FILE):
-    parser_logs = json.load(open(PARSER_LOG_FILE, "r"))
+scrape_logs = read_scrape_log()
+parser_logs = get_metadata_store().parser_runs()
 
 scrape_df = pd.DataFrame(scrape_logs) if len(scrape_logs) else pd.DataFrame()
 parser_df = pd.DataFrame(parser_logs) if len(parser_logs) else pd.DataFrame()
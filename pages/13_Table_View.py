@@ -6,8 +6,9 @@ import pandas as pd
 from datetime import datetime
 import re
 
+from core.scrape_log import read_scrape_log
+
 HTML_DIR = "scraped_html"
-SCRAPE_LOG_FILE = "scrape_log.json"
 
 st.set_page_config(page_title="Column Selector", layout="wide")
 st.title("🧩 Select Columns to Display (Wide JSON Table)")
@@ -36,9 +37,7 @@ if len(selected_jsons) == 0:
 # -----------------------------------------------------------
 # Load scrape logs (for scrape_url)
 # -----------------------------------------------------------
-scrape_logs = []
-if os.path.exists(SCRAPE_LOG_FILE):
-    scrape_logs = json.load(open(SCRAPE_LOG_FILE, "r"))
+scrape_logs = read_scrape_log()
 
 scrape_df = pd.DataFrame(scrape_logs) if scrape_logs else pd.DataFrame()
 
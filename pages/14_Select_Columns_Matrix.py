@@ -6,8 +6,9 @@ import pandas as pd
 from datetime import datetime
 import re
 
+from core.scrape_log import read_scrape_log
+
 HTML_DIR = "scraped_html"
-SCRAPE_LOG_FILE = "scrape_log.json"
 
 st.set_page_config(page_title="Matrix Column Selector", layout="wide")
 st.title("🧩 Tick-Box Matrix (Content Only) → Wide Table")
@@ -38,8 +39,8 @@ N = len(data)
 scrape_url = None
 op_id = None
 
-if os.path.exists(SCRAPE_LOG_FILE):
-    logs = json.load(open(SCRAPE_LOG_FILE, "r"))
+logs = read_scrape_log()
+if logs:
     logs_df = pd.DataFrame(logs)
 
     # Extract numeric ID from filename
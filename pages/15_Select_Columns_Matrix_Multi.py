@@ -6,8 +6,9 @@ import re
 import pandas as pd
 from datetime import datetime
 
+from core.scrape_log import read_scrape_log
+
 HTML_DIR = "scraped_html"
-SCRAPE_LOG_FILE = "scrape_log.json"
 
 st.set_page_config(page_title="Multi-JSON Matrix Selector", layout="wide")
 st.title("🧩 Multi-JSON Tick-Box Matrix → Wide Table (Content Only)")
@@ -43,8 +44,8 @@ final_rows = []
 # -----------------------------------------------------------
 scrape_url_map = {}
 
-if os.path.exists(SCRAPE_LOG_FILE):
-    logs = json.load(open(SCRAPE_LOG_FILE, "r"))
+logs = read_scrape_log()
+if logs:
     logs_df = pd.DataFrame(logs)
 
     for js in json_files:
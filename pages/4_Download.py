@@ -10,17 +10,32 @@ import urllib.parse
 import traceback
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import requests
 import pandas as pd
 import hashlib
 
+from config.settings import SETTINGS
+from core.async_fetcher import run_fetch_many
+from core.browser_pool import get_browser_pool
+from core.cascade import get_layer_stats, run_cascade
+from core.circuit_breaker import get_breakers
+from core.dynamic_scraper import render_dynamic_page
+from core.frontier import Frontier
+from core.html_store import get_html_store, read_html
+from core.http_cache import get_cache
+from core.http_pool import get_session, pool_stats
+from core.metadata_store import get_metadata_store
+from core.rate_limiter import get_limiter
+from core.scraper import html_has_content
+from core.readiness import ready_policy
+from core.robots import get_robots
+from core.scrape_log import get_scrape_log, read_scrape_log
+from core.soup import html_links
+from core.streaming import stream_to_store
+
 # -------------------------
 # Configuration / constants
 # -------------------------
 HTML_DIR = "scraped_html"
-LOG_FILE = "scrape_log.json"
 os.makedirs(HTML_DIR, exist_ok=True)
 
 # -------------------------
@@ -33,63 +48,52 @@ def extract_id(url):
 def compute_hash(content):
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-def save_html_file(html_content, method, url):
+def html_filename(method, url, content_hash):
     op_id = extract_id(url)
     timestamp = datetime.utcnow().isoformat().replace(":", "-").split(".")[0]
-    filename = f"{timestamp}_{method}_{op_id}.html"
-    filepath = os.path.join(HTML_DIR, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    return filepath
-
-def load_logs():
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return []
-    return []
+    short_hash = content_hash[:8]  # keeps same-second saves apart
+    return f"{timestamp}_{method}_{op_id}_{short_hash}.html"
 
-def append_log(entry):
-    logs = load_logs()
-    logs.append(entry)
-    with open(LOG_FILE, "w", encoding="utf-8") as f:
-        json.dump(logs, f, indent=2, ensure_ascii=False)
+def save_html_file(html_content, method, url):
+    # content-addressed: an unchanged page only adds a name to the store index
+    filepath = os.path.join(HTML_DIR, html_filename(method, url, compute_hash(html_content)))
+    return get_html_store().save(html_content, filepath, url)
 
-# -------------------------
-# Requests: retry session
-# -------------------------
-def requests_retry_session(
-    retries=3,
-    backoff_factor=0.6,
-    status_forcelist=(500, 502, 503, 504),
-    session=None,
-):
-    session = session or requests.Session()
-    retry = Retry(
-        total=retries,
-        read=retries,
-        connect=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=status_forcelist,
-        allowed_methods=frozenset(['GET','POST','PUT','DELETE','HEAD','OPTIONS'])
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+def append_log(entry):
+    # queued for core.scrape_log's writer thread: safe from every worker, O(1) per entry
+    get_scrape_log().append(entry)
 
 # -------------------------
 # Layer implementations
 # Each returns dict on success, else None
 # -------------------------
-def try_requests(url, session=None, timeout=10):
+def try_requests(url, session=None, timeout=10, stream=False):
+    """
+    stream: write the body straight to the HTML store while hashing it
+    (core.streaming) instead of holding it in memory; bodies over
+    max_body_bytes or with a Content-Type outside ALLOWED_CONTENT_TYPES
+    are aborted.
+    """
     try:
-        s = session or requests_retry_session()
-        r = s.get(url, timeout=timeout)
+        s = session or get_session()
+        with get_breakers().guard(url) as call:
+            r, cached = get_cache().get(s, url, timeout=timeout, stream=stream)
+            if r.status_code >= 500:
+                call.failed()
+        if cached:
+            # 304 Not Modified: reuse the HTML saved on an earlier run
+            r.close()  # a streamed 304 still holds its pooled connection
+            return {"method":"Requests","status":"success", **cached}
+        if stream:
+            if r.status_code != 200:
+                r.close()  # give the connection back without reading the body
+                return None
+            saved = stream_to_store(r, lambda digest: os.path.join(HTML_DIR, html_filename("Requests", url, digest)), url)
+            return {"method":"Requests","status":"success","streamed": True, **saved,
+                    "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
         if r.status_code == 200:
-            return {"method":"Requests","status":"success","html": r.text}
+            return {"method":"Requests","status":"success","html": r.text,
+                    "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
     except Exception:
         return None
     return None
@@ -97,9 +101,11 @@ def try_requests(url, session=None, timeout=10):
 def try_requests_html(url):
     try:
         from requests_html import HTMLSession
-        session = HTMLSession()
-        r = session.get(url)
-        r.html.render(timeout=20)  # may need pyppeteer installed
+        get_limiter().acquire(url)
+        with get_breakers().guard(url):
+            session = HTMLSession()
+            r = session.get(url)
+            r.html.render(timeout=20)  # may need pyppeteer installed
         return {"method":"Requests-HTML","status":"success","html": r.html.html}
     except Exception:
         return None
@@ -107,7 +113,8 @@ def try_requests_html(url):
 def try_splash(url):
     try:
         splash_url = "http://localhost:8050/render.html"
-        r = requests.get(splash_url, params={"url": url, "wait": 1}, timeout=20)
+        get_limiter().acquire(url)  # the session paces the Splash host; pace the target site too
+        r = get_session().get(splash_url, params={"url": url, "wait": 1}, timeout=20)
         if r.status_code == 200:
             return {"method":"Splash","status":"success","html": r.text}
     except Exception:
@@ -115,30 +122,29 @@ def try_splash(url):
 
 def try_playwright(url):
     try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, wait_until="networkidle", timeout=30000)
-            html = page.content()
-            title = page.title()
-            browser.close()
-            return {"method":"Playwright","status":"success","html": html, "title": title}
+        get_limiter().acquire(url)
+        with get_breakers().guard(url):
+            res = get_browser_pool().render(url, wait_until="load", timeout=30000, ready=ready_policy(url))
+        return {"method":"Playwright","status":"success","html": res["html"], "title": res["title"], "waited_s": res["waited_s"]}
+    except Exception:
+        return None
+
+async def try_playwright_async(url):
+    # coroutine variant for racing: a losing render is cancelled in the pool
+    try:
+        await get_limiter().acquire_async(url)
+        with get_breakers().guard(url):
+            res = await get_browser_pool().render_async(url, wait_until="load", timeout=30000, ready=ready_policy(url))
+        return {"method":"Playwright","status":"success","html": res["html"], "title": res["title"], "waited_s": res["waited_s"]}
     except Exception:
         return None
 
 def try_selenium(url):
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        opts = Options()
-        opts.add_argument("--headless")
-        driver = webdriver.Chrome(options=opts)
-        driver.get(url)
-        html = driver.page_source
-        title = driver.title
-        driver.quit()
-        return {"method":"Selenium","status":"success","html": html, "title": title}
+        get_limiter().acquire(url)
+        with get_breakers().guard(url):
+            res = render_dynamic_page(url)
+        return {"method":"Selenium","status":"success","html": res["html"], "title": res["title"], "waited_s": res["waited_s"]}
     except Exception:
         return None
 
@@ -147,7 +153,7 @@ def try_cloud_api(url, api_key):
         return None
     try:
         api = f"http://api.scraperapi.com?api_key={api_key}&render=true&url={url}"
-        r = requests.get(api, timeout=20)
+        r = get_session().get(api, timeout=20)
         if r.status_code == 200:
             return {"method":"Cloud API","status":"success","html": r.text}
     except Exception:
@@ -159,8 +165,11 @@ def try_aiesec_api(url, session=None):
         return None
     api = f"https://gis-api.aiesec.org/v2/opportunities/{op_id}"
     try:
-        s = session or requests_retry_session()
-        r = s.get(api, timeout=10)
+        s = session or get_session()
+        with get_breakers().guard(api) as call:
+            r = s.get(api, timeout=10)
+            if r.status_code >= 500:
+                call.failed()
         if r.status_code == 200:
             return {"method":"AIESEC API","status":"success","json": r.json()}
     except Exception:
@@ -170,62 +179,98 @@ def try_ai_extraction(html):
     # intentionally left as placeholder (disabled by default)
     return None
 
+def has_content(res):
+    # racing accepts JSON API results as-is and HTML only when it has an h1 or sections
+    if res.get("html"):
+        return html_has_content(res["html"])
+    return bool(res.get("json"))
+
+# -------------------------
+# Persist one successful layer result (shared by thread + async engines)
+# -------------------------
+def record_success(url, res, batch_id=None):
+    # streamed bodies are already on disk; a saved path otherwise means a 304
+    from_cache = bool(res.get("html_path")) and not res.get("streamed")
+    if res.get("html_path"):
+        html_path = res["html_path"]
+    else:
+        # prepare saved html or json
+        html_output = res.get("html") or json.dumps(res.get("json",""), indent=2)
+        html_path = save_html_file(html_output, res.get("method","unknown"), url)
+    if not from_cache:
+        get_cache().remember(url, res.get("etag"), res.get("last_modified"), html_path)
+
+    log_entry = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "batch_id": batch_id,
+        "url": url,
+        "method": res.get("method","unknown"),
+        "status": "success",
+        "html_path": html_path,
+        "html_hash": res.get("html_hash") or get_html_store().blob_of(html_path),
+        "from_cache": from_cache,
+        "render_wait_s": res.get("waited_s"),
+        "items_extracted": None  # parser step later will fill if needed
+    }
+    append_log(log_entry)
+    return log_entry
+
 # -------------------------
 # Per-URL orchestration
-# Runs layers sequentially.
-# rate_limit_seconds is a per-task delay before starting (simple rate control)
+# Runs layers sequentially, best layer for the domain first (core.cascade);
+# each request is paced per host by core.rate_limiter.
 # retry_attempts is used for re-running the whole per-URL sequence if transient failure
 # -------------------------
-def run_single_scrape(url, cloud_key=None, rate_limit_seconds=0.0, retry_attempts=1, timeout=12):
+def blocked_by_robots(url):
+    return {"timestamp": datetime.utcnow().isoformat(), "url": url, "method": None, "status": "blocked", "reason": "robots.txt"}
+
+def run_single_scrape(url, cloud_key=None, retry_attempts=1, timeout=12, race=False, respect_robots=False, stream=False, batch_id=None):
     """
     Returns: dict log_entry on success; dict with status failed on failure
+    race: start Requests and Playwright together; first page with content wins
+    respect_robots: skip URLs the site's robots.txt disallows (cached per site)
+    stream: the Requests layer writes bodies to disk as they arrive
+    batch_id: tags the log entry with the run it belongs to (core.metadata_store)
     """
     # simple URL validation before attempting
     parsed = urllib.parse.urlparse(url)
     if not parsed.scheme or not parsed.netloc:
         return {"status":"failed","reason":"invalid_url","url":url}
+    if respect_robots and not get_robots().allowed(url):
+        return blocked_by_robots(url)
+    if get_breakers().is_open(url):
+        # host is failing fast: don't spend retries and layer timeouts on it
+        return {"timestamp": datetime.utcnow().isoformat(), "url": url, "method": None, "status": "failed", "reason": "circuit_open"}
 
     for attempt in range(1, retry_attempts+1):
         try:
-            if rate_limit_seconds and attempt==1:
-                time.sleep(rate_limit_seconds)  # crude rate limiting
-
-            session = requests_retry_session(retries=2, backoff_factor=0.5)
+            session = get_session()
 
             layers = [
-                lambda u: try_requests(u, session=session, timeout=timeout),
-                try_requests_html,
-                try_splash,
-                try_playwright,
-                try_selenium,
-                lambda u: try_cloud_api(u, cloud_key),
-                lambda u: try_aiesec_api(u, session=session),
-                lambda u: try_ai_extraction("No HTML")  # placeholder
+                ("requests", lambda u: try_requests(u, session=session, timeout=timeout, stream=stream)),
+                ("requests_html", try_requests_html),
+                ("splash", try_splash),
+                ("playwright", try_playwright),
+                ("selenium", try_selenium),
+                ("cloud_api", lambda u: try_cloud_api(u, cloud_key)),
+                ("aiesec_api", lambda u: try_aiesec_api(u, session=session)),
+                ("ai_extraction", lambda u: try_ai_extraction("No HTML"))  # placeholder
             ]
 
-            for layer in layers:
-                try:
-                    res = layer(url)
-                except Exception:
-                    res = None
-
-                if res:
-                    # prepare saved html or json
-                    html_output = res.get("html") or json.dumps(res.get("json",""), indent=2)
-                    html_path = save_html_file(html_output, res.get("method","unknown"), url)
-
-                    log_entry = {
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "url": url,
-                        "method": res.get("method","unknown"),
-                        "status": "success",
-                        "html_path": html_path,
-                        "items_extracted": None  # parser step later will fill if needed
-                    }
-                    append_log(log_entry)
-                    return log_entry
+            racers = None
+            if race:
+                # racers keep the body in memory: has_content judges the HTML itself
+                racers = [
+                    ("requests", lambda u: try_requests(u, session=session, timeout=timeout)),
+                    ("playwright", try_playwright_async),
+                ]
+
+            # layers run in the order that has worked best for this domain so far
+            _, res = run_cascade(url, layers, racers=racers, accept=has_content)
+            if res:
+                return record_success(url, res, batch_id)
             # if none succeeded, mark failed and maybe retry
-            if attempt < retry_attempts:
+            if attempt < retry_attempts and not get_breakers().is_open(url):
                 time.sleep(1.0 * attempt)  # simple backoff before next attempt
                 continue
             return {"timestamp": datetime.utcnow().isoformat(), "url": url, "method": None, "status":"failed"}
@@ -238,6 +283,12 @@ def run_single_scrape(url, cloud_key=None, rate_limit_seconds=0.0, retry_attempt
     # fallback
     return {"timestamp": datetime.utcnow().isoformat(), "url": url, "status":"failed"}
 
+# -------------------------
+# Crawl helper: links on a saved page, as parse_html_to_json_v3 reports them
+# -------------------------
+def page_links(html_path):
+    return html_links(read_html(html_path))
+
 # -------------------------
 # Helpers: URL validation & dedupe
 # -------------------------
@@ -260,8 +311,9 @@ st.markdown(
     **Features**
     - Paste multiple URLs or upload a CSV (one URL per line or column)
     - Parallel scraping with configurable concurrency
-    - Basic rate limiting, retries, and progress UI
-    - Logs saved to `scrape_log.json`, HTML saved to `scraped_html/`
+    - Optional asyncio engine for very large static batches
+    - Per-host rate limiting (adapts to 429 / Retry-After), retries, and progress UI
+    - Logs appended to `scrape_log.jsonl`; HTML kept compressed and deduplicated in `data/html_store/` (listed as `scraped_html/` files)
     """
 )
 
@@ -291,10 +343,55 @@ else:
 
 # Options: concurrency, rate limit, retries
 st.sidebar.header("Run Options")
+engine = st.sidebar.radio(
+    "Fetch engine",
+    ["Threaded cascade", "Asyncio (static first)"],
+    help="Asyncio fetches every URL statically with thousands of requests in flight; "
+         "only URLs that fail fall back to the threaded layer cascade.",
+)
 concurrency = st.sidebar.number_input("Max concurrent workers", min_value=1, max_value=32, value=6, step=1)
-rate_limit = st.sidebar.number_input("Per-task start delay (seconds)", min_value=0.0, max_value=10.0, value=0.2, step=0.1)
+if engine.startswith("Asyncio"):
+    async_concurrency = st.sidebar.number_input("Async requests in flight", min_value=1, max_value=5000, value=SETTINGS["async_concurrency"], step=50)
+    async_per_host = st.sidebar.number_input("Async per-host cap (0 = none)", min_value=0, max_value=1000, value=SETTINGS["async_per_host"], step=5)
+host_qps = st.sidebar.number_input(
+    "Per-host requests/second", min_value=0.1, max_value=100.0, value=float(SETTINGS["host_qps"]), step=0.5,
+    help="Token bucket per domain; hosts answering 429 or Retry-After are slowed down automatically.",
+)
+get_limiter().configure(qps=host_qps)
+race_layers = st.sidebar.checkbox(
+    "Race Requests and Playwright",
+    value=False,
+    help=f"Fetch static and rendered HTML at once; the first with content wins. At most {SETTINGS['race_per_host']} races per host at a time.",
+)
 per_url_retries = st.sidebar.number_input("Per-URL attempts (retries)", min_value=1, max_value=5, value=2, step=1)
 cloud_key = st.sidebar.text_input("ScraperAPI key (optional)", type="password")
+stream_downloads = st.sidebar.checkbox(
+    "Stream downloads to disk",
+    value=SETTINGS["stream_downloads"],
+    help=f"The Requests layer writes pages to disk as they arrive; bodies over {SETTINGS['max_body_bytes'] // (1024 * 1024)} MB "
+         "or with a non-HTML/JSON/XML Content-Type are aborted early.",
+)
+respect_robots = st.sidebar.checkbox(
+    "Respect robots.txt",
+    value=SETTINGS["respect_robots"],
+    help="robots.txt is fetched once per site and cached; Crawl-delay slows that host down.",
+)
+crawl = st.sidebar.checkbox(
+    "Crawl: follow links from scraped pages",
+    value=False,
+    help="Seed URLs go into a frontier saved under data/crawl/; links on each scraped page "
+         "(same hosts only) are queued. Run again with the same crawl name to resume.",
+)
+if crawl:
+    crawl_name = st.sidebar.text_input("Crawl name", value="default")
+    crawl_depth = st.sidebar.number_input("Max link depth", min_value=0, max_value=10, value=SETTINGS["frontier_max_depth"], step=1)
+    crawl_max_pages = st.sidebar.number_input("Pages to fetch this run", min_value=1, max_value=1000000, value=200, step=50)
+
+with st.sidebar.expander("HTML storage"):
+    legacy = [f for f in os.listdir(HTML_DIR) if f.endswith(".html")]
+    st.write(f"{len(legacy)} plain HTML files in `{HTML_DIR}/` from before the store")
+    if legacy and st.button("Move them into the compressed store"):
+        st.success(f"Moved {get_html_store().import_folder(HTML_DIR)} files; parsers and viewers read them as before.")
 
 # Clean + validate + dedupe urls
 valid_urls = []
@@ -337,49 +434,181 @@ overall_progress = st.progress(0)
 
 if start:
     total = len(unique_urls)
-    if total == 0:
+    if total == 0 and not crawl:
         st.error("No valid URLs to scrape.")
     else:
-        st.info(f"Starting scraping {total} URLs with {concurrency} workers...")
         results = []
+        progress_state = {"completed": 0}
+        get_cache().reset_stats()
+        get_robots().reset_stats()
+        get_html_store().reset_stats()
+        batch_id = get_metadata_store().start_batch(total, source="crawl" if crawl else engine)
+
+        def report(u, res):
+            progress_state["completed"] += 1
+            completed = progress_state["completed"]
+            overall_progress.progress(math.floor(completed/total*100))
+
+            # Update per-URL placeholder
+            ph = status_placeholders.get(u)
+            if ph:
+                if res.get("status") == "success":
+                    ph.success(f"[{completed}/{total}] {u} — {res.get('method')}")
+                elif res.get("status") == "blocked":
+                    ph.warning(f"[{completed}/{total}] {u} — disallowed by robots.txt")
+                else:
+                    ph.error(f"[{completed}/{total}] {u} — failed")
+
+            results.append(res)
+
+        cascade_urls = unique_urls
+        if respect_robots and unique_urls:
+            # one robots.txt request per site, in parallel, before any page
+            get_robots().prefetch(unique_urls)
+
+        if crawl:
+            frontier = Frontier(crawl_name, max_depth=crawl_depth)
+            new_seeds = frontier.add_seeds(unique_urls)
+            st.info(f"Crawl '{crawl_name}': {new_seeds} new seed URLs, {len(frontier)} URLs queued")
+            total = crawl_max_pages
+            cascade_urls = []
+
+            with ThreadPoolExecutor(max_workers=concurrency) as exe:
+                while progress_state["completed"] < crawl_max_pages:
+                    batch = frontier.pop_batch(min(concurrency * 2, crawl_max_pages - progress_state["completed"]))
+                    if not batch:
+                        break
+                    futures = {
+                        exe.submit(run_single_scrape, u, cloud_key, per_url_retries, race=race_layers, respect_robots=respect_robots, stream=stream_downloads, batch_id=batch_id): (u, depth)
+                        for u, depth in batch
+                    }
+                    for fut in as_completed(futures):
+                        u, depth = futures[fut]
+                        try:
+                            res = fut.result()
+                        except Exception as e:
+                            res = {"timestamp": datetime.utcnow().isoformat(), "url": u, "status":"failed", "error": str(e)}
+                        report(u, res)
+                        if res.get("status") == "success" and depth < crawl_depth:
+                            try:
+                                frontier.add_links(page_links(res["html_path"]), u, depth + 1)
+                            except Exception:
+                                pass
+                    frontier.complete([u for u, _ in batch])
+                    frontier.checkpoint()
+
+            total = progress_state["completed"]
+            crawl_stats = frontier.stats()
+            frontier.close()
+            st.info(f"Crawl '{crawl_name}': {crawl_stats['queued']} URLs still queued, {crawl_stats['seen']} URLs seen so far")
+        elif engine.startswith("Asyncio"):
+            st.info(f"Fetching {total} URLs with up to {async_concurrency} requests in flight...")
+            static_misses = []
+
+            # record_success runs off the event loop (save=); report updates the page on it
+            def on_static_result(u, res):
+                if res["status"] == "success":
+                    report(u, res)
+                else:
+                    static_misses.append(u)
+
+            static_urls = unique_urls
+            if respect_robots:
+                static_urls = []
+                for u in unique_urls:
+                    if get_robots().allowed(u):
+                        static_urls.append(u)
+                    else:
+                        report(u, blocked_by_robots(u))
+
+            run_fetch_many(
+                static_urls, on_static_result, concurrency=async_concurrency, per_host=async_per_host,
+                save=lambda u, res: record_success(u, res, batch_id),
+            )
+            cascade_urls = static_misses
+            if cascade_urls:
+                st.info(f"{len(cascade_urls)} URLs failed the static fetch; running the full cascade with {concurrency} workers...")
+        else:
+            st.info(f"Starting scraping {total} URLs with {concurrency} workers...")
+
         # Use ThreadPoolExecutor to run per-URL orchestration in parallel
         with ThreadPoolExecutor(max_workers=concurrency) as exe:
             futures = {}
-            for idx, u in enumerate(unique_urls):
+            for idx, u in enumerate(cascade_urls):
                 # create a placeholder to display per-url progress
                 ph = status_placeholders.get(u, None)
                 if ph:
-                    ph.info(f"Queued ({idx+1}/{total}): {u}")
+                    ph.info(f"Queued ({idx+1}/{len(cascade_urls)}): {u}")
                 # schedule
-                future = exe.submit(run_single_scrape, u, cloud_key, rate_limit, per_url_retries)
+                future = exe.submit(run_single_scrape, u, cloud_key, per_url_retries, race=race_layers, respect_robots=respect_robots, stream=stream_downloads, batch_id=batch_id)
                 futures[future] = (u, idx)
 
-            completed = 0
             for fut in as_completed(futures):
                 u, idx = futures[fut]
                 try:
                     res = fut.result()
                 except Exception as e:
                     res = {"timestamp": datetime.utcnow().isoformat(), "url": u, "status":"failed", "error": str(e)}
-                completed += 1
-                overall_progress.progress(math.floor(completed/total*100))
-
-                # Update per-URL placeholder
-                ph = status_placeholders.get(u)
-                if ph:
-                    if res.get("status") == "success":
-                        ph.success(f"[{completed}/{total}] {u} — {res.get('method')}")
-                    else:
-                        ph.error(f"[{completed}/{total}] {u} — failed")
-
-                results.append(res)
+                report(u, res)
 
         # final summary UI
         st.subheader("Batch scraping complete")
         st.write(f"Total attempted: {total}")
         success_count = sum(1 for r in results if r.get("status")=="success")
-        failed_count = total - success_count
-        st.write(f"Success: {success_count}; Failed: {failed_count}")
+        blocked_count = sum(1 for r in results if r.get("status")=="blocked")
+        failed_count = total - success_count - blocked_count
+        st.write(f"Success: {success_count}; Failed: {failed_count}" + (f"; Blocked by robots.txt: {blocked_count}" if blocked_count else ""))
+        get_metadata_store().finish_batch(batch_id, success_count, failed_count)
+        st.caption(f"Logged as {batch_id}")
+
+        # Conditional-GET revalidation
+        get_cache().flush()
+        cache_stats = get_cache().stats()
+        st.write(
+            f"HTTP cache: {cache_stats['hits']} not-modified hits (hit rate {cache_stats['hit_rate']:.0%}), "
+            f"{cache_stats['revalidations']} conditional requests (revalidation rate {cache_stats['revalidation_rate']:.0%})"
+        )
+
+        store_stats = get_html_store().stats()
+        st.write(
+            f"HTML store: {store_stats['stored']} new pages stored, {store_stats['deduplicated']} unchanged pages "
+            f"deduplicated; {store_stats['blobs']} blobs ({store_stats['stored_mb']} MB) behind {store_stats['pages']} saved pages"
+        )
+
+        # Connection reuse across the shared HTTP pool
+        stats = pool_stats()
+        st.write(
+            f"HTTP pool: {stats['requests']} requests over {stats['connections_opened']} new connections "
+            f"(reuse ratio {stats['reuse_ratio']:.0%}), {stats['open_sockets']} sockets open"
+        )
+        if stats["hosts"]:
+            with st.expander("Connection pool per host"):
+                st.dataframe(pd.DataFrame(stats["hosts"]))
+
+        if respect_robots:
+            robots_stats = get_robots().stats()
+            st.write(
+                f"robots.txt: {robots_stats['fetches']} fetched for {robots_stats['sites']} cached sites, "
+                f"{robots_stats['blocked']} of {robots_stats['checks']} URL checks disallowed"
+            )
+
+        throttled = [h for h in get_limiter().snapshot() if h["qps"] < h["target_qps"] or h["blocked_for_s"]]
+        if throttled:
+            st.warning(f"{len(throttled)} hosts were slowed down after 429/503 responses")
+            st.dataframe(pd.DataFrame(throttled))
+
+        breakers = get_breakers().snapshot()
+        if breakers:
+            open_count = sum(1 for b in breakers if b["state"] != "closed")
+            st.warning(f"Circuit breakers: {open_count} hosts failing fast, {len(breakers)} tripped during this session")
+            st.dataframe(pd.DataFrame(breakers))
+
+        # Learned layer order per domain
+        get_layer_stats().flush()
+        layer_rows = get_layer_stats().snapshot()
+        if layer_rows:
+            with st.expander("Scrape layer success per domain"):
+                st.dataframe(pd.DataFrame(layer_rows).sort_values(["host", "success_rate"], ascending=[True, False]))
 
         # Show small table of results
         df = pd.DataFrame(results)
@@ -391,8 +620,9 @@ if start:
         st.success(f"Report saved to {csv_report}")
         st.download_button("Download report (CSV)", data=open(csv_report,"rb").read(), file_name=csv_report, mime="text/csv")
 
-        # Also offer raw JSON log
-        st.download_button("Download scrape_log.json", data=open(LOG_FILE,"rb").read(), file_name=LOG_FILE, mime="application/json")
+        # Also offer the full log as one JSON array
+        st.download_button("Download scrape_log.json", data=json.dumps(read_scrape_log(), indent=2, ensure_ascii=False),
+                           file_name="scrape_log.json", mime="application/json")
 
         # Show most-used methods
         if "method" in df.columns:
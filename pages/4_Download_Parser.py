@@ -1,22 +1,23 @@
 import streamlit as st
 import os
 import re
-import json
 import hashlib
 import urllib.parse
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
 import pandas as pd
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from core.html_store import get_html_store
+from core.http_cache import get_cache
+from core.http_pool import get_session, pool_stats
+from core.metadata_store import get_metadata_store
+from core.scrape_log import get_scrape_log
 
 # ======================================================
 # CONFIG
 # ======================================================
 HTML_DIR = "scraped_html"
-LOG_FILE = "scrape_log.json"
 
 os.makedirs(HTML_DIR, exist_ok=True)
 
@@ -32,32 +33,13 @@ def compute_hash(content):
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
-def load_logs():
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, "r") as f:
-            return json.load(f)
-    return []
-
-
 def append_log(entry):
-    logs = load_logs()
-    logs.append(entry)
-    with open(LOG_FILE, "w") as f:
-        json.dump(logs, f, indent=2)
-
+    get_scrape_log().append(entry)
 
-def create_new_batch_id():
-    logs = load_logs()
-    batch_nums = []
 
-    for l in logs:
-        bid = l.get("batch_id", "")
-        m = re.search(r"batch_(\d+)", bid)
-        if m:
-            batch_nums.append(int(m.group(1)))
-
-    next_id = max(batch_nums) + 1 if batch_nums else 1
-    return f"batch_{next_id:03d}"
+def create_new_batch_id(total):
+    # next batch_NNN from the metadata store's index, not a scan of the log
+    return get_metadata_store().start_batch(total, source="opportunities")
 
 
 def save_html_file(html_content, method, url, batch_id):
@@ -67,36 +49,25 @@ def save_html_file(html_content, method, url, batch_id):
 
     filename = f"{timestamp}_{batch_id}_{method}_{op_id}_{short_hash}.html"
     path = os.path.join(HTML_DIR, filename)
-
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(html_content)
-
-    return path
+    return get_html_store().save(html_content, path, url)
 
 
 # ======================================================
-# REQUESTS SESSION WITH RETRIES
+# REQUESTS (shared keep-alive pool + conditional-GET cache)
 # ======================================================
-def requests_retry_session():
-    session = requests.Session()
-    retry = Retry(
-        total=3,
-        backoff_factor=0.5,
-        status_forcelist=(500, 502, 503, 504),
-        allowed_methods=frozenset(["GET"]),
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
-
-
 def try_requests(url):
     try:
-        s = requests_retry_session()
-        r = s.get(url, timeout=12)
+        r, cached = get_cache().get(get_session(), url, timeout=12)
+        if cached:
+            # 304 Not Modified: the earlier file is still current
+            return {"method": "Requests", **cached}
         if r.status_code == 200:
-            return {"method": "Requests", "html": r.text}
+            return {
+                "method": "Requests",
+                "html": r.text,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+            }
     except Exception:
         pass
     return None
@@ -127,7 +98,12 @@ def run_single_scrape(url, batch_id):
         append_log(entry)
         return entry
 
-    html_path = save_html_file(res["html"], res["method"], url, batch_id)
+    from_cache = "html_path" in res
+    if from_cache:
+        html_path = res["html_path"]
+    else:
+        html_path = save_html_file(res["html"], res["method"], url, batch_id)
+        get_cache().remember(url, res["etag"], res["last_modified"], html_path)
 
     entry = {
         "batch_id": batch_id,
@@ -136,6 +112,8 @@ def run_single_scrape(url, batch_id):
         "method": res["method"],
         "status": "success",
         "html_path": html_path,
+        "html_hash": get_html_store().blob_of(html_path),
+        "from_cache": from_cache,
     }
 
     append_log(entry)
@@ -172,11 +150,12 @@ if st.button("🚀 Start Bulk Scraping"):
         st.warning("No URLs provided")
         st.stop()
 
-    batch_id = create_new_batch_id()
+    batch_id = create_new_batch_id(len(urls))
     st.info(f"📦 Starting batch `{batch_id}` with {len(urls)} URLs")
 
     progress = st.progress(0)
     results = []
+    get_cache().reset_stats()
 
     with ThreadPoolExecutor(max_workers=max_workers) as exe:
         futures = {
@@ -190,10 +169,25 @@ if st.button("🚀 Start Bulk Scraping"):
             progress.progress((i + 1) / len(urls))
 
     df = pd.DataFrame(results)
+    succeeded = sum(1 for r in results if r.get("status") == "success")
+    get_metadata_store().finish_batch(batch_id, succeeded, len(results) - succeeded)
 
     st.success(f"✅ Batch `{batch_id}` completed")
     st.dataframe(df, use_container_width=True)
 
+    get_cache().flush()
+    cache_stats = get_cache().stats()
+    st.caption(
+        f"HTTP cache: {cache_stats['hits']} not-modified hits (hit rate {cache_stats['hit_rate']:.0%}), "
+        f"{cache_stats['revalidations']} conditional requests (revalidation rate {cache_stats['revalidation_rate']:.0%})"
+    )
+
+    stats = pool_stats()
+    st.caption(
+        f"HTTP pool: {stats['requests']} requests over {stats['connections_opened']} new connections "
+        f"(reuse ratio {stats['reuse_ratio']:.0%}), {stats['open_sockets']} sockets open"
+    )
+
     csv = df.to_csv(index=False).encode("utf-8")
     st.download_button(
         "⬇️ Download Batch Results CSV",
@@ -1,17 +1,24 @@
 import streamlit as st
-import requests
 import re
 import json
 import os
 import hashlib
 import pandas as pd
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+from core.browser_pool import get_browser_pool
+from core.dynamic_scraper import render_dynamic_page
+from core.extractors import extract_html
+from core.html_store import get_html_store, list_html, read_html
+from core.http_pool import get_session
+from core.metadata_store import get_metadata_store
+from core.parse_manifest import html_hash, manifest_row, parser_code_hash, record_parse
+from core.readiness import ready_policy
+from core.scrape_log import get_scrape_log, read_scrape_log
 
 # ===============================================================
 # CONFIG
 # ===============================================================
-LOG_FILE = "scrape_log.json"
 HTML_DIR = "scraped_html"
 PARSER_LOG_FILE = "parser_log.json"
 
@@ -37,31 +44,22 @@ def save_html_file(html_content, method, url):
     timestamp = datetime.utcnow().isoformat().replace(":", "-").split(".")[0]
     filename = f"{timestamp}_{method}_{op_id}.html"
     filepath = os.path.join(HTML_DIR, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    return filepath
+    return get_html_store().save(html_content, filepath, url)
 
 
 # ----------------- SCRAPE LOGS -----------------
 
 def load_logs():
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return []
-    return []
+    return read_scrape_log()
 
 
 def save_log(url, method, html_content):
     html_hash = compute_hash(html_content)
-    logs = load_logs()
 
-    # Duplicate detection
-    for entry in logs:
-        if entry.get("html_hash") == html_hash:
-            return entry  # already logged
+    # Duplicate detection: one indexed lookup in the metadata store's hash table
+    existing = get_metadata_store().find_hash(html_hash)
+    if existing:
+        return existing  # already logged
 
     html_path = save_html_file(html_content, method, url)
 
@@ -73,10 +71,12 @@ def save_log(url, method, html_content):
         "html_hash": html_hash
     }
 
-    logs.append(log_entry)
-    with open(LOG_FILE, "w", encoding="utf-8") as f:
-        json.dump(logs, f, indent=2)
+    # another worker may have saved the same page since the lookup
+    existing = get_metadata_store().claim_hash(html_hash, log_entry)
+    if existing:
+        return existing
 
+    get_scrape_log().append(log_entry)
     return log_entry
 
 
@@ -121,7 +121,7 @@ def load_parser_logs():
 
 def try_requests(url):
     try:
-        r = requests.get(url, timeout=8)
+        r = get_session().get(url, timeout=8)
         if r.status_code != 200:
             return None
         return {"method": "Requests", "status": "success", "html": r.text}
@@ -143,7 +143,7 @@ def try_requests_html(url):
 def try_splash(url):
     try:
         splash_url = "http://localhost:8050/render.html"
-        r = requests.get(splash_url, params={"url": url, "wait": 1})
+        r = get_session().get(splash_url, params={"url": url, "wait": 1})
         if r.status_code == 200:
             return {"method": "Splash", "status": "success", "html": r.text}
     except Exception:
@@ -152,31 +152,16 @@ def try_splash(url):
 
 def try_playwright(url):
     try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, wait_until="networkidle")
-            html = page.content()
-            title = page.title()
-            browser.close()
-            return {"method": "Playwright", "status": "success", "html": html, "title": title}
+        res = get_browser_pool().render(url, wait_until="load", ready=ready_policy(url))
+        return {"method": "Playwright", "status": "success", "html": res["html"], "title": res["title"]}
     except Exception:
         return None
 
 
 def try_selenium(url):
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        opts = Options()
-        opts.add_argument("--headless")
-        driver = webdriver.Chrome(options=opts)
-        driver.get(url)
-        html = driver.page_source
-        title = driver.title
-        driver.quit()
-        return {"method": "Selenium", "status": "success", "html": html, "title": title}
+        res = render_dynamic_page(url)
+        return {"method": "Selenium", "status": "success", "html": res["html"], "title": res["title"]}
     except Exception:
         return None
 
@@ -186,7 +171,7 @@ def try_cloud_api(url, api_key):
         return None
     try:
         api = f"http://api.scraperapi.com?api_key={api_key}&render=true&url={url}"
-        r = requests.get(api, timeout=20)
+        r = get_session().get(api, timeout=20)
         if r.status_code == 200:
             return {"method": "Cloud API", "status": "success", "html": r.text}
     except Exception:
@@ -199,7 +184,7 @@ def try_aiesec_api(url):
         return None
     api = f"https://gis-api.aiesec.org/v2/opportunities/{op_id}"
     try:
-        r = requests.get(api, timeout=10)
+        r = get_session().get(api, timeout=10)
         if r.status_code == 200:
             return {"method": "AIESEC API", "status": "success", "json": r.json()}
     except Exception:
@@ -215,131 +200,14 @@ def try_ai_extraction(html):
 # PARSER TYPES
 # ===============================================================
 
-def extract_section_by_keywords(soup, keywords, max_nodes=50):
-    """
-    Find headings with given keywords, then collect following siblings
-    until the next heading or node limit.
-    """
-    sections = []
-    lowered_keywords = [k.lower() for k in keywords]
-
-    for heading in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-        text = heading.get_text(strip=True).lower()
-        if any(k in text for k in lowered_keywords):
-            items = []
-            count = 0
-            for sib in heading.next_siblings:
-                if isinstance(sib, str):
-                    continue
-                if sib.name in ["h1", "h2", "h3", "h4", "h5", "h6"]:
-                    break
-                if sib.name in ["p", "li", "div", "span"]:
-                    content = sib.get_text(strip=True)
-                    if content:
-                        items.append(content)
-                        count += 1
-                if count >= max_nodes:
-                    break
-            if items:
-                sections.append({
-                    "heading": heading.get_text(strip=True),
-                    "items": items
-                })
-    return sections
-
-
-# Type 1 – Paragraphs & Headings
-def parser_type_1(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    data = []
-
-    for p in soup.find_all("p"):
-        txt = p.get_text(strip=True)
-        if txt:
-            data.append({"type": "paragraph", "content": txt})
-
-    for h in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-        txt = h.get_text(strip=True)
-        if txt:
-            data.append({"type": "heading", "level": h.name, "content": txt})
-
-    return data
-
-
-# Type 2 – Links & List Items
-def parser_type_2(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    data = []
-
-    for a in soup.find_all("a"):
-        txt = a.get_text(strip=True)
-        href = a.get("href")
-        if txt or href:
-            data.append({"type": "link", "href": href, "content": txt})
-
-    for li in soup.find_all("li"):
-        txt = li.get_text(strip=True)
-        if txt:
-            data.append({"type": "list_item", "content": txt})
-
-    return data
-
-
-# Type 3 – Job Description Sections
-def parser_type_3_job_description(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    keywords = ["job description", "role description", "main activities",
-                "responsibilities", "what will you do"]
-    sections = extract_section_by_keywords(soup, keywords)
-    data = []
-    for sec in sections:
-        for item in sec["items"]:
-            data.append({
-                "type": "job_description",
-                "section_heading": sec["heading"],
-                "content": item
-            })
-    return data
-
-
-# Type 4 – Skills Sections
-def parser_type_4_skills(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    keywords = ["skills", "competencies", "backgrounds", "preferred skills"]
-    sections = extract_section_by_keywords(soup, keywords)
-    data = []
-    for sec in sections:
-        for item in sec["items"]:
-            data.append({
-                "type": "skill",
-                "section_heading": sec["heading"],
-                "content": item
-            })
-    return data
-
-
-# Type 5 – Eligibility Sections
-def parser_type_5_eligibility(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    keywords = ["eligibility", "requirements", "profile", "who can apply", "criteria"]
-    sections = extract_section_by_keywords(soup, keywords)
-    data = []
-    for sec in sections:
-        for item in sec["items"]:
-            data.append({
-                "type": "eligibility",
-                "section_heading": sec["heading"],
-                "content": item
-            })
-    return data
-
-
+# Extractors live in core.extractors: one parse and one walk per file,
+# however many types are run on it. Label -> output key (JSON suffix).
 PARSER_TYPES = {
-    "Type 1 – Paragraphs & Headings": ("type_1", parser_type_1),
-    "Type 2 – Links & List Items": ("type_2", parser_type_2),
-    "Type 3 – Job Description Sections": ("type_3_job_description", parser_type_3_job_description),
-    "Type 4 – Skills Sections": ("type_4_skills", parser_type_4_skills),
-    "Type 5 – Eligibility Sections": ("type_5_eligibility", parser_type_5_eligibility),
+    "Type 1 – Paragraphs & Headings": "type_1",
+    "Type 2 – Links & List Items": "type_2",
+    "Type 3 – Job Description Sections": "type_3_job_description",
+    "Type 4 – Skills Sections": "type_4_skills",
+    "Type 5 – Eligibility Sections": "type_5_eligibility",
 }
 
 
@@ -396,12 +264,11 @@ with tab_scrape:
                 st.error("All scraping layers failed.")
 
     st.subheader("📂 Browse Saved HTML Files")
-    html_files = os.listdir(HTML_DIR)
+    html_files = list_html(HTML_DIR)
     if html_files:
         selected = st.selectbox("Choose HTML file to preview", html_files, key="preview_html")
         if selected:
-            with open(os.path.join(HTML_DIR, selected), "r", encoding="utf-8") as f:
-                content = f.read()
+            content = read_html(os.path.join(HTML_DIR, selected))
             st.code(content[:5000], language="html")
     else:
         st.info("No HTML files saved yet.")
@@ -413,7 +280,7 @@ with tab_scrape:
 with tab_parse:
     st.header("🔄 HTML → JSON Parser")
 
-    html_files = os.listdir(HTML_DIR)
+    html_files = list_html(HTML_DIR)
     if not html_files:
         st.info("No HTML files available. Scrape something first.")
     else:
@@ -424,22 +291,30 @@ with tab_parse:
         with col2:
             parser_label = st.selectbox("Select Parser Type", list(PARSER_TYPES.keys()), key="parser_choice_single")
 
+        bulk_labels = st.multiselect(
+            "Parser types for bulk parse (each file is parsed once for all of them)",
+            list(PARSER_TYPES.keys()), default=[parser_label], key="parser_choice_bulk"
+        )
+
         run_single = st.button("Run Parser on Selected HTML")
-        run_bulk = st.button("Bulk Parse ALL HTML files with Selected Parser")
+        run_bulk = st.button("Bulk Parse ALL HTML files with Selected Parsers")
 
         if run_single:
             html_path = os.path.join(HTML_DIR, selected_html)
-            with open(html_path, "r", encoding="utf-8") as f:
-                html_text = f.read()
+            html_text = read_html(html_path)
 
-            parser_type_key, parser_fn = PARSER_TYPES[parser_label]
-            parsed_data = parser_fn(html_text)
+            parser_type_key = PARSER_TYPES[parser_label]
+            parsed_data = extract_html(html_text, [parser_type_key])[parser_type_key]
 
             json_output_path = html_path.replace(".html", f"_{parser_type_key}.json")
             with open(json_output_path, "w", encoding="utf-8") as out:
                 json.dump(parsed_data, out, indent=4, ensure_ascii=False)
 
             log_entry = save_parser_log(selected_html, parser_type_key, json_output_path)
+            record_parse(
+                parser_type_key, parser_code_hash("extractors", package="core"), html_path, json_output_path,
+                html_hash(html_path, html_text)
+            )
 
             st.success(f"Parsed successfully with {parser_label}. JSON saved at: {json_output_path}")
             st.subheader("Preview JSON")
@@ -447,21 +322,30 @@ with tab_parse:
             st.subheader("Parser Log Entry")
             st.json(log_entry)
 
-        if run_bulk:
-            parser_type_key, parser_fn = PARSER_TYPES[parser_label]
+        if run_bulk and not bulk_labels:
+            st.warning("Select at least one parser type for the bulk parse.")
+        elif run_bulk:
+            parser_type_keys = [PARSER_TYPES[label] for label in bulk_labels]
+            extractors_hash = parser_code_hash("extractors", package="core")
             bulk_logs = []
+            manifest_rows = []
             for file_name in html_files:
                 html_path = os.path.join(HTML_DIR, file_name)
-                with open(html_path, "r", encoding="utf-8") as f:
-                    html_text = f.read()
-                parsed_data = parser_fn(html_text)
-                json_output_path = html_path.replace(".html", f"_{parser_type_key}.json")
-                with open(json_output_path, "w", encoding="utf-8") as out:
-                    json.dump(parsed_data, out, indent=4, ensure_ascii=False)
-                log_entry = save_parser_log(file_name, parser_type_key, json_output_path)
-                bulk_logs.append(log_entry)
-
-            st.success(f"Bulk parsed {len(html_files)} HTML files with {parser_label}.")
+                html_text = read_html(html_path)
+                content_hash = html_hash(html_path, html_text)
+                # one read, one parse and one walk for every selected type
+                for parser_type_key, parsed_data in extract_html(html_text, parser_type_keys).items():
+                    json_output_path = html_path.replace(".html", f"_{parser_type_key}.json")
+                    with open(json_output_path, "w", encoding="utf-8") as out:
+                        json.dump(parsed_data, out, indent=4, ensure_ascii=False)
+                    log_entry = save_parser_log(file_name, parser_type_key, json_output_path)
+                    bulk_logs.append(log_entry)
+                    manifest_rows.append(manifest_row(
+                        parser_type_key, extractors_hash, html_path, json_output_path, content_hash
+                    ))
+            get_metadata_store().record_parses(manifest_rows)
+
+            st.success(f"Bulk parsed {len(html_files)} HTML files with {', '.join(bulk_labels)}.")
             st.subheader("Bulk Parser Logs")
             st.json(bulk_logs)
 
@@ -1,7 +1,9 @@
 import streamlit as st
 import os
 import json
-from bs4 import BeautifulSoup
+
+from core.html_store import get_html_store, list_html, read_html
+from core.soup import make_soup
 
 
 # =========================================================
@@ -9,13 +11,12 @@ from bs4 import BeautifulSoup
 # =========================================================
 def parse_html_to_json(html_file, output_file, parser_type="type_1"):
 
-    if not os.path.exists(html_file):
+    if not get_html_store().exists(html_file):
         return None, f"Error: File '{html_file}' does not exist."
 
-    with open(html_file, "r", encoding="utf-8") as file:
-        html_content = file.read()
+    html_content = read_html(html_file)
 
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = make_soup(html_content)
 
     # Helper for section extraction
     def extract_section_by_keywords(soup, keywords, max_nodes=50):
@@ -136,7 +137,7 @@ if not os.path.exists(HTML_DIR):
     st.stop()
 
 # List HTML files
-html_files = [f for f in os.listdir(HTML_DIR) if f.endswith(".html")]
+html_files = list_html(HTML_DIR)
 
 if not html_files:
     st.info("No HTML files found in scraped_html/. Scrape something first.")
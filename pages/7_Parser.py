@@ -82,13 +82,15 @@ import json
 import pandas as pd
 from datetime import datetime
 
+from core.html_store import list_html
+from core.metadata_store import get_metadata_store
+
 
 # ===========================================
 # Paths
 # ===========================================
 HTML_DIR = "scraped_html"
 PARSER_DIR = "parsers"
-PARSER_LOG_FILE = "parser_run_log.json"
 
 
 # ===========================================
@@ -102,19 +104,8 @@ os.makedirs(PARSER_DIR, exist_ok=True)
 # Save parser logs
 # ===========================================
 def save_parser_run_log(entry):
-    if os.path.exists(PARSER_LOG_FILE):
-        try:
-            logs = json.load(open(PARSER_LOG_FILE, "r"))
-        except:
-            logs = []
-    else:
-        logs = []
-
-    logs.append(entry)
-
-    with open(PARSER_LOG_FILE, "w") as f:
-        json.dump(logs, f, indent=4)
-
+    # parser_runs table in core.metadata_store (parser_run_log.json is imported once)
+    get_metadata_store().add_parser_runs([entry])
     return True
 
 
@@ -145,7 +136,7 @@ with tab_run:
     parser_choice = st.selectbox("Choose parser script:", parser_files)
 
     # ------------------ Load HTML files ----------------------
-    html_files = [f for f in os.listdir(HTML_DIR) if f.endswith(".html")]
+    html_files = list_html(HTML_DIR)
 
     if not html_files:
         st.warning("⚠ No HTML files found in /scraped_html/")
@@ -205,14 +196,10 @@ with tab_logs:
 
     st.header("📊 Parser Run Logs & Analytics")
 
-    if not os.path.exists(PARSER_LOG_FILE):
-        st.info("No logs yet. Run a parser first.")
-        st.stop()
-
-    logs = json.load(open(PARSER_LOG_FILE, "r"))
+    logs = get_metadata_store().parser_runs()
 
     if len(logs) == 0:
-        st.info("Log file is empty.")
+        st.info("No logs yet. Run a parser first.")
         st.stop()
 
     df = pd.DataFrame(logs)
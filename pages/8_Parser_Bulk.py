@@ -5,13 +5,17 @@ import json
 import pandas as pd
 from datetime import datetime
 
+from core.bulk_parse import run_bulk_parse
+from core.html_store import list_html, read_html
+from core.metadata_store import get_metadata_store
+from core.parse_manifest import parse_status, parser_code_hash, pending_html, record_parse
+
 
 # ===========================================
 # Paths
 # ===========================================
 HTML_DIR = "scraped_html"
 PARSER_DIR = "parsers"
-PARSER_LOG_FILE = "parser_run_log.json"
 
 
 # ===========================================
@@ -25,19 +29,8 @@ os.makedirs(PARSER_DIR, exist_ok=True)
 # Save parser logs
 # ===========================================
 def save_parser_run_log(entry):
-    if os.path.exists(PARSER_LOG_FILE):
-        try:
-            logs = json.load(open(PARSER_LOG_FILE, "r"))
-        except:
-            logs = []
-    else:
-        logs = []
-
-    logs.append(entry)
-
-    with open(PARSER_LOG_FILE, "w") as f:
-        json.dump(logs, f, indent=4)
-
+    # parser_runs table in core.metadata_store (parser_run_log.json is imported once)
+    get_metadata_store().add_parser_runs([entry])
     return True
 
 
@@ -78,7 +71,7 @@ with tab_run:
     )
 
     # Load HTML files
-    html_files = [f for f in os.listdir(HTML_DIR) if f.endswith(".html")]
+    html_files = list_html(HTML_DIR)
 
     if not html_files:
         st.warning("⚠ No HTML files found in /scraped_html/")
@@ -120,6 +113,7 @@ with tab_run:
         save_parser_run_log(log_entry)
 
         if success:
+            record_parse(module_name, parser_code_hash(module_name), html_path, output_json_path)
             st.success(f"✔ Parser succeeded! JSON saved to:\n {output_json_path}")
             st.subheader("Preview of Parsed Content")
             st.json(result[:50] if isinstance(result, list) else result)
@@ -152,14 +146,16 @@ with tab_bulk:
         key="bulk_html_choices"
     )
 
+    skip_parsed = st.checkbox(
+        "Skip files this version of the parser has already parsed", value=True, key="bulk_skip_parsed"
+    )
+
     if st.button("Run Bulk Parser", key="run_bulk_parser"):
 
         if len(html_choices) == 0:
             st.error("Please select at least one HTML file.")
             st.stop()
 
-        st.info(f"Running parser on {len(html_choices)} files...")
-
         module_name = parser_choice_bulk.replace(".py", "")
         module = importlib.import_module(f"{PARSER_DIR}.{module_name}")
 
@@ -167,29 +163,23 @@ with tab_bulk:
             st.error("❌ Parser missing: run_parser()")
             st.stop()
 
-        progress = st.progress(0)
-        results = []
-
-        for i, html_file in enumerate(html_choices):
-
-            html_path = os.path.join(HTML_DIR, html_file)
-            output_json_path = html_path.replace(".html", f"_{module_name}.json")
+        if skip_parsed:
+            # parse manifest: same page content and same parser code -> nothing to do
+            html_choices = pending_html(module_name, HTML_DIR, names=html_choices)
+            if len(html_choices) == 0:
+                st.info("This version of the parser has already parsed every selected file.")
+                st.stop()
 
-            success, result = module.run_parser(html_path, output_json_path)
-            items_extracted = len(result) if success and isinstance(result, list) else None
+        st.info(f"Running parser on {len(html_choices)} files...")
 
-            log_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "parser_name": module_name,
-                "status": "success" if success else "failed",
-                "html_file_path": html_path,
-                "output_json_path": output_json_path,
-                "items_extracted": items_extracted
-            }
-            save_parser_run_log(log_entry)
+        progress = st.progress(0)
 
-            results.append(log_entry)
-            progress.progress((i + 1) / len(html_choices))
+        # parser processes in parallel; entries reach parser_runs in batches
+        results = run_bulk_parse(
+            module_name,
+            [os.path.join(HTML_DIR, html_file) for html_file in html_choices],
+            on_result=lambda done, entries: progress.progress(done / len(html_choices))
+        )
 
         st.success("🎉 Bulk parsing complete!")
 
@@ -211,14 +201,10 @@ with tab_logs:
 
     st.header("📊 Parser Run Logs & Analytics")
 
-    if not os.path.exists(PARSER_LOG_FILE):
-        st.info("No logs yet.")
-        st.stop()
-
-    logs = json.load(open(PARSER_LOG_FILE, "r"))
+    logs = get_metadata_store().parser_runs()
 
     if len(logs) == 0:
-        st.info("Log file is empty.")
+        st.info("No logs yet.")
         st.stop()
 
     df = pd.DataFrame(logs)
@@ -256,21 +242,8 @@ with tab_manage:
 
     st.header("📂 Manage Parsed & Unparsed HTML Files")
 
-    all_files = os.listdir(HTML_DIR)
-    html_files = [f for f in all_files if f.endswith(".html")]
-    json_files = [f for f in all_files if f.endswith(".json")]
-
-    # Extract which html files have matching json
-    parsed_html = []
-    unparsed_html = []
-
-    for html in html_files:
-        base = html.replace(".html", "")
-        matched = [j for j in json_files if j.startswith(base)]
-        if matched:
-            parsed_html.append(html)
-        else:
-            unparsed_html.append(html)
+    # Parsed = some parser has a JSON for this page's content (core.parse_manifest)
+    parsed_html, unparsed_html = parse_status(HTML_DIR)
 
     # Date filter UI
     st.subheader("📅 Filter by Date")
@@ -321,8 +294,7 @@ with tab_manage:
     )
 
     if preview_target:
-        with open(os.path.join(HTML_DIR, preview_target), "r", encoding="utf-8") as f:
-            st.code(f.read()[:5000], language="html")
+        st.code(read_html(os.path.join(HTML_DIR, preview_target))[:5000], language="html")
 
 
 # ==========================================================
@@ -335,22 +307,8 @@ with tab_unparsed:
     # Load parser scripts (needed for bulk parsing)
     parser_files = [f for f in os.listdir(PARSER_DIR) if f.endswith(".py")]
 
-    # Load files
-    all_files = os.listdir(HTML_DIR)
-    html_files = [f for f in all_files if f.endswith(".html")]
-    json_files = [f for f in all_files if f.endswith(".json")]
-
-    # Determine which HTML files have a JSON match
-    parsed_html = []
-    unparsed_html = []
-
-    for html in html_files:
-        base = html.replace(".html", "")
-        matched_jsons = [j for j in json_files if j.startswith(base)]
-        if matched_jsons:
-            parsed_html.append(html)
-        else:
-            unparsed_html.append(html)
+    # Determine which HTML files have been parsed, from the parse manifest
+    parsed_html, unparsed_html = parse_status(HTML_DIR)
 
     # Helper: Extract datetime from filename
     def extract_datetime(fname):
@@ -408,8 +366,7 @@ with tab_unparsed:
     )
 
     if preview_target:
-        with open(os.path.join(HTML_DIR, preview_target), "r", encoding="utf-8") as f:
-            st.code(f.read()[:5000], language="html")
+        st.code(read_html(os.path.join(HTML_DIR, preview_target))[:5000], language="html")
 
     # ==========================
     # BULK PARSE UNPARSED FILES
@@ -422,48 +379,46 @@ with tab_unparsed:
         key="bulk_parser_for_unparsed"
     )
 
-    if st.button("▶ Run Bulk Parser for Unparsed HTML", key="run_bulk_parser_unparsed"):
+    module_name = (parser_choice_bulk_unparsed or "").replace(".py", "")
 
-        if len(unparsed_html) == 0:
-            st.info("There are no unparsed HTML files to process.")
-            st.stop()
+    # Parsed files (in the date filter) this version of the parser has not parsed:
+    # done by another parser, by older code of this one, or imported from disk
+    stale_html = pending_html(module_name, HTML_DIR, names=parsed_html) if module_name else []
+    reparse_stale = st.checkbox(
+        f"Also re-parse {len(stale_html)} already-parsed files this version of the parser has not parsed",
+        value=False,
+        key="bulk_reparse_stale"
+    )
+    to_parse = unparsed_html + (stale_html if reparse_stale else [])
 
-        st.warning(f"Running parser on {len(unparsed_html)} unparsed HTML files...")
+    st.caption(f"{len(unparsed_html)} unparsed + {len(to_parse) - len(unparsed_html)} re-parsed = {len(to_parse)} files")
+
+    if st.button("▶ Run Bulk Parser for Unparsed HTML", key="run_bulk_parser_unparsed"):
 
         # Load parser module dynamically
-        module_name = parser_choice_bulk_unparsed.replace(".py", "")
         module = importlib.import_module(f"{PARSER_DIR}.{module_name}")
 
         if not hasattr(module, "run_parser"):
             st.error("❌ Parser missing required function: run_parser()")
             st.stop()
 
-        progress = st.progress(0)
-        bulk_results = []
-
-        for i, html_file in enumerate(unparsed_html):
-
-            html_path = os.path.join(HTML_DIR, html_file)
-            output_json_path = html_path.replace(".html", f"_{module_name}.json")
-
-            # Execute parser
-            success, result = module.run_parser(html_path, output_json_path)
-            items_extracted = len(result) if success and isinstance(result, list) else None
+        if len(to_parse) == 0:
+            st.info("There are no unparsed HTML files to process.")
+            st.stop()
 
-            # Log entry
-            log_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "parser_name": module_name,
-                "status": "success" if success else "failed",
-                "html_file_path": html_path,
-                "output_json_path": output_json_path,
-                "items_extracted": items_extracted
-            }
+        st.warning(
+            f"Running parser on {len(unparsed_html)} unparsed HTML files"
+            f" and re-parsing {len(to_parse) - len(unparsed_html)} already-parsed files..."
+        )
 
-            save_parser_run_log(log_entry)
-            bulk_results.append(log_entry)
+        progress = st.progress(0)
 
-            progress.progress((i + 1) / len(unparsed_html))
+        # Execute parser over a process pool, logging as files finish
+        bulk_results = run_bulk_parse(
+            module_name,
+            [os.path.join(HTML_DIR, html_file) for html_file in to_parse],
+            on_result=lambda done, entries: progress.progress(done / len(to_parse))
+        )
 
         st.success("🎉 Finished bulk parsing all unparsed HTML files!")
 
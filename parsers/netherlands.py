@@ -1,6 +1,8 @@
 import os
 import json
-from bs4 import BeautifulSoup
+
+from core.html_store import read_html
+from core.soup import make_soup
 
 # Define the path to the HTML file
 HTML_FILE_PATH = os.path.join(
@@ -22,11 +24,10 @@ def parse_html_to_json(html_file_path, output_json_path):
     """
     try:
         # Read the HTML file
-        with open(html_file_path, "r", encoding="utf-8") as file:
-            html_content = file.read()
+        html_content = read_html(html_file_path)
 
         # Parse the HTML content using BeautifulSoup
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = make_soup(html_content)
 
         # Debug: Print the parsed HTML structure
         print("Parsed HTML content:")
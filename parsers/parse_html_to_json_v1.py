@@ -1,6 +1,7 @@
-import os
 import json
-from bs4 import BeautifulSoup
+
+from core.html_store import get_html_store, read_html
+from core.soup import make_soup
 
 
 def parse_html_to_json(html_file_path, output_json_path):
@@ -8,13 +9,12 @@ def parse_html_to_json(html_file_path, output_json_path):
     Minimal parser: extracts headings + paragraphs.
     """
 
-    if not os.path.exists(html_file_path):
+    if not get_html_store().exists(html_file_path):
         raise FileNotFoundError(f"HTML file not found: {html_file_path}")
 
-    with open(html_file_path, "r", encoding="utf-8") as f:
-        html = f.read()
+    html = read_html(html_file_path)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
 
     extracted = []
 
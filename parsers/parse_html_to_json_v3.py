@@ -1,6 +1,12 @@
-import os
 import json
-from bs4 import BeautifulSoup
+
+from core.html_store import get_html_store, read_html
+from core.soup import make_soup
+
+
+def extract_links(soup):
+    """Every href on the page, as written (relative links included)."""
+    return [a["href"] for a in soup.find_all("a", href=True)]
 
 
 def parse_html_to_json_v3(html_file_path, output_json_path):
@@ -15,13 +21,12 @@ def parse_html_to_json_v3(html_file_path, output_json_path):
     - Structured content (headings, paragraphs)
     """
 
-    if not os.path.exists(html_file_path):
+    if not get_html_store().exists(html_file_path):
         raise FileNotFoundError(f"HTML file not found: {html_file_path}")
 
-    with open(html_file_path, "r", encoding="utf-8") as f:
-        html = f.read()
+    html = read_html(html_file_path)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
 
     # Extract metadata
     metadata = {}
@@ -53,7 +58,7 @@ def parse_html_to_json_v3(html_file_path, output_json_path):
         "head_html": str(soup.head) if soup.head else None,
         "body_html": str(soup.body) if soup.body else None,
         "all_text": soup.get_text(" ", strip=True),
-        "links": [a["href"] for a in soup.find_all("a", href=True)],
+        "links": extract_links(soup),
         "images": [img["src"] for img in soup.find_all("img", src=True)],
         "structured_content": structured_content
     }
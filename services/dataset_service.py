@@ -1,35 +1,61 @@
+from config.settings import SETTINGS
 from services.storage_service import StorageService
-from core.merger import dedupe_by_key
+from core.merger import SeenKeys, dedupe_by_key
 
 class DatasetService:
-    def __init__(self):
-        self.storage = StorageService()
+    def __init__(self, storage=None, key="id"):
+        # key: field, tuple of fields or callable (see core.merger); records
+        # without it are deduplicated on their content
+        self.storage = storage or StorageService()
+        self.key = key
         self.records = self.storage.load()
 
+        # indexes kept in step with self.records
+        self._urls = {r.get("_source_url") for r in self.records if isinstance(r, dict)}
+        self._keys = SeenKeys(key)
+        self._keys.update(self.records)
+
+        self._pending = []  # merged, not yet written
+        self._appended = len(self.storage.load_segment())
+
     # ---------------------------------------------------------
     # CHECK IF URL ALREADY SCRAPED
     # ---------------------------------------------------------
     def has_url(self, url: str) -> bool:
         """Return True if the dataset already contains records from this URL."""
-        return any(
-            isinstance(r, dict) and r.get("_source_url") == url
-            for r in self.records
-        )
+        return url in self._urls
 
     # ---------------------------------------------------------
     # MERGE NEW SCRAPED DATA
+    # flush=False leaves the write to a later flush(), so a bulk
+    # submission costs one append instead of one write per URL.
     # ---------------------------------------------------------
-    def merge(self, new_data):
+    def merge(self, new_data, flush=True):
         if isinstance(new_data, dict):
             new_data = [new_data]
 
-        merged, added, deduped = dedupe_by_key(self.records, new_data)
+        fresh, added, deduped = dedupe_by_key([], new_data, self.key, seen=self._keys)
 
-        self.records = merged
-        self.storage.save(self.records)
+        self.records.extend(fresh)
+        self._urls.update(r.get("_source_url") for r in fresh)
+        self._pending.extend(fresh)
+        if flush:
+            self.flush()
 
         return {"added": added, "deduped": deduped}
 
+    def flush(self):
+        """Write pending records; folds dataset.jsonl into dataset.json now and then."""
+        if not self._pending:
+            return
+        self._appended += len(self._pending)
+        if self._appended >= SETTINGS["dataset_compact_every"]:
+            self.storage.save(self.records)
+            self._appended = 0
+        else:
+            self.storage.append(self._pending)
+        self._pending = []
+
     # ---------------------------------------------------------
     # GET ALL RECORDS
     # ---------------------------------------------------------
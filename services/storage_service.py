@@ -1,20 +1,23 @@
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 import re
 
 
 class StorageService:
-    def __init__(self):
+    def __init__(self, base_dir="data"):
         # Raw files saved here
-        self.raw_dir = Path("data/raw")
+        self.raw_dir = Path(base_dir) / "raw"
         self.raw_dir.mkdir(parents=True, exist_ok=True)
 
         # Dataset (merged records)
-        self.processed_dir = Path("data/processed")
+        self.processed_dir = Path(base_dir) / "processed"
         self.processed_dir.mkdir(parents=True, exist_ok=True)
 
         self.dataset_file = self.processed_dir / "dataset.json"
+        # records merged since dataset.json was last written, one JSON per line
+        self.segment_file = self.processed_dir / "dataset.jsonl"
 
     # ------------------------------
     # Save SCRAPED RESULT file
@@ -31,19 +34,59 @@ class StorageService:
         filepath.write_text(json.dumps(data, indent=2))
         return str(filepath)
 
+    def save_processed(self, name: str, records):
+        """Write records to data/processed/<name>."""
+        filepath = self.processed_dir / name
+        filepath.write_text(json.dumps(records, indent=2))
+        return str(filepath)
+
+    def load_processed(self, name: str):
+        filepath = self.processed_dir / name
+        if not filepath.exists():
+            return []
+        return json.loads(filepath.read_text())
+
     # ------------------------------
     # Dataset operations
+    # dataset.json is the last full snapshot; merges in between are
+    # appended to dataset.jsonl, so adding records never rewrites the
+    # whole dataset. save() folds the segment back into the snapshot.
     # ------------------------------
     def load(self):
         """Load merged dataset records."""
-        if not self.dataset_file.exists():
-            return []
-        return json.loads(self.dataset_file.read_text())
+        records = json.loads(self.dataset_file.read_text()) if self.dataset_file.exists() else []
+        return records + self.load_segment()
+
+    def load_segment(self):
+        records = []
+        if self.segment_file.exists():
+            with open(self.segment_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn line from an interrupted append
+        return records
+
+    def append(self, records):
+        """Add records to the dataset with one append to dataset.jsonl."""
+        if not records:
+            return
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with open(self.segment_file, "a+b") as f:
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines = "\n" + lines  # keep a torn last line from swallowing ours
+            f.write(lines.encode("utf-8"))
 
     def save(self, records):
         """Save merged dataset records."""
-        self.dataset_file.write_text(json.dumps(records, indent=2))
-
+        tmp = self.dataset_file.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(records, indent=2))
+        os.replace(tmp, self.dataset_file)
+        if self.segment_file.exists():
+            self.segment_file.unlink()  # its records are in the snapshot now
 
 
 # import json
@@ -0,0 +1,49 @@
+# tests/bench_split_sections.py
+# Section extraction on the saved pages: the per-<h2> find_all_next()
+# version against the single-pass split_sections().
+#
+#     python -m tests.bench_split_sections [folder ...]
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from core.scraper import extract_section_content, split_sections
+
+
+def per_section(soup):
+    return [{"header": h2.get_text(strip=True), "content": extract_section_content(h2)} for h2 in soup.find_all("h2")]
+
+
+def best_of(fn, soup, runs=3):
+    best = None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn(soup)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(folders):
+    pages = sorted(p for folder in folders for p in Path(folder).rglob("*.html"))
+    total_old = total_new = 0.0
+    rows = []
+    for page in pages:
+        soup = BeautifulSoup(page.read_text(encoding="utf-8", errors="replace"), "html.parser")
+        old_s, old = best_of(per_section, soup)
+        new_s, new = best_of(split_sections, soup)
+        if old != new:
+            raise SystemExit(f"output differs for {page}")
+        total_old += old_s
+        total_new += new_s
+        rows.append((old_s, new_s, len(new), page))
+
+    for old_s, new_s, n_sections, page in sorted(rows, key=lambda r: r[0], reverse=True)[:10]:
+        print(f"{old_s * 1000:8.1f} ms -> {new_s * 1000:7.1f} ms  {n_sections:3d} sections  {page}")
+    print(f"{len(pages)} pages: {total_old:.3f}s -> {total_new:.3f}s ({total_old / total_new:.1f}x), identical sections")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["scraped_html"])
@@ -0,0 +1,52 @@
+# tests/conftest.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        code = 200 if self.path.startswith("/ok") else 503 if self.path.startswith("/busy") else 404
+        body = f"<html><h1>{self.path}</h1></html>".encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Serve 200 for /ok... paths, 503 for /busy... and 404 for everything else; yields the base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def html_store(tmp_path, monkeypatch):
+    """Keep the process-wide HTML store out of the real data/ directory."""
+    from core.html_store import HtmlStore
+
+    store = HtmlStore(root=tmp_path / "html_store")
+    monkeypatch.setattr("core.html_store._store", store)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def metadata_store(tmp_path, monkeypatch):
+    """Same for the metadata store the scrape log mirrors into."""
+    from core.metadata_store import MetadataStore
+
+    store = MetadataStore(tmp_path / "metadata.sqlite")
+    monkeypatch.setattr("core.metadata_store._store", store)
+    return store
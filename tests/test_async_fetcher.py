@@ -0,0 +1,47 @@
+# tests/test_async_fetcher.py
+import threading
+import time
+
+from core.async_fetcher import run_fetch_many
+from core.rate_limiter import HostRateLimiter
+
+
+def test_fetch_many(local_server):
+    urls = [f"{local_server}/ok/{i}" for i in range(20)] + [f"{local_server}/missing"]
+    results = {}
+    limiter = HostRateLimiter(qps=1000, burst=100)
+    run_fetch_many(urls, lambda u, r: results.__setitem__(u, r), concurrency=5, limiter=limiter)
+
+    assert len(results) == len(urls)
+    assert results[f"{local_server}/missing"]["status"] == "failed"
+    assert results[f"{local_server}/missing"]["error"] == "HTTP 404"
+    assert results[f"{local_server}/ok/3"]["status"] == "success"
+    assert "/ok/3" in results[f"{local_server}/ok/3"]["html"]
+
+
+def test_fetch_many_respects_host_rate(local_server):
+    limiter = HostRateLimiter(qps=20, burst=1)
+    done = []
+    run_fetch_many([f"{local_server}/ok/{i}" for i in range(6)], lambda u, r: done.append(time.monotonic()), concurrency=6, limiter=limiter)
+
+    assert len(done) == 6
+    assert done[-1] - done[0] >= 0.2
+
+
+def test_fetch_many_reports_errors_and_saves_off_the_loop(local_server):
+    limiter = HostRateLimiter(qps=1000, burst=100)
+    results = {}
+    loop_thread = []
+
+    def save(url, res):
+        return {"status": "success", "saved_in": threading.get_ident()}
+
+    def on_result(url, res):
+        loop_thread.append(threading.get_ident())
+        results[url] = res
+
+    urls = [f"{local_server}/ok/1", "http://127.0.0.1:9/refused"]
+    run_fetch_many(urls, on_result, concurrency=2, limiter=limiter, save=save)
+
+    assert results[urls[0]]["saved_in"] != loop_thread[0]
+    assert results[urls[1]]["status"] == "failed" and results[urls[1]]["error"]
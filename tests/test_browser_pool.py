@@ -0,0 +1,97 @@
+# tests/test_browser_pool.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from core.browser_pool import BrowserPool
+
+
+class _FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def goto(self, url, **kwargs):
+        self.browser.open_pages += 1
+        self.browser.peak_pages = max(self.browser.peak_pages, self.browser.open_pages)
+        await asyncio.sleep(0.01)
+        self.browser.open_pages -= 1
+        if "crash" in url and url not in self.browser.chromium.crashed:
+            self.browser.chromium.crashed.add(url)
+            self.browser.alive = False
+            raise RuntimeError("Target closed")
+        self.url = url
+
+    async def content(self):
+        return f"<html>{self.url}</html>"
+
+    async def title(self):
+        return self.url
+
+
+class _FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        return _FakePage(self.browser)
+
+    async def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def __init__(self, chromium):
+        self.chromium = chromium
+        self.alive = True
+        self.open_pages = 0
+        self.peak_pages = 0
+
+    def is_connected(self):
+        return self.alive
+
+    async def new_context(self):
+        return _FakeContext(self)
+
+    async def close(self):
+        self.alive = False
+
+
+class _FakeChromium:
+    def __init__(self):
+        self.crashed = set()
+        self.browsers = []
+
+    async def launch(self, headless=True):
+        self.browsers.append(_FakeBrowser(self))
+        return self.browsers[-1]
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.chromium = _FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+def test_pool_reuses_browser_and_bounds_pages():
+    pool = BrowserPool(max_pages=2)
+    pool._playwright = fake = _FakePlaywright()
+
+    with ThreadPoolExecutor(max_workers=6) as exe:
+        results = list(exe.map(pool.render, [f"https://x.test/{i}" for i in range(12)]))
+
+    assert results[5] == {"html": "<html>https://x.test/5</html>", "title": "https://x.test/5"}
+    assert pool.stats["launches"] == 1
+    assert fake.chromium.browsers[0].peak_pages <= 2
+    pool.close()
+
+
+def test_pool_relaunches_crashed_browser():
+    pool = BrowserPool(max_pages=1)
+    pool._playwright = fake = _FakePlaywright()
+
+    assert pool.render("https://x.test/crash")["title"] == "https://x.test/crash"
+    assert pool.render("https://x.test/after")["title"] == "https://x.test/after"
+    assert pool.stats == {"renders": 2, "launches": 2, "crashes": 1}
+    assert len(fake.chromium.browsers) == 2
+    pool.close()
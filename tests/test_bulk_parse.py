@@ -0,0 +1,84 @@
+# tests/test_bulk_parse.py
+import textwrap
+
+import pytest
+
+from core.bulk_parse import parse_chunk, run_bulk_parse
+from core.metadata_store import get_metadata_store
+
+# stands in for a parsers/ module; crash.html kills the worker process
+# outright, slow.html hangs and bad.html is reported as failed
+FAKE_PARSER = textwrap.dedent("""
+    import json
+    import os
+    import time
+
+    def run_parser(html_file_path, output_json_path):
+        name = os.path.basename(html_file_path)
+        if name == "crash.html":
+            os._exit(1)
+        if name == "slow.html":
+            time.sleep(30)
+        if name == "bad.html":
+            return False, {"status": "failed"}
+        data = [{"type": "paragraph", "content": html_file_path}]
+        with open(output_json_path, "w") as f:
+            json.dump(data, f)
+        return True, data
+""")
+
+
+@pytest.fixture
+def fake_parsers(tmp_path, monkeypatch):
+    package = tmp_path / "fake_parsers"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "fake.py").write_text(FAKE_PARSER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return tmp_path
+
+
+def _run(paths, **options):
+    seen = []
+    results = run_bulk_parse(
+        "fake", paths, on_result=lambda done, entries: seen.append((done, len(entries))),
+        package="fake_parsers", **options
+    )
+    return results, seen
+
+
+def test_files_are_parsed_in_chunks_and_logged_in_batches(fake_parsers):
+    paths = [str(fake_parsers / f"page{i}.html") for i in range(20)] + [str(fake_parsers / "bad.html")]
+
+    results, seen = _run(paths, workers=2, chunk_files=3, log_batch=4)
+
+    assert sorted(r["html_file_path"] for r in results) == sorted(paths)
+    by_path = {r["html_file_path"]: r for r in results}
+    assert by_path[paths[0]]["status"] == "success"
+    assert by_path[paths[0]]["items_extracted"] == 1
+    assert by_path[paths[0]]["output_json_path"].endswith("page0_fake.json")
+    assert (fake_parsers / "page0_fake.json").exists()
+    assert by_path[paths[-1]]["status"] == "failed"
+    assert len(seen) > 1 and max(n for _, n in seen) <= 3
+    assert seen[-1][0] == len(paths)
+    assert len(get_metadata_store().parser_runs()) == len(paths)
+
+
+def test_a_crashing_worker_loses_only_its_own_file(fake_parsers):
+    paths = [str(fake_parsers / f"page{i}.html") for i in range(8)]
+    paths.insert(3, str(fake_parsers / "crash.html"))
+
+    results, seen = _run(paths, workers=2, chunk_files=2)
+
+    by_path = {r["html_file_path"]: r for r in results}
+    assert len(results) == len(paths) == seen[-1][0]
+    assert by_path[paths[3]] == {**by_path[paths[3]], "status": "failed", "error": "parser process crashed"}
+    assert all(by_path[p]["status"] == "success" for p in paths if "crash" not in p)
+
+
+def test_slow_file_times_out(fake_parsers):
+    entries = parse_chunk(
+        "fake", [str(fake_parsers / "slow.html"), str(fake_parsers / "ok.html")], timeout=0.2, package="fake_parsers"
+    )
+    assert [e["status"] for e in entries] == ["failed", "success"]
+    assert entries[0]["error"] == "timed out after 0.2s"
@@ -0,0 +1,146 @@
+# tests/test_cascade.py
+import asyncio
+import threading
+
+from config.settings import SETTINGS
+from core.cascade import LayerStats, _race_budget, run_cascade
+
+
+def _layers(calls):
+    def failing(url):
+        calls.append("requests")
+        return None
+
+    def working(url):
+        calls.append("playwright")
+        return {"method": "Playwright", "html": "<html></html>"}
+
+    return [("requests", failing), ("playwright", working)]
+
+
+def test_learns_best_layer_per_domain(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.cascade.random.random", lambda: 1.0)  # no exploration
+    stats = LayerStats(path=tmp_path / "layer_stats.json")
+
+    calls = []
+    name, res = run_cascade("https://spa.example/a", _layers(calls), stats=stats)
+    assert name == "playwright" and res["html"]
+    assert calls == ["requests", "playwright"]
+
+    calls.clear()
+    run_cascade("https://spa.example/b", _layers(calls), stats=stats)
+    assert calls == ["playwright"]
+
+    # other domains keep the default order
+    assert stats.order("other.example", ["requests", "playwright"]) == ["requests", "playwright"]
+
+
+def test_stats_persist_across_instances(tmp_path):
+    path = tmp_path / "layer_stats.json"
+    stats = LayerStats(path=path)
+    stats.record("spa.example", "requests", False, 10.0)
+    stats.record("spa.example", "playwright", True, 2.0)
+    stats.flush()
+
+    reloaded = LayerStats(path=path)
+    assert reloaded.order("spa.example", ["requests", "playwright"], explore=0) == ["playwright", "requests"]
+
+
+def test_exploration_moves_another_layer_first(tmp_path, monkeypatch):
+    stats = LayerStats(path=tmp_path / "layer_stats.json")
+    stats.record("spa.example", "playwright", True, 2.0)
+    monkeypatch.setattr("core.cascade.random.random", lambda: 0.0)
+
+    assert stats.order("spa.example", ["requests", "playwright"], explore=0.1)[0] == "requests"
+
+
+def test_race_first_accepted_result_wins_and_loser_is_cancelled(tmp_path):
+    stats = LayerStats(path=tmp_path / "layer_stats.json")
+    cancelled = []
+
+    def static(url):
+        return {"html": "<html>shell</html>", "has_content": False}
+
+    async def rendered(url):
+        await asyncio.sleep(0.05)
+        return {"html": "<h1>ok</h1>", "has_content": True}
+
+    async def slow(url):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    name, res = run_cascade(
+        "https://spa.example/a",
+        [],
+        stats=stats,
+        racers=[("requests", static), ("playwright", rendered), ("slow", slow)],
+        accept=lambda r: r["has_content"],
+    )
+    assert name == "playwright" and res["has_content"]
+    assert cancelled == ["https://spa.example/a"]
+    assert stats.hosts["spa.example"]["requests"]["tries"] == 1
+
+
+def test_race_over_budget_uses_plain_cascade(tmp_path, monkeypatch):
+    monkeypatch.setitem(SETTINGS, "race_per_host", 0)
+    monkeypatch.setattr("core.cascade.random.random", lambda: 1.0)
+    stats = LayerStats(path=tmp_path / "layer_stats.json")
+    calls = []
+
+    name, _ = run_cascade(
+        "https://spa.example/a",
+        _layers(calls),
+        stats=stats,
+        racers=[("boom", lambda u: 1 / 0), ("boom2", lambda u: 1 / 0)],
+    )
+    assert name == "playwright"
+    assert calls == ["requests", "playwright"]
+    assert "boom" not in stats.hosts["spa.example"]
+
+
+def test_race_without_accepted_result_keeps_first_page(tmp_path):
+    stats = LayerStats(path=tmp_path / "layer_stats.json")
+
+    name, res = run_cascade(
+        "https://static.example/a",
+        [],
+        stats=stats,
+        racers=[("requests", lambda u: {"html": "<p>plain</p>"}), ("playwright", lambda u: None)],
+        accept=lambda r: False,
+    )
+    assert name == "requests" and res["html"] == "<p>plain</p>"
+
+
+def test_race_slot_held_until_thread_racer_finishes(tmp_path, monkeypatch):
+    monkeypatch.setitem(SETTINGS, "race_per_host", 1)
+    stats = LayerStats(path=tmp_path / "layer_stats.json")
+    finish = threading.Event()
+    finished = threading.Event()
+
+    def slow_static(url):
+        finish.wait(5)
+        finished.set()
+        return None
+
+    async def rendered(url):
+        return {"html": "<h1>ok</h1>"}
+
+    racers = [("requests", slow_static), ("playwright", rendered)]
+    name, _ = run_cascade("https://held.example/a", [], stats=stats, racers=racers)
+    assert name == "playwright"
+
+    # the losing thread still runs: the next URL for the host may not race
+    assert not _race_budget.take("held.example")
+
+    finish.set()
+    finished.wait(5)
+    for _ in range(100):
+        if _race_budget.take("held.example"):
+            break
+        threading.Event().wait(0.01)
+    else:
+        raise AssertionError("race slot was not released")
+    _race_budget.release("held.example")
@@ -0,0 +1,59 @@
+# tests/test_circuit_breaker.py
+import time
+
+import pytest
+import requests
+
+from core.circuit_breaker import CircuitBreakers, CircuitOpenError
+
+URL = "https://down.example/job/1"
+
+
+def _fail(breakers, exc=requests.exceptions.ConnectionError("refused")):
+    with pytest.raises(type(exc)):
+        with breakers.guard(URL):
+            raise exc
+
+
+def test_opens_after_repeated_host_failures_and_fails_fast():
+    breakers = CircuitBreakers(failures=3, cooldown=60)
+    for _ in range(3):
+        _fail(breakers)
+
+    assert breakers.is_open(URL)
+    with pytest.raises(CircuitOpenError):
+        with breakers.guard(URL):
+            pytest.fail("call should not run while the circuit is open")
+    assert not breakers.is_open("https://up.example/")
+    assert breakers.snapshot()[0]["fast_failed_calls"] == 1
+
+
+def test_page_errors_do_not_count():
+    breakers = CircuitBreakers(failures=2, cooldown=60)
+    for _ in range(5):
+        _fail(breakers, ValueError("bad json"))
+    assert not breakers.is_open(URL)
+
+
+def test_half_open_probe_closes_or_reopens():
+    breakers = CircuitBreakers(failures=1, cooldown=0.05)
+    _fail(breakers)
+    time.sleep(0.06)
+
+    # one probe goes through; a failing probe re-opens the breaker
+    _fail(breakers)
+    assert breakers.is_open(URL)
+
+    time.sleep(0.06)
+    with breakers.guard(URL) as call:
+        assert not breakers.allow(URL)  # only one probe at a time
+    assert call.ok
+    assert not breakers.is_open(URL)
+
+
+def test_failed_status_counts_as_failure():
+    breakers = CircuitBreakers(failures=2, cooldown=60)
+    for _ in range(2):
+        with breakers.guard(URL) as call:
+            call.failed()
+    assert breakers.is_open(URL)
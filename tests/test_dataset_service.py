@@ -0,0 +1,49 @@
+# tests/test_dataset_service.py
+import json
+
+from config.settings import SETTINGS
+from services.dataset_service import DatasetService
+from services.storage_service import StorageService
+
+
+def test_merges_are_appended_and_reloaded(tmp_path):
+    storage = StorageService(base_dir=tmp_path)
+    storage.save([{"id": "1", "_source_url": "https://a.test/1"}])
+
+    dataset = DatasetService(storage)
+    for i in range(2, 5):
+        dataset.merge({"id": str(i), "_source_url": f"https://a.test/{i}"}, flush=False)
+    dataset.merge({"id": "2", "_source_url": "https://a.test/2-again"}, flush=False)
+
+    assert dataset.has_url("https://a.test/3")  # indexed before the flush
+    assert not storage.segment_file.exists()
+    dataset.flush()
+
+    assert len(json.loads(storage.dataset_file.read_text())) == 1  # snapshot untouched
+    reloaded = DatasetService(StorageService(base_dir=tmp_path))
+    assert [r["id"] for r in reloaded.get()] == ["1", "2", "3", "4"]
+    assert reloaded.has_url("https://a.test/1") and not reloaded.has_url("https://a.test/2-again")
+    assert reloaded.merge({"id": "4"}) == {"added": 0, "deduped": 1}
+
+
+def test_segment_is_folded_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setitem(SETTINGS, "dataset_compact_every", 3)
+    storage = StorageService(base_dir=tmp_path)
+    dataset = DatasetService(storage)
+
+    dataset.merge([{"id": "1"}, {"id": "2"}])
+    assert storage.segment_file.exists()
+    dataset.merge({"id": "3"})
+
+    assert not storage.segment_file.exists()
+    assert [r["id"] for r in json.loads(storage.dataset_file.read_text())] == ["1", "2", "3"]
+
+
+def test_torn_segment_line_is_skipped(tmp_path):
+    storage = StorageService(base_dir=tmp_path)
+    storage.append([{"id": "1"}])
+    with open(storage.segment_file, "a", encoding="utf-8") as f:
+        f.write('{"id": "2", "tor')  # interrupted append
+    storage.append([{"id": "3"}])
+
+    assert [r["id"] for r in storage.load()] == ["1", "3"]
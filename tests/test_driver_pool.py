@@ -0,0 +1,79 @@
+# tests/test_driver_pool.py
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.driver_pool import DriverPool
+
+
+class _FakeDriver:
+    created = []
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.page_source = ""
+        _FakeDriver.created.append(self)
+
+    def get(self, url):
+        if "crash" in url:
+            self.alive = False
+            raise RuntimeError("chrome not reachable")
+        self.page_source = f"<html>{url}</html>"
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("invalid session id")
+        return 1
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def _reset_fakes():
+    _FakeDriver.created = []
+
+
+def _load(pool, url):
+    with pool.driver() as driver:
+        driver.get(url)
+        return driver.page_source
+
+
+def test_drivers_are_reused_and_bounded():
+    pool = DriverPool(size=2, max_pages=1000, factory=_FakeDriver)
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        pages = list(ex.map(lambda i: _load(pool, f"http://x/{i}"), range(40)))
+
+    assert pages[5] == "<html>http://x/5</html>"
+    assert len(_FakeDriver.created) <= 2
+    assert pool.stats["pages"] == 40
+
+
+def test_recycles_after_max_pages_and_on_crash():
+    pool = DriverPool(size=1, max_pages=3, factory=_FakeDriver)
+    for i in range(3):
+        _load(pool, f"http://x/{i}")
+    assert pool.stats["recycled"] == 1
+    assert _FakeDriver.created[0].quit_called
+
+    with pytest.raises(RuntimeError):
+        _load(pool, "http://x/crash")
+    assert pool.stats["crashed"] == 1
+
+    assert _load(pool, "http://x/after") == "<html>http://x/after</html>"
+    assert len(_FakeDriver.created) == 3
+
+
+def test_dead_idle_driver_is_replaced():
+    pool = DriverPool(size=1, max_pages=10, factory=_FakeDriver)
+    _load(pool, "http://x/1")
+    _FakeDriver.created[0].alive = False
+
+    _load(pool, "http://x/2")
+    assert len(_FakeDriver.created) == 2
+    assert _FakeDriver.created[0].quit_called
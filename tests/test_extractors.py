@@ -0,0 +1,62 @@
+# tests/test_extractors.py
+import pytest
+
+from core.extractors import EXTRACTORS, Extractor, extract_html, run_extractors
+from core.soup import make_soup
+
+PAGE = """
+<h1>Marketing intern</h1>
+<p>Intro</p>
+<h2>Main activities</h2>
+<ul><li>Plan campaigns</li><li></li></ul>
+<p>Report weekly</p>
+<h3>Preferred skills</h3>
+<div>Excel</div><span></span><p><a href="/apply">Apply</a></p>
+<h3>Eligibility</h3>
+<p>Age 18-30</p>
+<a href="#top"></a>
+"""
+
+
+def test_all_types_from_one_parse():
+    out = extract_html(PAGE, list(EXTRACTORS))
+
+    assert out["type_1"] == [
+        {"type": "paragraph", "content": "Intro"},
+        {"type": "paragraph", "content": "Report weekly"},
+        {"type": "paragraph", "content": "Apply"},
+        {"type": "paragraph", "content": "Age 18-30"},
+        {"type": "heading", "level": "h1", "content": "Marketing intern"},
+        {"type": "heading", "level": "h2", "content": "Main activities"},
+        {"type": "heading", "level": "h3", "content": "Preferred skills"},
+        {"type": "heading", "level": "h3", "content": "Eligibility"},
+    ]
+    assert out["type_2"] == [
+        {"type": "link", "href": "/apply", "content": "Apply"},
+        {"type": "link", "href": "#top", "content": ""},
+        {"type": "list_item", "content": "Plan campaigns"},
+    ]
+    assert [i["content"] for i in out["type_3_job_description"]] == ["Report weekly"]  # the <ul> itself is not an item
+    assert out["type_4_skills"] == [
+        {"type": "skill", "section_heading": "Preferred skills", "content": "Excel"},
+        {"type": "skill", "section_heading": "Preferred skills", "content": "Apply"},
+    ]
+    assert [i["content"] for i in out["type_5_eligibility"]] == ["Age 18-30"]
+
+
+def test_only_requested_extractors_run():
+    soup = make_soup(PAGE)
+    assert run_extractors(soup, ["type_4_skills"]).keys() == {"type_4_skills"}
+    assert run_extractors(soup, []) == {}
+    assert extract_html(PAGE, ["type_1"])["type_1"] == run_extractors(soup, list(EXTRACTORS))["type_1"]
+
+
+def test_extractor_must_implement_visit_and_result():
+    class Incomplete(Extractor):
+        tags = ("p",)
+
+        def visit(self, tag, doc):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,43 @@
+# tests/test_html_store.py
+import hashlib
+import os
+
+from core.html_store import HtmlStore
+
+
+def _blob_files(root):
+    return [f for _, _, files in os.walk(root) for f in files if not f.startswith("index.sqlite")]
+
+
+def test_unchanged_pages_share_one_blob(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = HtmlStore(root=tmp_path / "store")
+    html = "<html><h1>Job</h1></html>"
+
+    first = store.save(html, "scraped_html/a.html", url="https://a.org/1")
+    second = store.save(html, "scraped_html/b.html", url="https://a.org/1")
+
+    assert store.read(first) == store.read(second) == html
+    assert store.blob_of(first) == hashlib.sha256(html.encode("utf-8")).hexdigest()
+    assert len(_blob_files(tmp_path / "store")) == 1
+    assert store.stats()["deduplicated"] == 1
+    assert store.latest_for("https://a.org/1")["name"] == second
+    assert store.list_names("scraped_html") == ["a.html", "b.html"]
+
+
+def test_legacy_files_are_read_and_imported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("scraped_html")
+    with open("scraped_html/old.html", "w", encoding="utf-8") as f:
+        f.write("<html>old</html>")
+    store = HtmlStore(root=tmp_path / "store")
+
+    path = os.path.join("scraped_html", "old.html")
+    assert store.exists(path) and store.read(path) == "<html>old</html>"
+
+    assert store.import_folder("scraped_html") == 1
+    assert not os.path.exists(path)
+    assert store.read(path) == "<html>old</html>"
+    assert store.list_names("scraped_html") == ["old.html"]
+    # the index survives a restart
+    assert HtmlStore(root=tmp_path / "store").read(path) == "<html>old</html>"
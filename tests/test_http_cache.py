@@ -0,0 +1,46 @@
+# tests/test_http_cache.py
+from core.http_cache import RevalidationCache
+
+
+class _Resp:
+    def __init__(self, status_code, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+class _Session:
+    """Answers 304 whenever the request carries a validator."""
+
+    def __init__(self):
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent.append(headers)
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return _Resp(304)
+        return _Resp(200, {"ETag": '"v1"'}, "<html>fresh</html>")
+
+
+def test_revalidation_reuses_saved_file(tmp_path):
+    cache = RevalidationCache(path=str(tmp_path / "cache.json"))
+    session = _Session()
+    url = "https://example.com/page"
+
+    resp, cached = cache.get(session, url)
+    assert resp.status_code == 200 and cached is None
+    saved = tmp_path / "page.html"
+    saved.write_text(resp.text)
+    cache.remember(url, resp.headers["ETag"], None, str(saved))
+
+    resp, cached = cache.get(session, url)
+    assert session.sent[-1] == {"If-None-Match": '"v1"'}
+    assert cached == {"html": "<html>fresh</html>", "html_path": str(saved)}
+
+    stats = cache.stats()
+    assert stats["requests"] == 2
+    assert stats["hits"] == 1
+    assert stats["revalidation_rate"] == 0.5
+
+    cache.flush()
+    assert RevalidationCache(path=str(tmp_path / "cache.json")).entries[url]["etag"] == '"v1"'
@@ -0,0 +1,34 @@
+# tests/test_http_pool.py
+from config.settings import SETTINGS
+from core.http_pool import get_session, pool_stats, reset_session
+from core.rate_limiter import HostRateLimiter
+
+
+def test_connections_are_reused(local_server):
+    reset_session()
+    assert get_session() is get_session()
+
+    for i in range(5):
+        assert get_session().get(f"{local_server}/ok/{i}", timeout=5).status_code == 200
+
+    stats = pool_stats()
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["reuse_ratio"] == 0.8
+    assert stats["open_sockets"] == 1
+    reset_session()
+
+
+def test_5xx_retries_are_paced_and_reach_the_limiter(local_server, monkeypatch):
+    limiter = HostRateLimiter(qps=1000, burst=10)
+    monkeypatch.setattr("core.rate_limiter._limiter", limiter)
+    monkeypatch.setitem(SETTINGS, "http_retries", 2)
+    monkeypatch.setitem(SETTINGS, "http_retry_backoff", 0)
+    reset_session()
+
+    resp = get_session().get(f"{local_server}/busy", timeout=5)
+
+    assert resp.status_code == 503  # returned, not raised, once retries run out
+    assert pool_stats()["requests"] == 3
+    assert limiter.snapshot()[0]["qps"] == 1000 / 2 ** 3  # every attempt was fed back
+    reset_session()
@@ -1,5 +1,5 @@
 # tests/test_merge.py
-from core.merger import dedupe_by_key
+from core.merger import SeenKeys, dedupe_by_key, dedupe_stream
 
 
 def test_dedupe():
@@ -7,4 +7,30 @@ def test_dedupe():
     new = [{"id": "1", "x": 1}, {"id": "2", "x": 2}]
     merged, added, deduped = dedupe_by_key(existing, new, "id")
     assert added == 1
-    assert deduped == 1
\ No newline at end of file
+    assert deduped == 1
+
+
+def test_records_without_key_are_deduped_on_content():
+    existing = [{"title": "Intern  in Delft", "tags": ["a"], "_source_url": "https://a.test/1"}]
+    new = [
+        {"tags": ["a"], "title": "Intern in Delft", "_source_url": "https://a.test/2"},
+        {"title": "Intern in Leiden"},
+    ]
+    merged, added, deduped = dedupe_by_key(existing, new)
+    assert (added, deduped) == (1, 1)
+    assert merged[-1]["title"] == "Intern in Leiden"
+
+
+def test_composite_and_callable_keys():
+    new = [{"site": "a", "slug": "x"}, {"site": "b", "slug": "x"}, {"site": "a", "slug": "x", "v": 2}]
+    assert dedupe_by_key([], new, key=("site", "slug"))[1:] == (2, 1)
+    assert dedupe_by_key([], new, key=lambda r: r["slug"])[1:] == (1, 2)
+
+
+def test_seen_keys_spill_to_disk():
+    seen = SeenKeys(max_memory=100)
+    records = [{"id": str(i)} for i in range(250)]
+
+    assert list(dedupe_stream(records + records[:10], seen)) == records
+    assert len(seen) == 250 and len(seen._memory) < 100
+    assert {"id": "3"} in seen and {"id": "250"} not in seen
@@ -0,0 +1,88 @@
+# tests/test_metadata_store.py
+import json
+
+from core.metadata_store import MetadataStore
+from core.scrape_log import ScrapeLog
+
+
+def _entry(url, ts, html_hash=None, batch_id=None):
+    return {"timestamp": ts, "batch_id": batch_id, "url": url, "status": "success", "html_hash": html_hash}
+
+
+def test_latest_scrape_and_hash_lookups(tmp_path):
+    store = MetadataStore(tmp_path / "meta.sqlite")
+    store.add_scrapes([
+        _entry("https://a.test/", "2025-01-01T00:00:00", "h1"),
+        _entry("https://a.test/", "2025-03-01T00:00:00", "h2"),
+        _entry("https://b.test/", "2025-02-01T00:00:00", "h1"),
+    ])
+
+    assert store.latest_scrape("https://a.test/")["html_hash"] == "h2"
+    assert store.latest_scrape("https://c.test/") is None
+    assert store.find_hash("h1")["url"] == "https://a.test/"
+    assert store.find_hash("h3") is None
+
+    plan = store._query("EXPLAIN QUERY PLAN SELECT entry FROM scrapes WHERE url = ? ORDER BY timestamp DESC LIMIT 1", ("x",))
+    assert "USING INDEX scrapes_url" in " ".join(row[-1] for row in plan)
+
+
+def test_batch_ids_continue_from_logged_batches(tmp_path):
+    store = MetadataStore(tmp_path / "meta.sqlite")
+    store.add_scrapes([_entry("https://a.test/", "2025-01-01T00:00:00", batch_id="batch_007")])
+
+    batch_id = store.start_batch(2, source="test")
+    store.add_scrapes([_entry("https://a.test/", "2025-01-02T00:00:00", batch_id=batch_id)])
+    store.finish_batch(batch_id, succeeded=1, failed=1)
+
+    assert batch_id == "batch_008"
+    assert store.start_batch(1) == "batch_009"
+    assert [e["batch_id"] for e in store.scrapes(batch_id)] == ["batch_008"]
+    assert store.batches()[0]["succeeded"] == 1
+
+
+def test_json_logs_are_migrated_once(tmp_path):
+    legacy = tmp_path / "scrape_log.json"
+    legacy.write_text(json.dumps([_entry("https://a.test/", "2025-01-01T00:00:00", "h1")]))
+    parser_log = tmp_path / "parser_run_log.json"
+    parser_log.write_text(json.dumps([{"parser_name": "v3", "status": "success", "items_extracted": 4}]))
+    log = ScrapeLog(path=str(tmp_path / "scrape_log.jsonl"), legacy_path=str(legacy))
+    path = tmp_path / "meta.sqlite"
+
+    for _ in range(2):  # reopening the same database does not import again
+        store = MetadataStore(path)
+        store.migrate_once("scrape_log", lambda: store.add_scrapes(log.read_saved()))
+        store.migrate_once("parser_run_log", lambda: store.add_parser_runs(json.loads(parser_log.read_text())))
+
+    assert [e["html_hash"] for e in store.scrapes()] == ["h1"]
+    assert store.parser_runs() == [{"parser_name": "v3", "status": "success", "items_extracted": 4}]
+
+
+def test_scrape_log_mirrors_written_batches(tmp_path):
+    store = MetadataStore(tmp_path / "meta.sqlite")
+    log = ScrapeLog(path=str(tmp_path / "scrape_log.jsonl"), legacy_path=str(tmp_path / "none.json"), store=store)
+    for i in range(3):
+        log.append(_entry(f"https://a.test/{i}", f"2025-01-0{i + 1}T00:00:00", f"h{i}"))
+    log.flush()
+
+    assert store.scrapes() == log.read()
+    assert store.find_hash("h2")["url"] == "https://a.test/2"
+
+
+def test_claim_hash_keeps_the_first_entry(tmp_path):
+    store = MetadataStore(tmp_path / "meta.sqlite")
+    first = _entry("https://a.test/", "2025-01-01T00:00:00", "h1")
+
+    assert store.claim_hash("h1", first) is None
+    assert store.claim_hash("h1", _entry("https://b.test/", "2025-01-02T00:00:00", "h1")) == first
+    store.add_scrapes([_entry("https://c.test/", "2025-01-03T00:00:00", "h1")])
+    assert store.find_hash("h1") == first
+
+
+def test_hash_index_backfills_logged_scrapes(tmp_path):
+    store = MetadataStore(tmp_path / "meta.sqlite")
+    store.add_scrapes([_entry("https://a.test/", "2025-01-01T00:00:00", "h1")])
+    store._db.execute("DELETE FROM hashes")  # a database from before the hash index
+
+    assert store.find_hash("h1") is None
+    store.migrate_once("hash_index", store._index_logged_hashes)
+    assert store.find_hash("h1")["url"] == "https://a.test/"
@@ -0,0 +1,83 @@
+# tests/test_paginator.py
+import threading
+
+from bs4 import BeautifulSoup
+
+from core.paginator import crawl_pages, find_next_link, merge_pages, page_pattern
+
+
+def _listing(n, links=""):
+    return BeautifulSoup(f"<h1>Listing</h1><h2>Item {n}</h2><p>text {n}</p>{links}", "html.parser")
+
+
+def _data(n):
+    return {"h1": "Listing", "sections": [{"header": f"Item {n}", "content": []}]}
+
+
+def test_page_pattern_from_query_links():
+    soup = _listing(1, '<a href="?page=2">2</a><a href="?page=3">3</a><a href="?page=9">9</a>')
+    url_for, current, last = page_pattern("https://x.org/jobs?q=ai", soup)
+
+    assert (current, last) == (1, 9)
+    assert url_for(4) == "https://x.org/jobs?q=ai&page=4"
+
+
+def test_page_pattern_from_path_and_ignores_ids():
+    url_for, current, last = page_pattern("https://x.org/news/page/3/", _listing(3, '<a href="/news/page/4/">4</a>'))
+    assert (current, last) == (3, 4)
+    assert url_for(5) == "https://x.org/news/page/5/"
+
+    assert page_pattern("https://x.org/", _listing(1, '<a href="/?p=4812">post</a>')) is None
+
+
+def test_find_next_link():
+    soup = BeautifulSoup('<a href="/a">Prev</a><a aria-label="Next page" href="/b">→</a>', "html.parser")
+    assert find_next_link(soup, "https://x.org/list") == "https://x.org/b"
+    assert find_next_link(BeautifulSoup('<a href="/c"> Next </a>', "html.parser"), "https://x.org/") == "https://x.org/c"
+    assert find_next_link(BeautifulSoup('<link rel="next" href="?cursor=z">', "html.parser"), "https://x.org/l") == (
+        "https://x.org/l?cursor=z"
+    )
+
+
+def test_predictable_pages_are_fetched_concurrently_until_empty():
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(url):
+        n = int(url.rsplit("=", 1)[1])
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        threading.Event().wait(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return (_listing(n), _data(n)) if n <= 7 else (_listing(n), {"sections": []})
+
+    soup = _listing(1, '<a href="?page=2">2</a><a href="?page=3">3</a>')
+    pages = crawl_pages("https://x.org/jobs", soup, _data(1), fetch, max_pages=20, concurrency=4)
+
+    assert [u.rsplit("=", 1)[1] for u, _ in pages] == ["2", "3", "4", "5", "6", "7"]
+    assert peak[0] > 1
+
+    merged = merge_pages("https://x.org/jobs", _data(1), pages)
+    assert [s["header"] for s in merged["sections"]] == [f"Item {n}" for n in range(1, 8)]
+    assert len(merged["pages"]) == 7
+
+
+def test_next_links_followed_up_to_max_pages():
+    def fetch(url):
+        n = int(url.rsplit("/", 1)[1])
+        return _listing(n, f'<a rel="next" href="/c/{n + 1}">Next</a>'), _data(n)
+
+    soup = _listing(1, '<a rel="next" href="/c/2">Next</a>')
+    pages = crawl_pages("https://x.org/c/1", soup, _data(1), fetch, max_pages=5)
+
+    assert [u for u, _ in pages] == [f"https://x.org/c/{n}" for n in range(2, 6)]
+
+
+def test_ordinary_links_are_not_pagination():
+    soup = BeautifulSoup(
+        '<a href="/about-us">More</a><a class="next" href="/news">Read</a><a href="/x">»</a><a href="/y">Older</a>',
+        "html.parser",
+    )
+    assert find_next_link(soup, "https://x.org/opportunity/1") is None
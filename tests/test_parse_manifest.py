@@ -0,0 +1,71 @@
+# tests/test_parse_manifest.py
+import importlib
+
+from core.bulk_parse import run_bulk_parse
+from core.html_store import get_html_store, read_html
+from core.parse_manifest import html_hash, html_hashes, parse_status, parser_code_hash, pending_html, record_parse
+
+PARSER = """
+import json
+
+def run_parser(html_file_path, output_json_path):
+    with open(output_json_path, "w") as f:
+        json.dump([html_file_path], f)
+    return True, [html_file_path]
+"""
+
+
+def _setup(tmp_path, monkeypatch):
+    package = tmp_path / "manifest_parsers"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "p1.py").write_text(PARSER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+
+    folder = tmp_path / "scraped_html"
+    folder.mkdir()
+    (folder / "a.html").write_text("<p>a</p>")
+    (folder / "b_x.html").write_text("<p>b</p>")
+    get_html_store().save("<p>c</p>", str(folder / "c.html"))
+    (folder / "a_p1.json").write_text("[]")  # parsed before the manifest existed
+    (folder / "b_x2.json").write_text("[]")  # not an output of b_x.html
+    return package, str(folder)
+
+
+def test_status_imports_existing_outputs_and_follows_content(tmp_path, monkeypatch):
+    _, folder = _setup(tmp_path, monkeypatch)
+
+    assert parse_status(folder) == (["a.html"], ["b_x.html", "c.html"])
+
+    c_path = f"{folder}/c.html"
+    assert html_hash(c_path) == get_html_store().blob_of(c_path)
+    record_parse("p1", "v1", c_path, f"{folder}/c_p1.json")
+    # same content under another name counts as parsed too
+    get_html_store().save("<p>c</p>", f"{folder}/d.html")
+    assert parse_status(folder) == (["a.html", "c.html", "d.html"], ["b_x.html"])
+
+
+def test_pending_until_parsed_by_current_parser_code(tmp_path, monkeypatch):
+    package, folder = _setup(tmp_path, monkeypatch)
+
+    # the imported a_p1.json has no known parser version
+    assert pending_html("p1", folder, package="manifest_parsers") == ["a.html", "b_x.html", "c.html"]
+
+    paths = [f"{folder}/a.html", f"{folder}/c.html"]
+    run_bulk_parse("p1", paths, package="manifest_parsers", workers=1)
+    assert pending_html("p1", folder, package="manifest_parsers") == ["b_x.html"]
+    assert pending_html("p1", folder, names=["c.html"], package="manifest_parsers") == []
+
+    old = parser_code_hash("p1", "manifest_parsers")
+    (package / "p1.py").write_text(PARSER + "\n# changed\n")
+    assert parser_code_hash("p1", "manifest_parsers") != old
+    assert pending_html("p1", folder, package="manifest_parsers") == ["a.html", "b_x.html", "c.html"]
+
+
+def test_hashing_text_already_read_matches_the_file(tmp_path):
+    page = tmp_path / "legacy.html"
+    page.write_bytes("<p>café</p>\r\n".encode("utf-8"))
+    text = read_html(str(page))
+
+    assert html_hash(str(page), text) == html_hash(str(page)) == html_hashes(str(tmp_path))["legacy.html"]
@@ -0,0 +1,34 @@
+# tests/test_rate_limiter.py
+from core.rate_limiter import HostRateLimiter, parse_retry_after
+
+
+def test_burst_then_paced():
+    limiter = HostRateLimiter(qps=10, burst=2)
+    waits = [limiter.reserve("https://a.example/x") for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.05 < waits[2] < waits[3] <= 0.2
+
+    # another host has its own bucket
+    assert limiter.reserve("https://b.example/") == 0.0
+
+
+def test_429_backs_off_and_recovers():
+    limiter = HostRateLimiter(qps=8, burst=1)
+    url = "https://slow.example/page"
+    limiter.feedback(url, 429, retry_after="2")
+
+    (host,) = limiter.snapshot()
+    assert host["qps"] == 4
+    assert host["blocked_for_s"] > 1.5
+    assert limiter.delay(url) > 1.5
+
+    for _ in range(20):
+        limiter.feedback(url, 200)
+    assert limiter.snapshot()[0]["qps"] == 8
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,59 @@
+# tests/test_readiness.py
+from selenium.common.exceptions import JavascriptException
+
+from config.settings import SETTINGS
+from core.readiness import ready_policy, wait_for_ready
+
+
+class _FakeDriver:
+    """Page whose DOM keeps changing for `busy_probes` probes, then settles."""
+
+    def __init__(self, busy_probes, selector_present=True, failing_probes=0):
+        self.busy_probes = busy_probes
+        self.selector_present = selector_present
+        self.failing_probes = failing_probes
+        self.probes = 0
+
+    def execute_script(self, script, selector):
+        self.probes += 1
+        if self.probes <= self.failing_probes:
+            raise JavascriptException("document unloaded while waiting for result")
+        settled = self.probes > self.busy_probes
+        return {
+            "ready_state": "complete",
+            "quiet_ms": 1000 if settled else 0,
+            "network_idle_ms": 1000,
+            "selector": self.selector_present or selector is None,
+        }
+
+
+def test_returns_as_soon_as_page_settles():
+    policy = {"selector": None, "quiet_ms": 500, "network_idle_ms": 500, "max_wait_s": 5}
+    res = wait_for_ready(_FakeDriver(busy_probes=2), policy)
+
+    assert res["ready"] == "ready"
+    assert res["waited_s"] < 1
+
+
+def test_missing_selector_waits_until_deadline():
+    policy = {"selector": "#results", "quiet_ms": 0, "network_idle_ms": 0, "max_wait_s": 0.3}
+    res = wait_for_ready(_FakeDriver(busy_probes=0, selector_present=False), policy)
+
+    assert res["ready"] == "deadline"
+    assert 0.3 <= res["waited_s"] < 1
+
+
+def test_probe_failures_mid_navigation_are_retried():
+    policy = {"selector": None, "quiet_ms": 0, "network_idle_ms": 0, "max_wait_s": 5}
+    driver = _FakeDriver(busy_probes=0, failing_probes=2)
+
+    assert wait_for_ready(driver, policy)["ready"] == "ready"
+    assert driver.probes == 3
+
+
+def test_policy_overrides_by_domain(monkeypatch):
+    monkeypatch.setitem(SETTINGS, "render_ready_overrides", {"aiesec.org": {"selector": "h1"}})
+
+    assert ready_policy("https://www.aiesec.org/x")["selector"] == "h1"
+    assert ready_policy("https://example.com/x")["selector"] is None
+    assert ready_policy("https://aiesec.org/x", max_wait_s=2, selector=None)["max_wait_s"] == 2
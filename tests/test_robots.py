@@ -0,0 +1,92 @@
+# tests/test_robots.py
+from core.rate_limiter import HostRateLimiter
+from core.robots import RobotsCache, RobotsRules
+
+ROBOTS = """
+User-agent: *
+Disallow: /private
+Allow: /private/public
+Disallow: /*.pdf$
+Crawl-delay: 2
+
+User-agent: streamlit-scraper
+User-agent: otherbot
+Disallow: /search
+"""
+
+
+def test_longest_match_and_wildcards():
+    rules = RobotsRules.parse(ROBOTS, "somebot/1.0")
+    assert not rules.allowed("/private/x")
+    assert rules.allowed("/private/public/x")
+    assert not rules.allowed("/files/a.pdf")
+    assert rules.allowed("/files/a.pdf?download=1")
+    assert rules.allowed("/robots.txt")
+    assert rules.crawl_delay == 2
+
+
+def test_own_group_replaces_the_star_group():
+    rules = RobotsRules.parse(ROBOTS, "streamlit-scraper/1.0")
+    assert not rules.allowed("/search?q=x")
+    assert rules.allowed("/private/x")
+    assert rules.crawl_delay is None
+
+
+class _Resp:
+    def __init__(self, status, text=""):
+        self.status_code = status
+        self.text = text
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        res = self.responses[url]
+        if isinstance(res, Exception):
+            raise res
+        return res
+
+
+def test_one_fetch_per_site_and_negative_caching(monkeypatch):
+    session = _Session({
+        "https://a.org/robots.txt": _Resp(200, ROBOTS),
+        "https://b.org/robots.txt": _Resp(404),
+        "https://c.org/robots.txt": _Resp(503),
+    })
+    limiter = HostRateLimiter(qps=4)
+    monkeypatch.setattr("core.robots.get_session", lambda: session)
+    monkeypatch.setattr("core.robots.get_limiter", lambda: limiter)
+    robots = RobotsCache(agent="somebot/1.0", ttl=60, error_ttl=60)
+
+    assert robots.allowed("https://a.org/jobs")
+    assert not robots.allowed("https://a.org/private/1")
+    assert robots.allowed("https://b.org/anything")
+    assert robots.allowed("https://b.org/else")
+    assert not robots.allowed("https://c.org/")
+    assert not robots.allowed("https://c.org/x")
+
+    assert len(session.calls) == 3
+    assert robots.stats()["blocked"] == 3
+    # Crawl-delay: 2 caps a.org at one request every two seconds
+    assert {h["host"]: h["target_qps"] for h in limiter.snapshot()}["a.org"] == 0.5
+
+
+def test_crawl_delay_cap_follows_each_refresh(monkeypatch):
+    session = _Session({"https://a.org/robots.txt": _Resp(200, ROBOTS)})
+    limiter = HostRateLimiter(qps=4)
+    monkeypatch.setattr("core.robots.get_session", lambda: session)
+    monkeypatch.setattr("core.robots.get_limiter", lambda: limiter)
+    robots = RobotsCache(agent="somebot/1.0", ttl=60, error_ttl=60)
+
+    robots.allowed("https://a.org/jobs")
+    limiter.set_rate("a.org", 2)  # the host's own rate survives the cap
+    assert {h["host"]: h["target_qps"] for h in limiter.snapshot()}["a.org"] == 0.5
+
+    session.responses["https://a.org/robots.txt"] = _Resp(200, "User-agent: *\nDisallow: /private\n")
+    robots._entries.clear()
+    robots.allowed("https://a.org/jobs")
+    assert {h["host"]: h["target_qps"] for h in limiter.snapshot()}["a.org"] == 2
@@ -0,0 +1,38 @@
+# tests/test_scrape_log.py
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from core.scrape_log import ScrapeLog
+
+
+def test_concurrent_appends_are_all_kept(tmp_path):
+    log = ScrapeLog(path=str(tmp_path / "log.jsonl"), legacy_path=str(tmp_path / "log.json"))
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        list(ex.map(lambda i: log.append({"url": f"https://a.org/{i}"}), range(2000)))
+
+    entries = log.read()
+    assert len(entries) == 2000
+    assert {e["url"] for e in entries} == {f"https://a.org/{i}" for i in range(2000)}
+
+
+def test_legacy_array_is_read_then_folded_in_by_compaction(tmp_path):
+    legacy = tmp_path / "log.json"
+    legacy.write_text(json.dumps([{"url": "old"}]))
+    path = tmp_path / "log.jsonl"
+    log = ScrapeLog(path=str(path), legacy_path=str(legacy), compact_every=3, max_entries=3)
+
+    log.append({"url": "new-1"})
+    assert [e["url"] for e in log.read()] == ["old", "new-1"]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"url": "torn')  # crash mid-write, then a restart
+    log = ScrapeLog(path=str(path), legacy_path=str(legacy), compact_every=3, max_entries=3)
+    for i in range(2, 5):
+        log.append({"url": f"new-{i}"})
+    log.flush()
+
+    assert legacy.exists()  # kept, but not read again
+    assert [e["url"] for e in log.read()] == ["new-2", "new-3", "new-4"]
+    assert len(path.read_text().splitlines()) == 3
+    log.compact()
+    assert [e["url"] for e in ScrapeLog(path=str(path), legacy_path=str(legacy)).read()] == ["new-2", "new-3", "new-4"]
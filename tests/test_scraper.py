@@ -1,4 +1,10 @@
 # tests/test_scraper.py
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from core.cascade import LayerStats
+from core.scraper import extract_section_content, scrape_url, split_sections
 from core.validator import validate_url
 
 
@@ -6,4 +12,56 @@ def test_validate():
     ok = validate_url("https://example.com")
     assert ok["ok"]
     bad = validate_url("notaurl")
-    assert not bad["ok"]
\ No newline at end of file
+    assert not bad["ok"]
+
+def _sections_one_by_one(soup):
+    return [{"header": h2.get_text(strip=True), "content": extract_section_content(h2)} for h2 in soup.find_all("h2")]
+
+
+def test_split_sections_matches_per_section_extraction():
+    html = """
+    <div><p>intro</p><div><h3>Not in a section</h3></div>
+      <h2>One</h2><p>a</p>
+      <div class="outer"><div class="card"><h3>Card</h3><p>desc</p><a href="/x">go</a></div><p>after</p></div>
+    </div>
+    <h2>Two <p>inside</p></h2>
+    <div><p>first</p><h2>Three</h2><h3>late title</h3><a>no href</a></div>
+    <div><span>no card</span></div>
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    sections = split_sections(soup)
+
+    assert [s["header"] for s in sections] == ["One", "Twoinside", "Three"]
+    assert sections == _sections_one_by_one(soup)
+
+
+def test_split_sections_matches_on_saved_pages():
+    root = Path(__file__).resolve().parent.parent
+    pages = sorted(root.glob("scraped_html/*.html")) + sorted(root.glob("trial/*.html"))
+    for page in pages:
+        if page.stat().st_size > 400_000:
+            continue  # keep the test quick; the benchmark covers the big pages
+        soup = BeautifulSoup(page.read_text(encoding="utf-8", errors="replace"), "html.parser")
+        assert split_sections(soup) == _sections_one_by_one(soup), page.name
+
+
+def test_race_without_content_does_not_fetch_again(tmp_path, monkeypatch):
+    calls = []
+
+    def static(url):
+        calls.append("requests")
+        return None
+
+    async def rendered(url):
+        calls.append("playwright")
+        raise RuntimeError("no browser")
+
+    monkeypatch.setattr("core.scraper._static_layer", static)
+    monkeypatch.setattr("core.scraper._pooled_layer_async", rendered)
+    monkeypatch.setattr("core.scraper.get_cache", lambda: 1 / 0)  # the regular path must not run
+    stats = LayerStats(path=tmp_path / "layer_stats.json")
+    monkeypatch.setattr("core.cascade.get_layer_stats", lambda: stats)
+
+    res = scrape_url("https://race.example/a", race=True)
+    assert "error" in res
+    assert sorted(calls) == ["playwright", "requests"]
@@ -0,0 +1,57 @@
+# tests/test_soup.py
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+import core.soup
+from config.settings import SETTINGS
+from core.soup import html_links, make_soup, soup_backend
+from parsers.parse_html_to_json_v3 import extract_links
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [
+    p for p in sorted(ROOT.glob("scraped_html/*.html")) + sorted(ROOT.glob("trial/*.html"))
+    if p.stat().st_size < 400_000  # keeps html5lib quick
+]
+
+
+def _read(page):
+    return page.read_text(encoding="utf-8", errors="replace")
+
+
+def _stable_parts(soup):
+    # what every backend must agree on, however it repairs broken markup
+    return {
+        "title": soup.title.string if soup.title else None,
+        "links": extract_links(soup),
+        "meta": [(m.get("name"), m.get("property"), m.get("content")) for m in soup.find_all("meta")],
+        "headings": [(h.name, h.get_text(strip=True)) for h in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"])],
+    }
+
+
+def test_missing_backend_falls_back_to_html_parser(monkeypatch):
+    monkeypatch.setitem(SETTINGS, "html_parser", "no-such-parser")
+    assert soup_backend() == "html.parser"
+    assert make_soup("<p>x</p>").p.get_text() == "x"
+    assert soup_backend("html.parser") == "html.parser"
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html5lib"])
+def test_backends_agree_on_saved_pages(parser):
+    pytest.importorskip(parser)
+    for page in PAGES:
+        html = _read(page)
+        assert _stable_parts(make_soup(html, parser)) == _stable_parts(BeautifulSoup(html, "html.parser")), page.name
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_html_links_match_extract_links(monkeypatch, fast):
+    if fast:
+        pytest.importorskip("selectolax")
+    else:
+        monkeypatch.setattr(core.soup, "LexborHTMLParser", None)
+    for page in PAGES:
+        html = _read(page)
+        assert html_links(html) == extract_links(BeautifulSoup(html, "html.parser")), page.name
+    assert html_links('<a href>x</a><a name="n">y</a><a href="/b">z</a>') == ["", "/b"]
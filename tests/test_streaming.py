@@ -0,0 +1,62 @@
+# tests/test_streaming.py
+import hashlib
+import os
+
+import pytest
+
+from core.html_store import HtmlStore
+from core.streaming import DownloadRejected, stream_to_store
+
+
+class _Resp:
+    def __init__(self, chunks, headers):
+        self.chunks = chunks
+        self.headers = headers
+        self.read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def test_body_is_saved_and_hashed_as_utf8(tmp_path):
+    text = "<html><h1>Café</h1></html>"
+    body = text.encode("latin-1")
+    resp = _Resp([body[:9], body[9:]], {"Content-Type": "text/html; charset=ISO-8859-1"})
+
+    store = HtmlStore(root=tmp_path / "store")
+
+    saved = stream_to_store(resp, lambda digest: f"scraped_html/page_{digest[:8]}.html", store=store)
+
+    assert saved["html_hash"] == hashlib.sha256(text.encode("utf-8")).hexdigest()
+    assert store.read(saved["html_path"]) == text
+    assert os.path.basename(saved["html_path"]) == f"page_{saved['html_hash'][:8]}.html"
+    assert resp.closed
+
+
+def test_disallowed_content_type_is_not_read(tmp_path):
+    resp = _Resp([b"%PDF-1.7"], {"Content-Type": "application/pdf"})
+    with pytest.raises(DownloadRejected) as err:
+        stream_to_store(resp, lambda digest: "x.html", store=HtmlStore(root=tmp_path / "store"))
+    assert err.value.reason == "content_type"
+    assert resp.read == 0 and resp.closed
+
+
+def test_oversized_body_is_aborted_midway(tmp_path):
+    store = HtmlStore(root=tmp_path / "store")
+    resp = _Resp([b"x" * 10] * 100, {"Content-Type": "text/html"})
+    with pytest.raises(DownloadRejected) as err:
+        stream_to_store(resp, lambda digest: "x.html", max_bytes=25, store=store)
+    assert err.value.reason == "too_large"
+    assert resp.read == 3
+    assert not [f for f in os.listdir(tmp_path / "store") if not f.startswith("index.sqlite")]
+
+    declared = _Resp([b"x"], {"Content-Type": "text/html", "Content-Length": "1000"})
+    with pytest.raises(DownloadRejected):
+        stream_to_store(declared, lambda digest: "x.html", max_bytes=25, store=store)
+    assert declared.read == 0
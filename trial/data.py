@@ -1,21 +1,17 @@
-from playwright.sync_api import sync_playwright
 from pathlib import Path
 
+from core.browser_pool import get_browser_pool  # run from the repo root: python -m trial.data
+
 URL = "https://bigfuture.collegeboard.org/colleges/avery-james-college/campus-life"
 OUTPUT_FILE = Path("avery_james_college_rendered_campus-life.html")
 
 def download_rendered_html():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        page.goto(URL, wait_until="networkidle")
-        html = page.content()
+    res = get_browser_pool().render(URL, wait_until="networkidle")
+    html = res["html"]
 
-        OUTPUT_FILE.write_text(html, encoding="utf-8")
-        browser.close()
+    OUTPUT_FILE.write_text(html, encoding="utf-8")
 
-        print(f"Saved rendered HTML to: {OUTPUT_FILE.resolve()}")
+    print(f"Saved rendered HTML to: {OUTPUT_FILE.resolve()}")
 
 if __name__ == "__main__":
     download_rendered_html()